@@ -1,11 +1,25 @@
 import pygame
-import json
+import argparse
 import math
+import random
 from datetime import datetime
 import os
 
+from life_rpg_aggregates import AreaIndex
+from life_rpg_archive import ColumnarArchive
+from life_rpg_charts import TrendCharts
+from life_rpg_frames import QUALITY_LEVELS, FrameProfiler, ProfiledFont, QualityGovernor, profiled
+from life_rpg_instrument import instrument, timed
+from life_rpg_ledger import IncomeLedger, month_of
+from life_rpg_ipc import Subscriber, socket_path
+from life_rpg_model import attach, iso_day
+from life_rpg_shm import SnapshotReader, segment_name
+from life_rpg_sections import SectionStore
+from life_rpg_snapshot import is_snapshot, load_snapshot
+from life_rpg_widgets import VirtualList
+
 class LifeRPGVisual:
-    def __init__(self, data_file='life_rpg_personal.json'):
+    def __init__(self, data_file='life_rpg_personal.json', quality=None):
         pygame.init()
         
         # Screen setup
@@ -26,30 +40,278 @@ class LifeRPGVisual:
         self.XP_BAR_BG = (50, 54, 66)
         self.XP_BAR_FILL = (88, 166, 255)
         
+        # Frame timing: P toggles the per-panel overlay; the governor trades effects for frame rate
+        self.FPS = 60
+        self.MAX_DT = 0.25  # longest step animations take at once, e.g. after the window was dragged
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None  # (surface, animation_time it was drawn at)
+        self.OVERLAY_REFRESH = 0.25  # seconds between overlay redraws; blitted as is in between
+        levels = [name for name, _ in QUALITY_LEVELS]
+        self.governor = QualityGovernor(1 / self.FPS, levels.index(quality) if quality else 0, pinned=quality is not None)
+        
         # Fonts
-        self.font_title = pygame.font.Font(None, 48)
-        self.font_heading = pygame.font.Font(None, 36)
-        self.font_normal = pygame.font.Font(None, 28)
-        self.font_small = pygame.font.Font(None, 22)
+        self.font_title = ProfiledFont(pygame.font.Font(None, 48), self.profiler)
+        self.font_heading = ProfiledFont(pygame.font.Font(None, 36), self.profiler)
+        self.font_normal = ProfiledFont(pygame.font.Font(None, 28), self.profiler)
+        self.font_small = ProfiledFont(pygame.font.Font(None, 22), self.profiler)
+        
+        # Scrollable lists for the milestones and stats views
+        self.milestone_list = VirtualList((100, 120, self.WIDTH - 200, self.HEIGHT - 190),
+                                          self.CARD_BG, self.ACCENT)
+        self.stats_list = VirtualList((70, 120, self.WIDTH - 140, self.HEIGHT - 190),
+                                      self.CARD_BG, self.ACCENT)
+        
+        # Trend charts: (series, title, color, fixed y range, reference line)
+        self.charts = TrendCharts(ColumnarArchive.for_profile(data_file))
+        self.trend_panels = [
+            ('score', "Daily Score", self.ACCENT, (0, 100), 70),
+            ('pushups', "Push-ups", self.SUCCESS, None, 100),
+            ('screen', "Screen Time (h)", self.WARNING, None, 2),
+        ]
+        self.trend_ranges = {pygame.K_1: 30, pygame.K_2: 90, pygame.K_3: 365, pygame.K_4: None}
+        self.trend_days = 90  # None = all history
+        self.trend_end = None  # last day shown (ordinal), None = today
+        self.trend_cache = {}
         
         # Data
         self.data_file = data_file
-        self.data = self.load_data()
+        self.reload_data()
         
         # Animation
         self.animation_time = 0
-        self.particle_systems = []
+        self.particle_systems = []  # [x, y, vx, vy, life, color]
+        self.toasts = []  # [text, color, seconds left]
+        
+        # Live delta events pushed by life_rpg.py
+        self.channel = Subscriber(socket_path(data_file))
+        # Hot fields (XP, habits, income, milestones, latest score) shared by the writer
+        self.shared = SnapshotReader(segment_name(data_file))
         self.clock = pygame.time.Clock()
         
         # Current view
-        self.current_view = "dashboard"  # dashboard, stats, milestones
+        self.current_view = "dashboard"  # dashboard, stats, milestones, trends
         
+    @timed('dashboard.load')
     def load_data(self):
         if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+            instrument.record_bytes('dashboard.load', os.path.getsize(self.data_file))
+            if is_snapshot(self.data_file):
+                return attach(load_snapshot(self.data_file))
+            return SectionStore(self.data_file).load_profile()
         return None
     
+    @property
+    def live(self):
+        """True while updates arrive from a running life_rpg.py, so views need no reload"""
+        return self.channel.connected or self.shared.shm is not None
+    
+    def reload_data(self):
+        """Load the profile and rebuild the area aggregates the views draw from"""
+        self.data = self.load_data()
+        self.charts.archive.open()  # life_rpg.py may have archived another month
+        self.aggregates = AreaIndex(self.data['life_areas']) if self.data else None
+        self.ledger = IncomeLedger(self.data['income']) if self.data else None
+        self.milestone_list.set_rows(self.milestone_rows() if self.data else [])
+        self.stats_list.set_rows(self.stats_rows() if self.data else [])
+    
+    def apply_events(self):
+        """Apply delta events from life_rpg.py to the in-memory profile and start animations"""
+        stats_dirty = milestones_dirty = False
+        for event in self.channel.poll():
+            kind = event.get('type')
+            if not self.data or (kind == 'connected' and not self.shared.attach()):
+                self.reload_data()  # catch up on anything saved before we connected
+                continue
+            if kind == 'connected':
+                continue  # the shared snapshot already carries the current state
+            if kind == 'area':
+                stats = self.data['life_areas'].get(event['area'])
+                if stats is None:
+                    self.reload_data()
+                    continue
+                old_level = stats.level
+                self.aggregates.set_xp(event['area'], event['xp'], event['level'])
+                if event['level'] > old_level:
+                    name = self.aggregates.short_names[event['area']]
+                    self.celebrate(f"LEVEL UP! {name} is now Level {event['level']}", self.ACCENT, (230, 220))
+                stats_dirty = True
+            elif kind == 'habit':
+                habit = self.data['habits'][event['habit']]
+                habit['streak'] = event['streak']
+                habit['last_done'] = event['last_done']
+                self.spawn_particles(90, 560 if event['habit'] == 'shower' else 620, self.SUCCESS, 25)
+            elif kind in ('todo', 'project'):
+                for item in self.data['todos' if kind == 'todo' else 'projects']:
+                    if item.id == event['id']:
+                        item['completed'] = event['completed']
+                        item['completion_date'] = event['completion_date']
+                        break
+            elif kind == 'income':
+                entry = event['entry']
+                self.ledger.record(entry['date'], entry['amount'], entry['kind'], entry['project_id'], entry['note'])
+                self.spawn_particles(1170, 220, self.SUCCESS, 30)
+            elif kind == 'milestone':
+                milestone = self.data['epic_milestones'][event['key']]
+                milestone['completed'] = event['completed']
+                self.celebrate(f"EPIC MILESTONE: {milestone['description']}", self.SUCCESS, (1170, 545))
+                milestones_dirty = True
+            elif kind == 'score':
+                # Summaries and late events upsert a day's score; keep the list date-sorted
+                scores = self.data['daily_scores']
+                for entry in reversed(scores):
+                    if entry['date'] <= event['date']:
+                        break
+                if scores and entry['date'] == event['date']:
+                    entry.update(score=event['score'], grade=event['grade'])
+                else:
+                    position = sum(1 for entry in scores if entry['date'] < event['date'])
+                    scores.insert(position, {'date': event['date'], 'score': event['score'], 'grade': event['grade']})
+            elif kind == 'history':
+                self.reload_data()  # an undo/redo can touch anything; it is rare enough to reload
+                continue
+            elif kind == 'achievement':
+                if event['name'] not in self.data['achievements']:
+                    self.data['achievements'].append(event['name'])
+                self.celebrate(f"Achievement Unlocked: {event['name']}", self.WARNING, (self.WIDTH // 2, 60))
+        if stats_dirty:
+            self.stats_list.set_rows(self.stats_rows())
+        if milestones_dirty:
+            self.milestone_list.set_rows(self.milestone_rows())
+    
+    def apply_shared(self):
+        """Copy hot fields from the shared-memory snapshot whenever its version changes"""
+        hot = self.shared.poll()
+        if hot is None or not self.data:
+            return
+        areas = self.data['life_areas']
+        milestones = self.data['epic_milestones']
+        if hot['areas'].keys() != areas.keys() or hot['milestones'].keys() != milestones.keys():
+            self.reload_data()  # areas or milestones were added/removed
+            return
+        
+        stats_dirty = False
+        for name, (xp, level) in hot['areas'].items():
+            stats = areas[name]
+            if stats.xp != xp or stats.level != level:
+                self.aggregates.set_xp(name, xp, level)
+                stats_dirty = True
+        if stats_dirty:
+            self.stats_list.set_rows(self.stats_rows())
+        
+        if any(milestones[key]['completed'] != done for key, done in hot['milestones'].items()):
+            for key, done in hot['milestones'].items():
+                milestones[key]['completed'] = done
+            self.milestone_list.set_rows(self.milestone_rows())
+        
+        for name, (streak, last_done) in hot['habits'].items():
+            if name in self.data['habits']:
+                self.data['habits'][name]['streak'] = streak
+                self.data['habits'][name]['last_done'] = last_done
+        
+        current, self.data['income']['monthly_goal'] = hot['income']
+        if current != self.ledger.month_total(self.data['income']['target_month']):
+            self.reload_data()  # new ledger entries; the snapshot only carries the total
+            return
+        
+        if hot['latest_score']:
+            day, score, grade = hot['latest_score']
+            scores = self.data['daily_scores']
+            if scores and scores[-1]['date'] == day:
+                scores[-1].update(score=score, grade=grade)
+            else:
+                scores.append({'date': day, 'score': score, 'grade': grade})
+    
+    def celebrate(self, text, color, position):
+        self.toasts.append([text, color, 3.0])
+        self.spawn_particles(position[0], position[1], color)
+    
+    def spawn_particles(self, x, y, color, count=40):
+        for _ in range(count):
+            angle = random.uniform(0, 2 * math.pi)
+            speed = random.uniform(60, 240)
+            self.particle_systems.append([x, y, math.cos(angle) * speed, math.sin(angle) * speed, 1.0, color])
+    
+    @profiled('effects')
+    def draw_effects(self, dt):
+        """Advance and draw particle bursts and notification toasts"""
+        alive = []
+        for particle in self.particle_systems:
+            particle[0] += particle[2] * dt
+            particle[1] += particle[3] * dt
+            particle[3] += 300 * dt  # gravity
+            particle[4] -= dt
+            if particle[4] > 0:
+                pygame.draw.circle(self.screen, particle[5], (int(particle[0]), int(particle[1])),
+                                   max(1, int(4 * particle[4])))
+                alive.append(particle)
+        self.particle_systems = alive
+        
+        self.toasts = [t for t in self.toasts if t[2] > 0]
+        for i, toast in enumerate(self.toasts[-3:]):
+            text, color, _ = toast
+            text_surf = self.font_normal.render(text, True, self.TEXT_PRIMARY)
+            rect = text_surf.get_rect(center=(self.WIDTH // 2, self.HEIGHT - 110 - i * 50))
+            pygame.draw.rect(self.screen, self.CARD_BG, rect.inflate(40, 20), border_radius=10)
+            pygame.draw.rect(self.screen, color, rect.inflate(40, 20), 2, border_radius=10)
+            self.screen.blit(text_surf, rect)
+        for toast in self.toasts:
+            toast[2] -= dt
+    
+    def milestone_rows(self):
+        """One 120px row per epic milestone for the milestones list"""
+        rows = []
+        for key, milestone in self.data['epic_milestones'].items():
+            def render(surface, milestone=milestone):
+                card_color = self.SUCCESS if milestone['completed'] else self.CARD_BG
+                
+                # Milestone card
+                milestone_rect = pygame.Rect(0, 0, surface.get_width(), 100)
+                pygame.draw.rect(surface, card_color, milestone_rect, border_radius=10)
+                
+                border_color = self.SUCCESS if milestone['completed'] else self.TEXT_SECONDARY
+                pygame.draw.rect(surface, border_color, milestone_rect, 3, border_radius=10)
+                
+                # Status icon
+                status = "✅" if milestone['completed'] else "⏳"
+                status_surf = self.font_heading.render(status, True, self.TEXT_PRIMARY)
+                surface.blit(status_surf, (20, 30))
+                
+                # Description
+                desc_surf = self.font_normal.render(milestone['description'], True, self.TEXT_PRIMARY)
+                surface.blit(desc_surf, (80, 20))
+                
+                # Reward
+                reward_text = f"+{milestone['xp_reward']} XP Reward"
+                reward_surf = self.font_small.render(reward_text, True, self.WARNING)
+                surface.blit(reward_surf, (80, 55))
+            
+            row_key = ('milestone', key, milestone['completed'], milestone['xp_reward'], milestone['description'])
+            rows.append((120, row_key, render))
+        return rows
+    
+    def stats_rows(self):
+        """Category header rows followed by rows of three area cells"""
+        rows = []
+        col_width = self.stats_list.row_width // 3
+        short_names = self.aggregates.short_names
+        for category, areas in self.aggregates.categories.items():
+            def render_header(surface, category=category):
+                cat_surf = self.font_normal.render(category, True, self.ACCENT)
+                surface.blit(cat_surf, (0, 10))
+            rows.append((40, ('category', category), render_header))
+            
+            for start in range(0, len(areas), 3):
+                cells = [(short_names[area], stats['xp'], stats['level']) for area, stats in areas[start:start + 3]]
+                
+                def render_cells(surface, cells=cells):
+                    for col, (short_name, xp, level) in enumerate(cells):
+                        x_offset = col * col_width
+                        name_surf = self.font_small.render(short_name[:15], True, self.TEXT_SECONDARY)
+                        surface.blit(name_surf, (x_offset, 0))
+                        self.draw_xp_bar(x_offset, 25, col_width - 40, xp, level, surface)
+                rows.append((80, ('areas', tuple(cells)), render_cells))
+        return rows
+    
     def draw_gradient_rect(self, surface, color1, color2, rect):
         """Draw a gradient rectangle"""
         for i in range(rect.height):
@@ -63,6 +325,7 @@ class LifeRPGVisual:
                            (rect.x, rect.y + i), 
                            (rect.x + rect.width, rect.y + i))
     
+    @profiled('card')
     def draw_card(self, x, y, width, height, title=None):
         """Draw a card with shadow"""
         # Shadow
@@ -86,35 +349,40 @@ class LifeRPGVisual:
         
         return card_rect
     
-    def draw_xp_bar(self, x, y, width, current_xp, level):
+    @profiled('xp_bars')
+    def draw_xp_bar(self, x, y, width, current_xp, level, surface=None):
         """Draw animated XP progress bar"""
+        surface = surface or self.screen
         xp_in_level = current_xp % 150
         progress = xp_in_level / 150
         
         # Background
         bg_rect = pygame.Rect(x, y, width, 30)
-        pygame.draw.rect(self.screen, self.XP_BAR_BG, bg_rect, border_radius=15)
+        pygame.draw.rect(surface, self.XP_BAR_BG, bg_rect, border_radius=15)
         
         # Fill with gradient
         fill_width = int(width * progress)
         if fill_width > 0:
             fill_rect = pygame.Rect(x, y, fill_width, 30)
-            self.draw_gradient_rect(self.screen, self.ACCENT, (50, 120, 200), fill_rect)
+            if self.governor.settings['gradients']:
+                self.draw_gradient_rect(surface, self.ACCENT, (50, 120, 200), fill_rect)
+            else:
+                pygame.draw.rect(surface, (69, 143, 228), fill_rect)  # the gradient's middle
             
             # Shine effect
             shine_y = y + 8
             shine_width = min(fill_width, int(width * 0.3))
-            pygame.draw.rect(self.screen, (150, 200, 255, 100), 
+            pygame.draw.rect(surface, (150, 200, 255, 100), 
                            (x, shine_y, shine_width, 10), border_radius=5)
         
         # Border
-        pygame.draw.rect(self.screen, self.ACCENT, bg_rect, 2, border_radius=15)
+        pygame.draw.rect(surface, self.ACCENT, bg_rect, 2, border_radius=15)
         
         # Text
         xp_text = f"Level {level} | {xp_in_level}/150 XP"
         text_surf = self.font_small.render(xp_text, True, self.TEXT_PRIMARY)
         text_rect = text_surf.get_rect(center=(x + width // 2, y + 15))
-        self.screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_rect)
     
     def draw_circular_progress(self, x, y, radius, progress, color, label, value):
         """Draw circular progress indicator"""
@@ -149,14 +417,15 @@ class LifeRPGVisual:
         label_rect = label_surf.get_rect(center=(x, y + 15))
         self.screen.blit(label_surf, label_rect)
     
+    @profiled('avatar')
     def draw_character_avatar(self, x, y, size, total_level):
         """Draw animated character avatar"""
         # Pulsing effect
         pulse = math.sin(self.animation_time * 2) * 5
         current_size = size + int(pulse)
         
-        # Outer glow
-        for i in range(3):
+        # Outer glow (fewer layers at lower quality)
+        for i in range(self.governor.settings['glow_layers']):
             glow_size = current_size + (3 - i) * 10
             alpha = 50 - i * 15
             glow_surf = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
@@ -204,6 +473,7 @@ class LifeRPGVisual:
         value_surf = self.font_heading.render(str(value), True, self.TEXT_PRIMARY)
         self.screen.blit(value_surf, (x + 60, y + 40))
     
+    @timed('render.dashboard_view')
     def draw_dashboard_view(self):
         """Main dashboard view"""
         if not self.data:
@@ -217,8 +487,8 @@ class LifeRPGVisual:
         self.screen.blit(title, (self.WIDTH // 2 - 300, 20))
         
         # Calculate stats
-        total_level = sum(area['level'] for area in self.data['life_areas'].values())
-        total_xp = sum(area['xp'] for area in self.data['life_areas'].values())
+        total_level = self.aggregates.total_level
+        total_xp = self.aggregates.total_xp
         
         # Left side - Character & Quick Stats
         self.draw_card(30, 100, 400, 350, "Your Character")
@@ -254,14 +524,13 @@ class LifeRPGVisual:
         # Center - Top Life Areas
         self.draw_card(450, 100, 500, 570, "Top Life Areas")
         
-        sorted_areas = sorted(self.data['life_areas'].items(), 
-                            key=lambda x: x[1]['level'], reverse=True)[:8]
+        sorted_areas = self.aggregates.top(8)
         
         for i, (area_name, stats) in enumerate(sorted_areas):
             y_pos = 170 + i * 65
             
             # Area name
-            short_name = area_name.split(' - ')[-1] if ' - ' in area_name else area_name
+            short_name = self.aggregates.short_names[area_name]
             name_surf = self.font_normal.render(short_name[:20], True, self.TEXT_PRIMARY)
             self.screen.blit(name_surf, (470, y_pos))
             
@@ -271,7 +540,7 @@ class LifeRPGVisual:
         # Right side - Income & Milestones
         self.draw_card(970, 100, 400, 300, "Income Progress")
         
-        current = self.data['income']['current_month_earnings']
+        current = self.ledger.month_total(month_of(datetime.now().strftime('%Y-%m-%d')))
         goal = self.data['income']['monthly_goal']
         progress = min(current / goal, 1.0) if goal > 0 else 0
         
@@ -332,10 +601,11 @@ class LifeRPGVisual:
             self.screen.blit(score_surf, (self.WIDTH // 2 - 150, self.HEIGHT - 60))
         
         # Navigation hint
-        hint_surf = self.font_small.render("Press 'S' for detailed stats | 'M' for milestones | 'Q' to quit", 
+        hint_surf = self.font_small.render("Press 'S' for detailed stats | 'M' for milestones | 'T' for trends | 'Q' to quit", 
                                           True, self.TEXT_SECONDARY)
-        self.screen.blit(hint_surf, (self.WIDTH // 2 - 280, self.HEIGHT - 30))
+        self.screen.blit(hint_surf, (self.WIDTH // 2 - 330, self.HEIGHT - 30))
     
+    @timed('render.stats_view')
     def draw_stats_view(self):
         """Detailed stats view"""
         self.draw_card(50, 50, self.WIDTH - 100, self.HEIGHT - 100, "Detailed Statistics")
@@ -343,45 +613,14 @@ class LifeRPGVisual:
         if not self.data:
             return
         
-        # Group by category
-        categories = {}
-        for area, stats in self.data['life_areas'].items():
-            category = area.split(' - ')[0]
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((area, stats))
-        
-        y_offset = 130
-        col_width = (self.WIDTH - 140) // 3
-        
-        col = 0
-        for category, areas in list(categories.items())[:9]:
-            x_offset = 70 + col * col_width
-            
-            # Category header
-            cat_surf = self.font_normal.render(category, True, self.ACCENT)
-            self.screen.blit(cat_surf, (x_offset, y_offset))
-            
-            # Areas in category
-            for i, (area, stats) in enumerate(areas[:4]):
-                item_y = y_offset + 40 + i * 80
-                short_name = area.split(' - ')[-1]
-                
-                name_surf = self.font_small.render(short_name[:15], True, self.TEXT_SECONDARY)
-                self.screen.blit(name_surf, (x_offset, item_y))
-                
-                self.draw_xp_bar(x_offset, item_y + 25, col_width - 40, stats['xp'], stats['level'])
-            
-            col += 1
-            if col >= 3:
-                col = 0
-                y_offset += 400
+        self.stats_list.draw(self.screen)
         
         # Back hint
-        hint_surf = self.font_small.render("Press 'D' to return to dashboard", 
+        hint_surf = self.font_small.render("Press 'D' to return to dashboard | Wheel, arrows, PgUp/PgDn to scroll", 
                                           True, self.TEXT_SECONDARY)
-        self.screen.blit(hint_surf, (self.WIDTH // 2 - 150, self.HEIGHT - 30))
+        self.screen.blit(hint_surf, (self.WIDTH // 2 - 300, self.HEIGHT - 30))
     
+    @timed('render.milestones_view')
     def draw_milestones_view(self):
         """Milestones detailed view"""
         self.draw_card(50, 50, self.WIDTH - 100, self.HEIGHT - 100, "🏆 Epic Milestones")
@@ -389,48 +628,212 @@ class LifeRPGVisual:
         if not self.data:
             return
         
-        y_offset = 150
-        for key, milestone in self.data['epic_milestones'].items():
-            card_color = self.SUCCESS if milestone['completed'] else self.CARD_BG
-            
-            # Milestone card
-            milestone_rect = pygame.Rect(100, y_offset, self.WIDTH - 200, 100)
-            pygame.draw.rect(self.screen, card_color, milestone_rect, border_radius=10)
-            
-            border_color = self.SUCCESS if milestone['completed'] else self.TEXT_SECONDARY
-            pygame.draw.rect(self.screen, border_color, milestone_rect, 3, border_radius=10)
-            
-            # Status icon
-            status = "✅" if milestone['completed'] else "⏳"
-            status_surf = self.font_heading.render(status, True, self.TEXT_PRIMARY)
-            self.screen.blit(status_surf, (120, y_offset + 30))
-            
-            # Description
-            desc_surf = self.font_normal.render(milestone['description'], True, self.TEXT_PRIMARY)
-            self.screen.blit(desc_surf, (180, y_offset + 20))
-            
-            # Reward
-            reward_text = f"+{milestone['xp_reward']} XP Reward"
-            reward_surf = self.font_small.render(reward_text, True, self.WARNING)
-            self.screen.blit(reward_surf, (180, y_offset + 55))
-            
-            y_offset += 120
+        self.milestone_list.draw(self.screen)
         
         # Back hint
-        hint_surf = self.font_small.render("Press 'D' to return to dashboard", 
+        hint_surf = self.font_small.render("Press 'D' to return to dashboard | Wheel, arrows, PgUp/PgDn to scroll", 
+                                          True, self.TEXT_SECONDARY)
+        self.screen.blit(hint_surf, (self.WIDTH // 2 - 300, self.HEIGHT - 30))
+    
+    def trend_window(self):
+        """(first, last) day ordinal currently shown, or None without history"""
+        span = self.charts.span()
+        if span is None:
+            return None
+        today = datetime.now().toordinal()
+        end = min(self.trend_end or today, today)
+        days = self.trend_days or max(1, end - span[0] + 1)
+        return end - days + 1, end
+    
+    def handle_trend_event(self, event):
+        """1-4 pick a range, Left/Right pan, +/- or the wheel zoom; returns True if handled"""
+        window = self.trend_window()
+        if window is None:
+            return False
+        start, end = window
+        days = end - start + 1
+        zoom = 0
+        if event.type == pygame.MOUSEWHEEL:
+            zoom = event.y
+        elif event.type != pygame.KEYDOWN:
+            return False
+        elif event.key in self.trend_ranges:
+            self.trend_days, self.trend_end = self.trend_ranges[event.key], None
+            return True
+        elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+            step = max(1, days // 4)
+            end += step if event.key == pygame.K_RIGHT else -step
+            self.trend_end = max(end, self.charts.span()[0] + days - 1)
+            self.trend_days = days
+            return True
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            zoom = 1
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            zoom = -1
+        else:
+            return False
+        if zoom > 0:
+            self.trend_days = max(7, days // 2)
+        elif zoom < 0:
+            first = self.charts.span()[0]
+            self.trend_days = None if end - days * 2 < first else days * 2
+        self.trend_end = end
+        return True
+    
+    def trend_panel(self, series, title, color, y_range, reference, start, end, size):
+        """Render one chart into a cached surface; cost depends on its width, not the date range"""
+        key = (series, start, end, size, self.charts.version)
+        surface = self.trend_cache.get(key)
+        if surface is not None:
+            return surface
+        if len(self.trend_cache) > 32:
+            self.trend_cache.clear()
+        width, height = size
+        surface = pygame.Surface(size)
+        surface.fill(self.CARD_BG)
+        left, top, right, bottom = 60, 30, width - 10, height - 25
+        plot_w, plot_h = right - left, bottom - top
+        trace = self.charts.select(series, start, end, plot_w)
+        
+        label = title if trace['level'] == 'day' else f"{title} · {trace['level']}ly min/avg/max"
+        surface.blit(self.font_normal.render(label, True, self.TEXT_PRIMARY), (left, 2))
+        if y_range is None:
+            low = min(float(trace['lo'].min()), reference) if len(trace['x']) else 0
+            high = max(float(trace['hi'].max()), reference) if len(trace['x']) else 1
+            y_range = (min(0, low), high * 1.1 or 1)
+        y_min, y_max = y_range
+        
+        def to_y(value):
+            return bottom - (value - y_min) / (y_max - y_min) * plot_h
+        
+        for i in range(5):
+            value = y_min + (y_max - y_min) * i / 4
+            y = int(to_y(value))
+            pygame.draw.line(surface, self.XP_BAR_BG, (left, y), (right, y))
+            tick = self.font_small.render(f"{value:.0f}" if y_max >= 20 else f"{value:.1f}", True, self.TEXT_SECONDARY)
+            surface.blit(tick, (left - tick.get_width() - 8, y - 8))
+        ref_y = int(to_y(reference))
+        pygame.draw.line(surface, self.DANGER, (left, ref_y), (right, ref_y))
+        for day, anchor in ((start, 'left'), (end, 'right')):
+            text = self.font_small.render(iso_day(day), True, self.TEXT_SECONDARY)
+            x = left if anchor == 'left' else right - text.get_width()
+            surface.blit(text, (x, bottom + 6))
+        
+        if len(trace['x']):
+            scale = plot_w / max(1, end - start)
+            xs = [left + (x - start) * scale for x in trace['x'].tolist()]
+            if len(xs) > 1:
+                # Min/max envelope of what each point stands for (flat at daily resolution)
+                band_color = tuple(int(c * 0.35 + b * 0.65) for c, b in zip(color, self.CARD_BG))
+                upper = [(x, to_y(v)) for x, v in zip(xs, trace['hi'].tolist())]
+                lower = [(x, to_y(v)) for x, v in zip(xs, trace['lo'].tolist())]
+                pygame.draw.polygon(surface, band_color, upper + lower[::-1])
+            points = [(x, to_y(v)) for x, v in zip(xs, trace['mean'].tolist())]
+            if len(points) > 1:
+                pygame.draw.aalines(surface, color, False, points)
+            else:
+                pygame.draw.circle(surface, color, (int(points[0][0]), int(points[0][1])), 3)
+        self.trend_cache[key] = surface
+        return surface
+    
+    @timed('render.trends_view')
+    def draw_trends_view(self):
+        """Score, push-up and screen time history over any date range"""
+        self.draw_card(50, 50, self.WIDTH - 100, self.HEIGHT - 100, "📈 Trends")
+        
+        if not self.data:
+            return
+        
+        self.charts.update(self.data)
+        window = self.trend_window()
+        if window is None:
+            text_surf = self.font_normal.render("No history yet - log a few days first", True, self.TEXT_SECONDARY)
+            self.screen.blit(text_surf, (100, 140))
+            return
+        start, end = window
+        span_surf = self.font_small.render(f"{iso_day(start)} to {iso_day(end)} ({end - start + 1} days)",
+                                           True, self.TEXT_SECONDARY)
+        self.screen.blit(span_surf, (self.WIDTH - 100 - span_surf.get_width() - 20, 75))
+        
+        panel_height = 225
+        for i, (series, title, color, y_range, reference) in enumerate(self.trend_panels):
+            panel = self.trend_panel(series, title, color, y_range, reference, start, end,
+                                     (self.WIDTH - 200, panel_height))
+            self.screen.blit(panel, (100, 120 + i * (panel_height + 10)))
+        
+        hint_surf = self.font_small.render("1/2/3/4: 30 days / 90 days / 1 year / all | Left/Right pan | +/- or wheel zoom | 'D' dashboard",
                                           True, self.TEXT_SECONDARY)
-        self.screen.blit(hint_surf, (self.WIDTH // 2 - 150, self.HEIGHT - 30))
+        self.screen.blit(hint_surf, (self.WIDTH // 2 - 330, self.HEIGHT - 30))
+    
+    @profiled('overlay')
+    def draw_profiler_overlay(self):
+        """Frame rate, quality level and per-panel frame-time histograms over the last couple of seconds"""
+        if self.profiler_overlay is None or self.animation_time - self.profiler_overlay[1] >= self.OVERLAY_REFRESH:
+            self.profiler_overlay = (self.render_profiler_overlay(), self.animation_time)
+        overlay = self.profiler_overlay[0]
+        self.screen.blit(overlay, (self.WIDTH - overlay.get_width() - 10, 10))
+    
+    def render_profiler_overlay(self):
+        summary = self.profiler.summary()
+        work, _, _ = self.profiler.recent()
+        budget_ms = self.governor.budget * 1e3
+        rows = [name for name in self.profiler.panels + ('frame',) if name in summary]
+        width, height = 420, 120 + 24 * len(rows)
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((10, 14, 26, 240))
+        pygame.draw.rect(overlay, self.ACCENT, overlay.get_rect(), 1)
+        
+        quality = self.governor.name + (" (pinned)" if self.governor.pinned else "")
+        header = self.font_small.render(f"{self.profiler.fps():.0f} fps | budget {budget_ms:.1f} ms | quality {quality}",
+                                        True, self.TEXT_PRIMARY)
+        overlay.blit(header, (10, 8))
+        
+        # Work time of every frame in the window, against the budget line
+        graph = pygame.Rect(10, 32, width - 20, 50)
+        scale = graph.height / (2 * budget_ms)
+        bar_width = graph.width / self.profiler.WINDOW
+        for i, seconds in enumerate(work):
+            bar = min(graph.height, int(seconds * 1e3 * scale) + 1)
+            color = self.SUCCESS if seconds * 1e3 <= budget_ms else self.DANGER
+            pygame.draw.rect(overlay, color, (graph.x + int(i * bar_width), graph.bottom - bar, max(1, int(bar_width)), bar))
+        pygame.draw.line(overlay, self.WARNING, (graph.x, graph.bottom - graph.height // 2),
+                         (graph.right, graph.bottom - graph.height // 2))
+        
+        columns = self.font_small.render("panel          mean ms   p95 ms   16us .. 33ms", True, self.TEXT_SECONDARY)
+        overlay.blit(columns, (10, 92))
+        for i, name in enumerate(rows):
+            mean, p95, hits = summary[name]
+            y = 116 + i * 24
+            color = self.WARNING if name == 'frame' else self.TEXT_PRIMARY
+            overlay.blit(self.font_small.render(name, True, color), (10, y))
+            overlay.blit(self.font_small.render(f"{mean:7.2f}", True, color), (120, y))
+            overlay.blit(self.font_small.render(f"{p95:7.2f}", True, color), (190, y))
+            peak = max(int(hits.max()), 1)
+            for j, count in enumerate(hits):
+                bar = int(18 * count / peak)
+                if bar:
+                    pygame.draw.rect(overlay, self.ACCENT, (260 + j * 12, y + 18 - bar, 10, bar))
+        return overlay
     
     def run(self):
         """Main game loop"""
         running = True
         
         while running:
-            self.clock.tick(60)
-            self.animation_time += 0.016
+            # Animations advance by the real time since the last frame, so they keep pace under load
+            dt = min(self.clock.tick(self.FPS) / 1000, self.MAX_DT)
+            self.profiler.begin_frame(dt)
+            self.animation_time += dt
+            self.apply_events()
+            self.apply_shared()
             
             # Event handling
+            scroll_list = {'stats': self.stats_list, 'milestones': self.milestone_list}.get(self.current_view)
             for event in pygame.event.get():
+                if scroll_list and scroll_list.handle_event(event):
+                    continue
+                if self.current_view == "trends" and self.handle_trend_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -438,15 +841,24 @@ class LifeRPGVisual:
                         running = False
                     elif event.key == pygame.K_d:
                         self.current_view = "dashboard"
-                        self.data = self.load_data()  # Reload data
+                        if not self.live:
+                            self.reload_data()
                     elif event.key == pygame.K_s:
                         self.current_view = "stats"
-                        self.data = self.load_data()
+                        if not self.live:
+                            self.reload_data()
                     elif event.key == pygame.K_m:
                         self.current_view = "milestones"
-                        self.data = self.load_data()
+                        if not self.live:
+                            self.reload_data()
+                    elif event.key == pygame.K_t:
+                        self.current_view = "trends"
+                        if not self.live:
+                            self.reload_data()
                     elif event.key == pygame.K_r:
-                        self.data = self.load_data()  # Refresh data
+                        self.reload_data()  # Refresh data
+                    elif event.key == pygame.K_p:
+                        self.profiler.enabled = not self.profiler.enabled
             
             # Drawing
             self.screen.fill(self.BG_COLOR)
@@ -457,22 +869,50 @@ class LifeRPGVisual:
                 self.draw_stats_view()
             elif self.current_view == "milestones":
                 self.draw_milestones_view()
+            elif self.current_view == "trends":
+                self.draw_trends_view()
+            self.draw_effects(dt)
+            if self.profiler.enabled:
+                self.draw_profiler_overlay()
             
-            pygame.display.flip()
+            with instrument.timer('render.flip'):
+                pygame.display.flip()
+            self.governor.update(self.profiler.end_frame(), dt)
         
+        self.channel.close()
+        self.shared.detach()
         pygame.quit()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life RPG Visual Dashboard")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--profile', action='store_true',
+                        help="Print per-view render timings on exit")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="Also save cProfile stats (pstats format) to FILE")
+    parser.add_argument('--quality', choices=[name for name, _ in QUALITY_LEVELS],
+                        help="Pin the effect quality instead of adapting it to the frame rate")
+    args = parser.parse_args()
+    if args.profile or args.profile_output:
+        instrument.enable(args.profile_output)
+    
     print("🎮 Starting Life RPG Visual Dashboard...")
     print("Make sure you've run the main app and have data saved!")
     print("\nControls:")
     print("  D - Dashboard view")
     print("  S - Detailed stats view")
     print("  M - Milestones view")
+    print("  T - Trends view (1-4 range, Left/Right pan, +/- or wheel zoom)")
     print("  R - Refresh data")
+    print("  P - Frame profiler overlay")
+    print("  Wheel / Arrows / PgUp / PgDn / Home / End - Scroll stats and milestones")
     print("  Q - Quit")
     print("\nLaunching...")
     
-    app = LifeRPGVisual()
-    app.run()
\ No newline at end of file
+    app = LifeRPGVisual(args.data_file, args.quality)
+    try:
+        app.run()
+    finally:
+        if instrument.enabled:
+            instrument.dump()
\ No newline at end of file
@@ -1,26 +1,112 @@
-import json
+import argparse
+import asyncio
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 import os
 import random
+import sys
+import types
+
+from life_rpg_achievements import AchievementEngine
+from life_rpg_aggregates import AreaIndex
+from life_rpg_analytics import LABELS, LAGS, WEEKDAYS, WINDOW, HabitAnalytics
+from life_rpg_archive import ColumnarArchive
+from life_rpg_budget import Budget, Budgets
+from life_rpg_charts import TrendCharts, to_datetime64
+from life_rpg_history import History, HistoryMismatch, undoable
+from life_rpg_instrument import instrument, timed
+from life_rpg_ipc import Publisher, socket_path
+from life_rpg_journal import XPJournal
+from life_rpg_ledger import IncomeLedger, month_of, shift_month
+from life_rpg_model import Project, PushupRecord, Todo, attach, day_ordinal, iso_day
+from life_rpg_recurrence import Recurrence, RecurringTasks, ReminderScheduler, describe, fire_times
+from life_rpg_scores import ScoreTable
+from life_rpg_search import SearchIndex
+from life_rpg_sections import SectionStore
+from life_rpg_shm import SnapshotWriter, segment_name
+from life_rpg_snapshot import dumps, is_snapshot, load_snapshot, write_snapshot
+from life_rpg_sync import SyncClient, SyncError
 
 class PersonalLifeRPG:
-    def __init__(self, data_file='life_rpg_personal.json'):
+    def __init__(self, data_file='life_rpg_personal.json', publish=True):
         self.data_file = data_file
+        self.channel = None
+        self.shared = None
         self.DAILY_DECAY = 5  # Same as base exercise XP
         self.PUSHUP_REQUIREMENT = 100
         self.SCREEN_TIME_LIMIT = 2  # hours
         self.SOCIAL_LIMIT = 3  # times per week
+        self.XP_PER_LEVEL = 150
+        self.HISTORY_DEPTH = 50  # undo steps kept
+        self.REMINDER_TIME = '09:00'  # when one-off todos remind on their deadline day
+        self.LIST_LIMIT = 15  # longer pick lists ask for a search first
+        self.reminders = None
+        self.autosave = None  # when set, save_data() calls it instead of writing
+        self.listeners = []  # in-process subscribers to emit() events
+        self._journal = None
+        self.store = SectionStore(data_file)
         self.data = self.load_data()
+        self.aggregates = AreaIndex(self.data['life_areas'])
+        self.achievements = AchievementEngine(self.data['achievements'], self.aggregates)
+        self.search_index = SearchIndex(self.data)
+        self.history = History(self.data, os.path.splitext(data_file)[0] + '_history.json', self.HISTORY_DEPTH)
+        self.history.register('area', lambda area, delta: self.shift_area_xp(area, -delta),
+                              lambda area, delta: self.shift_area_xp(area, delta))
+        self.history.register('ledger', lambda entry: self.ledger.pop(),
+                              lambda entry: self.ledger.record(entry['date'], entry['amount'], entry['kind'],
+                                                               entry['project_id'], entry['note']))
+        self.history.register('achievement', self.achievements.revoke,
+                              lambda name: self.achievements.award([name]))
+        self.history.register('score', lambda day, field, old, new: self.set_score_component(day, field, old),
+                              lambda day, field, old, new: self.set_score_component(day, field, new))
+        self.history.register('archive', lambda day, column, old, new: self.archive.update(day, **{column: old}),
+                              lambda day, column, old, new: self.archive.update(day, **{column: new}))
+        self.history.register('journal', lambda *entry: self.journal.remove(*entry),
+                              lambda *entry: self.journal.add(*entry), path=('xp_journal',))
+        self.history.register('budget', lambda name, day, amount: self.budgets[name].add(day, -amount),
+                              lambda name, day, amount: self.budgets[name].add(day, amount))
+        self.sync = SyncClient.for_profile(data_file)
+        if self.sync.remote:
+            # Before decay: days another device already decayed arrive with its last_login
+            self.sync_profile()
         self.apply_daily_decay()
-        
+        if self.announce(self.achievements.evaluate(self.data['habits'])):
+            self.save_data()
+        self.archive = ColumnarArchive.for_profile(data_file)
+        self.archive_closed_months()
+        self.charts = TrendCharts(self.archive)
+        if 'sleep_log' not in self.data:  # not setdefault: that would load the section
+            self.data['sleep_log'] = {}
+        self.analytics = HabitAnalytics(self.charts)
+        self.budgets = Budgets(self.data.setdefault('budgets', {}))
+        self.ensure_budgets()
+        seed = 'score_components' not in self.data
+        self.scores = ScoreTable(self.data, self.archive, self.budgets, self.SCREEN_TIME_LIMIT)
+        if seed:
+            self.seed_score_components()
+        self.scores.prune(self.archive_horizon())
+        self.recurring = RecurringTasks(self.data.setdefault('recurring', []))
+        self.recurring.prune(self.archive_horizon())
+        self.ledger = IncomeLedger(self.data['income'])
+        self.roll_income_month()
+        if publish:
+            self.channel = Publisher(socket_path(data_file))
+            if not self.channel.elsewhere:
+                # The live owner also owns the shared segment; replacing it would cut its dashboards off
+                self.shared = SnapshotWriter(segment_name(data_file))
+                self.publish_shared()
+        
+    @timed('storage.load')
     def load_data(self):
         """Load existing data or create new profile"""
         if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+            if is_snapshot(self.data_file):
+                instrument.record_bytes('storage.load', os.path.getsize(self.data_file))
+                return attach(load_snapshot(self.data_file))
+            return self.store.load_profile()
         else:
-            return self.create_initial_data()
+            return attach(self.create_initial_data())
     
     def create_initial_data(self):
         """Initialize the data structure"""
@@ -77,6 +163,7 @@ class PersonalLifeRPG:
                 'manual_override': None
             },
             'daily_scores': [],
+            'sleep_log': {},
             'achievements': [],
             'last_login': self.today()
         }
@@ -84,10 +171,40 @@ class PersonalLifeRPG:
     def today(self):
         return datetime.now().strftime('%Y-%m-%d')
     
+    @timed('storage.save')
     def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        if self.autosave is not None:
+            self.autosave()  # deferred: the autosave task writes render_save() later
+        else:
+            instrument.record_bytes('storage.save', self.render_save()())
+        self.publish_shared()
+    
+    def render_save(self):
+        """Serialize the profile now; returns a function that writes it (and returns the bytes written)
+        
+        The terminal UI's autosave renders on the UI thread, where no action
+        changes the profile mid-dump, and leaves the writing to a worker thread.
+        """
+        if is_snapshot(self.data_file):
+            blob = dumps(self.data)
+            return lambda: write_snapshot(blob, self.data_file)
+        writes = self.store.render(self.data)
+        return lambda: self.store.write(writes)
+    
+    @property
+    def journal(self):
+        """The XP journal, built on first use so sessions that grant no XP never parse it"""
+        if self._journal is None:
+            self._journal = XPJournal(self.data.setdefault('xp_journal', {}))
+        return self._journal
     
+    def publish_shared(self):
+        """Refresh the shared-memory copy of the hot fields read by dashboards"""
+        if self.shared:
+            with instrument.timer('ipc.shared_publish'):
+                self.shared.publish(self.data)
+    
+    @timed('scoring.decay')
     def apply_daily_decay(self):
         """Apply XP decay to all inactive areas"""
         today = self.today()
@@ -99,18 +216,238 @@ class PersonalLifeRPG:
         
         if days_passed > 0:
             print(f"\n⏰ {days_passed} day(s) have passed. Applying decay...")
+            first = day_ordinal(self.data['last_login']) + 1
             for area, stats in self.data['life_areas'].items():
                 decay_amount = self.DAILY_DECAY * days_passed
-                stats['xp'] = max(0, stats['xp'] - decay_amount)
-                stats['level'] = self.calculate_level(stats['xp'])
+                xp = max(0, stats.xp - decay_amount)
+                # Synced per day, so a day decayed on two offline devices is taken once
+                self.sync.record_decay(area, first, day_ordinal(today), self.DAILY_DECAY, stats.xp - xp)
+                self.set_area_xp(area, xp)
                 print(f"   {area}: -{decay_amount} XP")
             
             self.data['last_login'] = today
             self.save_data()
     
+    @timed('storage.archive')
+    def archive_closed_months(self):
+        """Move finished months of scores and screen time into the columnar archive"""
+        if self.archive.through == shift_month(month_of(self.today()), -1):
+            return  # already done this month; don't load the sections just to find nothing
+        moved = self.archive.archive_closed_months(self.data, self.today())
+        if moved:
+            print(f"🗄️  Archived {moved} day(s) of history through {self.archive.through}")
+            self.save_data()
+    
+    def roll_income_month(self):
+        """Start a new income month when today is past target_month"""
+        closed = self.ledger.rollover(self.today())
+        if closed:
+            goal = self.data['income']['monthly_goal']
+            print(f"📅 {closed} closed at {self.ledger.month_total(closed):,} / {goal:,} Lari")
+            self.save_data()
+    
+    @undoable("Income")
+    def record_income(self, amount, kind='project', project_id=None, note=None):
+        """Add a ledger transaction dated today and tell dashboards about it"""
+        entry = self.ledger.record(self.today(), amount, kind, project_id, note)
+        self.history.record('ledger', entry)
+        self.emit('income', entry=entry, current_month_earnings=self.ledger.month_total(month_of(self.today())))
+        return entry
+    
+    def ensure_budgets(self):
+        """Create the built-in social and screen-time budgets, seeded from older counters"""
+        today = day_ordinal(self.today())
+        if 'social' not in self.budgets:
+            self.data['budgets']['social'] = Budget.new_state(7, self.SOCIAL_LIMIT, 'times', penalty=20)
+            social = self.budgets['social']
+            social.advance(today)
+            # Older profiles only counted since week_start; keep that count if it is still inside the window
+            legacy = self.data.get('social_interactions', {})
+            if legacy.get('weekly_count') and legacy.get('week_start'):
+                social.add(legacy['week_start'], legacy['weekly_count'])
+        if 'screen_time' not in self.budgets:
+            self.data['budgets']['screen_time'] = Budget.new_state(7, self.SCREEN_TIME_LIMIT * 7, 'hours')
+            screen = self.budgets['screen_time']
+            screen.advance(today)
+            recent = self.archive.slice(today - 6, today)
+            for day, hours in zip(recent['day'].tolist(), recent['screen'].tolist()):
+                if hours == hours:  # NaN = not logged
+                    screen.set(day, hours)
+            for day, hours in self.data['screen_time']['daily_log'].items():
+                screen.set(day, hours)
+    
+    def archive_horizon(self):
+        """First day (ordinal) whose score can still be recomputed: the start of last month"""
+        return day_ordinal(shift_month(month_of(self.today()), -1) + '-01')
+    
+    def seed_score_components(self):
+        """First run with score counters: derive the recent ones from the profile"""
+        today = self.today()
+        day = day_ordinal(today)
+        habits = self.data['habits']
+        self.scores.set(day, 'shower', int(habits['shower']['last_done'] == today))
+        self.scores.set(day, 'workout', int(habits['workout']['last_done'] == today))
+        self.scores.set(day, 'todos', sum(1 for t in self.data['todos']
+                                          if t.completed and getattr(t, 'completion_date', None) == day))
+        if today in self.data['screen_time']['daily_log']:
+            self.scores.set(day, 'screen', self.data['screen_time']['daily_log'][today])
+        social = self.budgets['social']
+        for back in range(social.window):
+            if social.get(day - back):
+                self.scores.set(day - back, 'social', social.get(day - back))
+    
+    def set_score_component(self, day, field, value):
+        """Update one of a day's score counters and re-score the days it affects; returns the old value"""
+        day = day_ordinal(day)
+        old = self.scores.set(day, field, value)
+        for changed, score, grade in self.scores.rescore(day, field):
+            self.emit('score', date=iso_day(changed), score=score, grade=grade)
+        return old
+    
+    def score_event(self, field, value=None, day=None):
+        """Journaled counter update: set `field` to `value`, or count one more if value is None"""
+        day = day_ordinal(day or self.today())
+        if value is None:
+            value = self.scores.get(day, field) + 1
+        old = self.set_score_component(day, field, value)
+        self.history.record('score', day, field, old, value)
+    
+    def apply_penalty(self, penalty):
+        """Take `penalty` XP, split evenly across all areas"""
+        share = penalty // len(self.data['life_areas'])
+        for area, stats in self.data['life_areas'].items():
+            self.set_area_xp(area, max(0, stats.xp - share))
+    
+    def log_budget(self, name, amount, escalate=False):
+        """Add today's usage of a budgeted activity; returns (rolling total, XP penalty applied)
+
+        The penalty is for the whole overrun of the rolling total. With
+        escalate, every log over the limit pays it again (social: each extra
+        outing costs more); otherwise a day pays it once, so usage logged in
+        chunks only pays for the overrun each chunk adds.
+        """
+        budget = self.budgets[name]
+        today = self.today()
+        budget.add(today, amount)
+        self.history.record('budget', name, today, amount)
+        penalty = int(budget.over(today) * budget.penalty)
+        if not escalate:
+            day, paid = budget.state.get('charged') or (None, 0)
+            paid = paid if day == today else 0
+            if penalty > paid:
+                self.history.set(('budgets', name, 'charged'), [today, penalty])
+            penalty = max(0, penalty - paid)
+        if penalty:
+            self.apply_penalty(penalty)
+        return budget.used(today), penalty
+    
+    @undoable("Budget")
+    def log_budget_usage(self, name, amount):
+        """Log usage of a user-defined budget"""
+        budget = self.budgets[name]
+        used, penalty = self.log_budget(name, amount)
+        if penalty:
+            print(f"⚠️  {name} over budget ({used:g}/{budget.limit:g} {budget.unit} "
+                  f"in {budget.window} days)! -{penalty} XP")
+        else:
+            print(f"✅ {name}: {used:g}/{budget.limit:g} {budget.unit} in the last {budget.window} days")
+        self.save_data()
+    
+    @undoable("Add budget")
+    def add_budget(self, name, window, limit, unit, penalty):
+        """Define a budgeted activity: at most `limit` units per rolling `window` days"""
+        if name in self.budgets:
+            print("Budget already exists!")
+            return
+        self.history.set(('budgets', name), Budget.new_state(window, limit, unit, penalty))
+        self.budgets[name].advance(day_ordinal(self.today()))
+        print(f"⏳ Budget added: {name} ({limit:g} {unit} per {window} days, -{penalty:g} XP per unit over)")
+        self.save_data()
+    
+    def show_budgets(self):
+        today = self.today()
+        print("\n⏳ BUDGETS (rolling windows):")
+        for name in self.budgets:
+            budget = self.budgets[name]
+            used = budget.used(today)
+            status = "⚠️ " if used > budget.limit else "✅"
+            print(f"  {status} {name}: {used:g}/{budget.limit:g} {budget.unit} in the last {budget.window} days")
+    
+    def recent_scores(self, count=30):
+        """Last `count` daily scores, reading older days from the archive"""
+        live = [s['score'] for s in self.data['daily_scores'][-count:]]
+        need = count - len(live)
+        if need > 0 and self.archive.rows:
+            _, archived, _ = self.archive.recent_scores(need)
+            return archived.tolist() + live
+        return live
+    
     def calculate_level(self, xp):
         """150 XP per level (challenging)"""
-        return (xp // 150) + 1
+        return (xp // self.XP_PER_LEVEL) + 1
+    
+    def set_area_xp(self, area, xp):
+        """Single write path for area XP so levels, aggregates and undo history stay in step"""
+        self.history.record('area', area, xp - self.aggregates.areas[area].xp)
+        self.aggregates.set_xp(area, xp, self.calculate_level(xp))
+        self.emit('area', area=area, xp=xp, level=self.aggregates.areas[area].level)
+    
+    def shift_area_xp(self, area, delta):
+        self.set_area_xp(area, max(0, self.data['life_areas'][area].xp + delta))
+    
+    def undo(self):
+        """Revert the most recent recorded action"""
+        try:
+            label = self.history.undo()
+        except HistoryMismatch as e:
+            print(f"❌ Can't undo: {e}. The profile changed outside the app; nothing was undone and history was cleared.")
+            return None
+        if label is None:
+            print("Nothing to undo.")
+            return None
+        self.save_data()
+        self.history.save()
+        self.schedule_reminders()
+        self.search_index.invalidate()
+        self.emit('history', action='undo', label=label)
+        print(f"↩️  Undid: {label}")
+        return label
+    
+    def redo(self):
+        """Re-apply the most recently undone action"""
+        try:
+            label = self.history.redo()
+        except HistoryMismatch as e:
+            print(f"❌ Can't redo: {e}. The profile changed outside the app; nothing was redone and history was cleared.")
+            return None
+        if label is None:
+            print("Nothing to redo.")
+            return None
+        self.save_data()
+        self.history.save()
+        self.schedule_reminders()
+        self.search_index.invalidate()
+        self.emit('history', action='redo', label=label)
+        print(f"↪️  Redid: {label}")
+        return label
+    
+    def show_history(self):
+        undo, redo = self.history.labels()
+        print(f"\n🕘 HISTORY (up to {self.HISTORY_DEPTH} steps)")
+        for label in redo[::-1]:
+            print(f"   ↪️  {label}")
+        for i, label in enumerate(undo):
+            print(f"{' →' if i == 0 else '  '} {label}")
+        if not undo and not redo:
+            print("   (empty)")
+    
+    def emit(self, event_type, **fields):
+        """Push a delta event to running dashboards and in-process listeners"""
+        event = {'type': event_type, **fields}
+        if self.channel:
+            self.channel.emit(event)
+        for listener in self.listeners:
+            listener(event)
     
     def calculate_time_multiplier(self, deadline_str, completed_str):
         """Calculate XP multiplier based on completion time"""
@@ -125,20 +462,23 @@ class PersonalLifeRPG:
         else:  # More than 1.5x time
             return 0.5
     
-    def add_xp(self, area, points, reason=""):
-        """Add XP to a life area"""
-        if area in self.data['life_areas']:
-            old_xp = self.data['life_areas'][area]['xp']
-            old_level = self.data['life_areas'][area]['level']
+    @undoable("XP")
+    @timed('scoring.add_xp')
+    def add_xp(self, area, points, reason="", minutes=0):
+        """Add XP to a life area (minutes: time spent, for study/practice sessions)"""
+        stats = self.data['life_areas'].get(area)
+        if stats is not None:
+            old_level = stats.level
             
-            self.data['life_areas'][area]['xp'] += points
-            self.data['life_areas'][area]['last_active'] = self.today()
-            new_level = self.calculate_level(self.data['life_areas'][area]['xp'])
-            self.data['life_areas'][area]['level'] = new_level
+            self.set_area_xp(area, stats.xp + points)
+            self.history.set(('life_areas', area, 'last_active'), self.today())
+            self.journal.add(area, self.today(), points, reason, minutes)
+            self.history.record('journal', area, self.today(), points, reason, minutes)
+            new_level = stats.level
             
             if new_level > old_level:
                 print(f"🎉 LEVEL UP! {area} is now Level {new_level}!")
-                self.check_achievements(area, new_level)
+                self.check_achievements(area, old_level, new_level)
             
             msg = f"+{points} XP → {area}"
             if reason:
@@ -149,24 +489,29 @@ class PersonalLifeRPG:
         else:
             print(f"Area '{area}' not found!")
     
+    @undoable("Pushups")
     def track_pushups(self, count):
         """Track pushup workout with consistency bonus"""
         today = self.today()
         habit = self.data['habits']['workout']
+        old_streak = habit['streak']
         
         # Update streak
         if habit['last_done']:
             last = datetime.strptime(habit['last_done'], '%Y-%m-%d')
             diff = (datetime.strptime(today, '%Y-%m-%d') - last).days
             if diff == 1:
-                habit['streak'] += 1
+                self.history.set(('habits', 'workout', 'streak'), habit['streak'] + 1)
             elif diff > 1:
-                habit['streak'] = 1
+                self.history.set(('habits', 'workout', 'streak'), 1)
         else:
-            habit['streak'] = 1
+            self.history.set(('habits', 'workout', 'streak'), 1)
         
-        habit['last_done'] = today
-        habit['pushup_history'].append({'date': today, 'count': count})
+        self.history.set(('habits', 'workout', 'last_done'), today)
+        self.score_event('workout', 1)
+        self.history.append(('habits', 'workout', 'pushup_history'), PushupRecord(date=today, count=count))
+        self.emit('habit', habit='workout', streak=habit['streak'], last_done=today)
+        self.announce(self.achievements.streak_changed('workout', old_streak, habit['streak']))
         
         # Calculate XP
         base_xp = self.DAILY_DECAY  # 15 XP
@@ -190,6 +535,7 @@ class PersonalLifeRPG:
         
         self.save_data()
     
+    @undoable("Shower")
     def check_shower(self):
         """Mark daily shower as complete"""
         today = self.today()
@@ -198,19 +544,23 @@ class PersonalLifeRPG:
         if habit['last_done'] == today:
             print("Already logged shower today!")
             return
+        old_streak = habit['streak']
         
         # Update streak
         if habit['last_done']:
             last = datetime.strptime(habit['last_done'], '%Y-%m-%d')
             diff = (datetime.strptime(today, '%Y-%m-%d') - last).days
             if diff == 1:
-                habit['streak'] += 1
+                self.history.set(('habits', 'shower', 'streak'), habit['streak'] + 1)
             elif diff > 1:
-                habit['streak'] = 1
+                self.history.set(('habits', 'shower', 'streak'), 1)
         else:
-            habit['streak'] = 1
+            self.history.set(('habits', 'shower', 'streak'), 1)
         
-        habit['last_done'] = today
+        self.history.set(('habits', 'shower', 'last_done'), today)
+        self.score_event('shower', 1)
+        self.emit('habit', habit='shower', streak=habit['streak'], last_done=today)
+        self.announce(self.achievements.streak_changed('shower', old_streak, habit['streak']))
         self.add_xp('Health - Hygiene', 10, "Daily shower")
         
         if habit['streak'] >= 7:
@@ -218,8 +568,10 @@ class PersonalLifeRPG:
         
         self.save_data()
     
+    @undoable("Sleep")
     def log_sleep(self, hours):
         """Log sleep hours"""
+        self.history.set(('sleep_log', self.today()), hours)
         xp = 0
         if hours >= 7 and hours <= 8:
             xp = 20
@@ -233,71 +585,84 @@ class PersonalLifeRPG:
         
         self.add_xp('Health - Sleep', xp, f"{hours}h - {msg}")
     
-    def track_screen_time(self, hours):
-        """Track daily screen time with penalties"""
+    @undoable("Screen time")
+    def track_screen_time(self, hours, day=None):
+        """Track daily screen time with penalties; `day` backfills an earlier date"""
         today = self.today()
-        self.data['screen_time']['daily_log'][today] = hours
+        ordinal = day_ordinal(day or today)
+        day = iso_day(ordinal)  # '2026-10-5' is accepted; the log is keyed by the padded form
+        if self.archive.covers(ordinal):
+            # The month was already archived: write the column in place instead of the live log
+            row = self.archive.row_of(ordinal)
+            old = float(self.archive.columns['screen'][row]) if row is not None else float('nan')
+            self.archive.update(ordinal, screen=hours)
+            self.history.record('archive', ordinal, 'screen', old, hours)
+        else:
+            self.history.set(('screen_time', 'daily_log', day), hours)
+        week = self.budgets['screen_time']
+        self.history.record('budget', 'screen_time', day, week.set(day, hours))
+        self.score_event('screen', hours, day)
+        if day != today:
+            print(f"📅 Screen time for {day}")
         
         if hours > self.SCREEN_TIME_LIMIT:
             penalty = int((hours - self.SCREEN_TIME_LIMIT) * 10)
             print(f"⚠️  Screen time exceeded limit! -{penalty} XP penalty")
             # Apply penalty across all areas
-            for area in self.data['life_areas']:
-                self.data['life_areas'][area]['xp'] = max(0, self.data['life_areas'][area]['xp'] - penalty // len(self.data['life_areas']))
+            self.apply_penalty(penalty)
         else:
             print(f"✅ Screen time under control: {hours}h/{self.SCREEN_TIME_LIMIT}h")
+        print(f"📱 Last {week.window} days: {week.used(today):g}h / {week.limit:g}h")
         
         self.save_data()
     
+    @undoable("Social interaction")
     def log_social_interaction(self):
-        """Log going out/helping friends with weekly limit"""
-        today = self.today()
-        week_start = datetime.strptime(self.data['social_interactions']['week_start'], '%Y-%m-%d')
-        today_dt = datetime.strptime(today, '%Y-%m-%d')
-        
-        # Reset weekly counter if new week
-        if (today_dt - week_start).days >= 7:
-            self.data['social_interactions']['weekly_count'] = 0
-            self.data['social_interactions']['week_start'] = today
-        
-        self.data['social_interactions']['weekly_count'] += 1
-        count = self.data['social_interactions']['weekly_count']
-        
-        if count > self.SOCIAL_LIMIT:
-            penalty = (count - self.SOCIAL_LIMIT) * 20
-            print(f"⚠️  Social interaction limit exceeded ({count}/{self.SOCIAL_LIMIT})! -{penalty} XP")
-            for area in self.data['life_areas']:
-                self.data['life_areas'][area]['xp'] = max(0, self.data['life_areas'][area]['xp'] - penalty // len(self.data['life_areas']))
+        """Log going out/helping friends with a rolling 7-day limit"""
+        social = self.budgets['social']
+        used, penalty = self.log_budget('social', 1, escalate=True)
+        self.score_event('social')
+        count = int(used)
+        # weekly_count mirrors the rolling count for older readers of the profile
+        self.history.set(('social_interactions', 'weekly_count'), count)
+        
+        if penalty:
+            print(f"⚠️  Social interaction limit exceeded ({count}/{social.limit} in {social.window} days)! -{penalty} XP")
         else:
-            print(f"✅ Social balance maintained: {count}/{self.SOCIAL_LIMIT} this week")
+            print(f"✅ Social balance maintained: {count}/{social.limit} in the last {social.window} days")
             self.add_xp('Social Balance', 5, "Balanced interaction")
         
         self.save_data()
     
+    @undoable("Add project")
     def add_project(self, name, value_lari, deadline):
         """Add new project"""
-        project = {
-            'id': len(self.data['projects']) + 1,
-            'name': name,
-            'value': value_lari,
-            'deadline': deadline,
-            'completed': False,
-            'completion_date': None,
-            'created': self.today()
-        }
-        self.data['projects'].append(project)
+        project = Project(
+            id=len(self.data['projects']) + 1,
+            name=name,
+            value=value_lari,
+            deadline=deadline,
+            completed=False,
+            completion_date=None,
+            created=self.today()
+        )
+        self.history.append(('projects',), project)
+        self.search_index.add('project', project.id, project)
         print(f"📋 Project added: {name} ({value_lari} Lari)")
         self.save_data()
     
+    @undoable("Complete project")
     def complete_project(self, project_id):
         """Complete a project and earn money + XP"""
-        for project in self.data['projects']:
-            if project['id'] == project_id and not project['completed']:
-                project['completed'] = True
-                project['completion_date'] = self.today()
+        for index, project in enumerate(self.data['projects']):
+            if project.id == project_id and not project.completed:
+                self.history.set(('projects', index, 'completed'), True)
+                self.history.set(('projects', index, 'completion_date'), self.today())
+                self.search_index.update('project', project_id, project)
                 
                 # Add to monthly earnings
-                self.data['income']['current_month_earnings'] += project['value']
+                self.record_income(project['value'], project_id=project_id)
+                self.emit('project', id=project_id, completed=True, completion_date=project['completion_date'])
                 
                 # Calculate XP with time multiplier
                 multiplier = self.calculate_time_multiplier(project['deadline'], self.today())
@@ -311,50 +676,183 @@ class PersonalLifeRPG:
                     self.add_xp(area, xp_per_area, f"Project: {project['name']}")
                 
                 print(f"💰 Project completed: {project['name']} (+{project['value']} Lari)")
-                print(f"📊 Monthly progress: {self.data['income']['current_month_earnings']}/{self.data['income']['monthly_goal']} Lari")
+                print(f"📊 Monthly progress: {self.ledger.month_total(month_of(self.today()))}/{self.data['income']['monthly_goal']} Lari")
                 
                 self.save_data()
                 return
         print("Project not found or already completed!")
     
+    @undoable("Add todo")
     def add_todo(self, task, area, base_xp, deadline):
         """Add todo with time-based XP"""
-        todo = {
-            'id': len(self.data['todos']) + 1,
-            'task': task,
-            'area': area,
-            'base_xp': base_xp,
-            'deadline': deadline,
-            'completed': False,
-            'created': self.today()
-        }
-        self.data['todos'].append(todo)
+        todo = Todo(
+            id=len(self.data['todos']) + 1,
+            task=task,
+            area=area,
+            base_xp=base_xp,
+            deadline=deadline,
+            completed=False,
+            created=self.today()
+        )
+        self.history.append(('todos',), todo)
+        self.search_index.add('todo', todo.id, todo)
         print(f"✅ Todo added: {task} (up to {int(base_xp * 1.5)} XP if early)")
+        self.remind_todo(todo)
         self.save_data()
     
+    @undoable("Complete todo")
     def complete_todo(self, todo_id):
         """Complete todo with time multiplier"""
-        for todo in self.data['todos']:
-            if todo['id'] == todo_id and not todo['completed']:
-                todo['completed'] = True
-                todo['completion_date'] = self.today()
+        for index, todo in enumerate(self.data['todos']):
+            if todo.id == todo_id and not todo.completed:
+                self.history.set(('todos', index, 'completed'), True)
+                self.history.set(('todos', index, 'completion_date'), self.today())
+                self.search_index.update('todo', todo_id, todo)
+                self.score_event('todos')
+                self.emit('todo', id=todo_id, completed=True, completion_date=todo['completion_date'])
                 
                 multiplier = self.calculate_time_multiplier(todo['deadline'], self.today())
                 xp = int(todo['base_xp'] * multiplier)
                 
                 self.add_xp(todo['area'], xp, f"Task: {todo['task']}")
                 print(f"✨ Todo completed: {todo['task']}")
+                if self.reminders:
+                    self.reminders.remove(('todo', todo_id))
                 
                 self.save_data()
                 return
         print("Todo not found or already completed!")
     
+    @undoable("Add recurring")
+    def add_recurring(self, task, area, base_xp, rule, start=None, remind_at=None):
+        """Add a repeating task; occurrences are generated from the rule, never stored"""
+        # Reject bad input (ValueError) before anything is recorded; finding the next
+        # occurrence runs the series (COUNT included), so a saved item can always be scheduled
+        start = iso_day(day_ordinal(start)) if start else self.today()
+        upcoming = Recurrence(rule, start).next_after(day_ordinal(self.today()))
+        if remind_at:
+            datetime.strptime(remind_at, '%H:%M')
+        item = {
+            'id': max((i['id'] for i in self.recurring), default=0) + 1,
+            'task': task,
+            'area': area,
+            'base_xp': base_xp,
+            'rule': rule,
+            'start': start,
+            'remind_at': remind_at,
+            'active': True,
+            'done': [],
+            'created': self.today()
+        }
+        self.history.append(('recurring',), item)
+        print(f"🔁 Recurring task added: {task} ({describe(rule)}, next: {iso_day(upcoming) if upcoming else 'never'})")
+        self.remind_recurring(item)
+        self.save_data()
+    
+    @undoable("Complete recurring")
+    def complete_recurring(self, item_id):
+        """Complete the occurrence of a recurring task that is currently due"""
+        index, item = self.recurring.find(item_id)
+        today = self.today()
+        occurrence = self.recurring.recurrence(item).last_before(day_ordinal(today)) if item else None
+        if occurrence is None or iso_day(occurrence) in item['done']:
+            print("Nothing due for that recurring task!")
+            return
+        day = iso_day(occurrence)
+        self.history.append(('recurring', index, 'done'), day)
+        self.score_event('todos')
+        
+        xp = int(item['base_xp'] * self.calculate_time_multiplier(day, today))
+        self.add_xp(item['area'], xp, f"Recurring: {item['task']}")
+        print(f"✨ {item['task']} done for {day}")
+        self.remind_recurring(item)
+        self.save_data()
+    
+    @undoable("Recurring on/off")
+    def set_recurring_active(self, item_id, active):
+        index, item = self.recurring.find(item_id)
+        if item is None:
+            print("Recurring task not found!")
+            return
+        self.history.set(('recurring', index, 'active'), active)
+        print(f"{'▶️ ' if active else '⏸️ '} {item['task']} {'resumed' if active else 'paused'}")
+        self.remind_recurring(item)
+        self.save_data()
+    
+    def remind_todo(self, todo):
+        if self.reminders is None or todo['completed']:
+            return
+        try:
+            deadline = day_ordinal(todo.get('deadline'))
+        except ValueError:
+            return  # free-form deadline ('next week'), kept as typed; nothing to schedule
+        if deadline is None:
+            return
+        self.reminders.add(('todo', todo['id']), fire_times([deadline], self.REMINDER_TIME),
+                           "Task due today", f"{todo['task']} ({todo['area']})")
+    
+    def remind_recurring(self, item):
+        if self.reminders is None:
+            return
+        key = ('recurring', item['id'])
+        if item['active'] and item['remind_at']:
+            pending = self.recurring.pending(item, day_ordinal(self.today()))
+            self.reminders.add(key, fire_times(pending, item['remind_at']),
+                               "Recurring task", f"{item['task']} ({item['area']})")
+        else:
+            self.reminders.remove(key)
+    
+    def schedule_reminders(self):
+        """(Re)load every reminder: todo deadlines and recurring tasks with a reminder time"""
+        if self.reminders is None:
+            return
+        self.reminders.clear()
+        for todo in self.data['todos']:
+            self.remind_todo(todo)
+        for item in self.recurring:
+            self.remind_recurring(item)
+    
+    def start_reminders(self, scheduler=None):
+        """Attach a reminder scheduler; its loop runs in a background thread unless one is passed in"""
+        self.reminders = scheduler or ReminderScheduler()
+        if scheduler is None:
+            # Loading reminders reads the todos section; do it off the menu's thread
+            self.reminders.start_thread(prepare=self.schedule_reminders)
+        else:
+            self.schedule_reminders()
+        return self.reminders
+    
+    async def run_reminders(self, poll=30):
+        """Reminder loop without the menu; picks up todos and recurring tasks saved by other processes"""
+        scheduler = self.start_reminders(ReminderScheduler())
+        print(f"⏰ Watching {len(scheduler.sources)} reminders (Ctrl+C to stop)")
+        runner = asyncio.create_task(scheduler.run())
+        mtime = os.path.getmtime(self.data_file)
+        while not runner.done():
+            await asyncio.sleep(poll)
+            if os.path.getmtime(self.data_file) != mtime:
+                mtime = os.path.getmtime(self.data_file)
+                data = self.load_data()
+                self.data['todos'] = data['todos']
+                self.data['recurring'] = data.get('recurring', [])
+                self.recurring = RecurringTasks(self.data['recurring'])
+                self.schedule_reminders()
+        await runner
+    
+    def agenda_recurring(self, upcoming=5):
+        """(due, upcoming) recurring occurrences for today's agenda"""
+        today = day_ordinal(self.today())
+        return self.recurring.due(today), self.recurring.upcoming(today, upcoming)
+    
+    @undoable("Epic milestone")
     def complete_epic_milestone(self, milestone_key):
         """Complete an epic milestone"""
         if milestone_key in self.data['epic_milestones']:
             milestone = self.data['epic_milestones'][milestone_key]
             if not milestone['completed']:
-                milestone['completed'] = True
+                self.history.set(('epic_milestones', milestone_key, 'completed'), True)
+                self.search_index.update('milestone', milestone_key, milestone)
+                self.emit('milestone', key=milestone_key, completed=True)
                 
                 # Massive XP reward distributed across all areas
                 xp_per_area = milestone['xp_reward'] // len(self.data['life_areas'])
@@ -371,55 +869,51 @@ class PersonalLifeRPG:
         else:
             print("Milestone not found!")
     
-    def calculate_daily_score(self):
-        """Calculate daily performance score"""
-        score = 0
-        today = self.today()
-        
-        # Habits completed (40 points)
-        if self.data['habits']['shower']['last_done'] == today:
-            score += 20
-        if self.data['habits']['workout']['last_done'] == today:
-            score += 20
-        
-        # Todos completed today (30 points)
-        completed_today = [t for t in self.data['todos'] 
-                          if t.get('completion_date') == today]
-        score += min(len(completed_today) * 10, 30)
-        
-        # Screen time (15 points)
-        if today in self.data['screen_time']['daily_log']:
-            hours = self.data['screen_time']['daily_log'][today]
-            if hours <= self.SCREEN_TIME_LIMIT:
-                score += 15
-        
-        # Social balance (15 points)
-        if self.data['social_interactions']['weekly_count'] <= self.SOCIAL_LIMIT:
-            score += 15
-        
-        # Convert to grade
-        if score >= 95:
-            grade = "SSS"
-        elif score >= 90:
-            grade = "SS"
-        elif score >= 85:
-            grade = "S"
-        elif score >= 80:
-            grade = "A+"
-        elif score >= 75:
-            grade = "A"
-        elif score >= 70:
-            grade = "A-"
-        elif score >= 60:
-            grade = "B"
-        elif score >= 50:
-            grade = "C"
-        elif score >= 40:
-            grade = "D"
-        else:
-            grade = "F"
-        
-        return score, grade
+    @timed('sync.round')
+    def sync_profile(self, quiet=False):
+        """Push edits to the sync server and merge everyone else's; False when it can't be reached"""
+        try:
+            changed = self.sync.sync(self.data)
+        except SyncError as e:
+            print(f"📴 Can't reach the sync server ({e}) - changes will go out next time")
+            return False
+        stats = self.sync.last
+        rebuild = False
+        for area, xp in changed.items():
+            if area in self.aggregates.positions:
+                self.aggregates.set_xp(area, xp, self.calculate_level(xp))
+                self.emit('area', area=area, xp=xp, level=self.aggregates.areas[area].level)
+            else:
+                record = self.data['life_areas'][area]
+                record.xp, record.level = xp, self.calculate_level(xp)
+                rebuild = True
+        if rebuild:
+            self.aggregates = AreaIndex(self.data['life_areas'])
+            self.achievements = AchievementEngine(self.data['achievements'], self.aggregates)
+        if stats['joined']:
+            # Todos were renumbered to match the server; old undo steps no longer line up
+            self.history.clear()
+        if stats['pulled'] or stats['joined']:
+            self.announce(self.achievements.evaluate(self.data['habits']))
+            self.search_index.invalidate()
+            self.schedule_reminders()
+            self.emit('history', action='sync', label="Sync")
+            self.save_data()
+        if not quiet:
+            print(f"🔄 Synced: ↑ {stats['pushed']} ↓ {stats['pulled']} records"
+                  + (f", {stats['conflicts']} merged with concurrent edits" if stats['conflicts'] else "")
+                  + f" ({(stats['sent'] + stats['received']) / 1024:.1f} KB, {stats['seconds'] * 1e3:.0f} ms)")
+        return True
+    
+    @timed('search.query')
+    def search(self, query, **filters):
+        """Ranked [(kind, ref, item)] over todos, projects and milestones (see SearchIndex.search)"""
+        return self.search_index.search(query, **filters)
+    
+    @timed('scoring.daily_score')
+    def calculate_daily_score(self, day=None):
+        """Calculate daily performance score (O(1) from the day's counters)"""
+        return self.scores.score(day_ordinal(day or self.today()))
     
     def daily_summary(self):
         """Show end of day summary"""
@@ -432,22 +926,21 @@ class PersonalLifeRPG:
         print(f"Grade: {grade}")
         print("="*60)
         
-        # Save score
-        self.data['daily_scores'].append({
-            'date': self.today(),
-            'score': score,
-            'grade': grade
-        })
+        # Save score (one entry per day; later events keep it up to date)
+        self.scores.upsert(day_ordinal(self.today()), score, grade)
+        self.emit('score', date=self.today(), score=score, grade=grade)
         self.save_data()
     
-    def check_achievements(self, area, level):
-        """Check and award achievements"""
-        achievement_thresholds = {5: "Bronze", 10: "Silver", 20: "Gold", 30: "Platinum"}
-        if level in achievement_thresholds:
-            achievement = f"{area} - {achievement_thresholds[level]} Tier"
-            if achievement not in self.data['achievements']:
-                self.data['achievements'].append(achievement)
-                print(f"🏅 Achievement Unlocked: {achievement}!")
+    def check_achievements(self, area, old_level, new_level):
+        """Award every tier, category and total-level achievement crossed by a level-up"""
+        self.announce(self.achievements.level_changed(area, old_level, new_level))
+    
+    def announce(self, achievements):
+        for achievement in achievements:
+            print(f"🏅 Achievement Unlocked: {achievement}!")
+            self.history.record('achievement', achievement)
+            self.emit('achievement', name=achievement)
+        return achievements
     
     def view_stats(self):
         """Display comprehensive stats"""
@@ -455,23 +948,17 @@ class PersonalLifeRPG:
         print("⚔️  YOUR CHARACTER STATS ⚔️".center(70))
         print("="*70)
         
-        total_level = sum(area['level'] for area in self.data['life_areas'].values())/self.data['life_areas'].__len__()
-        total_xp = sum(area['xp'] for area in self.data['life_areas'].values())
+        total_level = self.aggregates.average_level
+        total_xp = self.aggregates.total_xp
         print(f"Total Level: {total_level} | Total XP: {total_xp}")
         print("-"*70)
         
         # Group by category
-        categories = {}
-        for area, stats in self.data['life_areas'].items():
-            category = area.split(' - ')[0]
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((area, stats))
-        
-        for category, areas in categories.items():
+        short_names = self.aggregates.short_names
+        for category, areas in self.aggregates.categories.items():
             print(f"\n📚 {category.upper()}")
             for area, stats in areas:
-                short_name = area.split(' - ')[-1] if ' - ' in area else area
+                short_name = short_names[area]
                 xp_to_next = 150 - (stats['xp'] % 150)
                 progress = "█" * (stats['xp'] % 150 // 15) + "░" * (10 - stats['xp'] % 150 // 15)
                 print(f"  {short_name:20} | Lv {stats['level']:2} | [{progress}] {xp_to_next:3} XP to next")
@@ -487,13 +974,57 @@ class PersonalLifeRPG:
         # Income progress
         print("\n💰 INCOME PROGRESS")
         print("-"*70)
-        current = self.data['income']['current_month_earnings']
         goal = self.data['income']['monthly_goal']
+        current, expected, projected, needed = self.ledger.goal_pace(self.today(), goal)
         progress_pct = (current / goal * 100) if goal > 0 else 0
         bar_length = int(progress_pct / 2)
         bar = "█" * bar_length + "░" * (50 - bar_length)
         print(f"[{bar}] {progress_pct:.1f}%")
         print(f"{current:,} / {goal:,} Lari")
+        print(f"Pace: {expected:,.0f} expected by today | projected {projected:,.0f} | "
+              f"{needed:,.0f} Lari/day needed")
+        print(f"Last 12 months: {self.ledger.trailing_12_months(month_of(self.today())):,} Lari")
+        
+        # XP journal: where the XP came from lately
+        print("\n📓 XP EARNED")
+        print("-"*70)
+        today = day_ordinal(self.today())
+        gains = sorted(((self.journal.gained(area, today - 6, today), area) for area in self.journal.areas), reverse=True)
+        for gained, area in gains[:5]:
+            if gained:
+                print(f"{short_names.get(area, area):20} | +{gained:4} XP this week | "
+                      f"+{self.journal.gained(area, today - 29, today):5} in 30 days")
+        studied = [area for area in self.journal.areas if self.journal.minutes(area)]
+        if studied:
+            weeks = self.journal.weekly(studied, today - 21, today)
+            print("Study time per week: " + "  ".join(f"{iso_day(monday)[5:]} {total / 60:.1f}h" for monday, total in weeks))
+        
+        # Habit analytics: what goes with a good day
+        print("\n📈 HABIT INSIGHTS")
+        print("-"*70)
+        self.analytics.update(self.data)
+        results = self.analytics.results
+        shown = False
+        for metric, label in LABELS.items():
+            cells = []
+            for lag in LAGS:
+                stats = results['correlations'][metric, lag]
+                if stats['r'] == stats['r']:  # not NaN
+                    cells.append(f"{'same day' if lag == 0 else 'next day'} r={stats['r']:+.2f} ({stats['pairs']}d)")
+            if cells:
+                recent = results['correlations'][metric, 0]['recent']
+                if recent == recent:
+                    cells.append(f"last {WINDOW}d r={recent:+.2f}")
+                print(f"{label:12} vs score | " + " | ".join(cells))
+                shown = True
+        if not shown:
+            print("Not enough data yet: log sleep, screen time and push-ups for a couple of weeks")
+        usual = results['weekday'][:, 0]
+        if (usual == usual).any():
+            print("Usual score: " + "  ".join(f"{name} {value:.0f}" for name, value in zip(WEEKDAYS, usual) if value == value))
+            score, baseline = self.analytics.value('score', today), self.analytics.baseline('score', today)
+            if score == score and baseline == baseline:
+                print(f"Today: {score:.0f} ({score - baseline:+.0f} vs a usual {WEEKDAYS[(today - 1) % 7]})")
         
         # Epic Milestones
         print("\n🏆 EPIC MILESTONES")
@@ -504,24 +1035,58 @@ class PersonalLifeRPG:
         
         print("\n" + "="*70)
     
-    def create_visualization(self):
-        """Create comprehensive visualization"""
-        fig = plt.figure(figsize=(16, 10))
+    def show_journal(self, area, start, end):
+        """Journaled XP of one area between two days (ISO, inclusive)"""
+        entries = self.journal.entries(area, start, end)
+        print(f"\n📓 {area}: {start} to {end}")
+        print("-"*60)
+        for day, delta, reason, minutes in entries[-20:]:
+            print(f"  {day}  {delta:+5} XP  {reason}" + (f" ({minutes} min)" if minutes else ""))
+        if len(entries) > 20:
+            print(f"  ... {len(entries) - 20} earlier entries")
+        print(f"Gained: +{self.journal.gained(area, start, end)} XP | Net: {self.journal.total(area, start, end):+} XP"
+              + (f" | Time: {self.journal.minutes(area, start, end) / 60:.1f}h" if self.journal.minutes(area, start, end) else ""))
+    
+    @timed('render.trend_panel')
+    def plot_trend(self, ax, series, days, color, title, ylabel):
+        """Mean line with min/max band for the last `days` days (None = all), at the resolution the axes can show"""
+        self.charts.update(self.data)
+        span = self.charts.span()
+        if span is None:
+            ax.set_title(title, fontweight='bold')
+            return None
+        end = max(span[1], datetime.strptime(self.today(), '%Y-%m-%d').toordinal())
+        start = span[0] if days is None else end - days + 1
+        trace = self.charts.select(series, start, end, int(ax.get_window_extent().width))
+        x = to_datetime64(trace['x'])
+        ax.fill_between(x, trace['lo'], trace['hi'], color=color, alpha=0.2, linewidth=0)
+        ax.plot(x, trace['mean'], color=color, linewidth=1.5, marker='o' if len(x) <= 60 else None, markersize=3)
+        ax.set_title(f"{title} ({trace['level']}ly)" if trace['level'] != 'day' else title, fontweight='bold')
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        return trace
+    
+    @timed('render.visualization')
+    def create_visualization(self, days=30):
+        """Create comprehensive visualization; trend panels cover the last `days` days (None = all history)"""
+        fig = plt.figure(figsize=(16, 14))
+        span = "All Time" if days is None else f"Last {days} Days"
+        grid = fig.add_gridspec(3, 6)  # two rows of three panels, then two wide trend panels
         
         # 1. Life areas pie chart
-        ax1 = plt.subplot(2, 3, 1)
-        categories = {}
-        for area, stats in self.data['life_areas'].items():
-            category = area.split(' - ')[0]
-            categories[category] = categories.get(category, 0) + stats['level']
+        ax1 = fig.add_subplot(grid[0, 0:2])
+        categories = self.aggregates.category_levels
         
         ax1.pie(categories.values(), labels=categories.keys(), autopct='%1.1f%%', startangle=90)
         ax1.set_title('Life Balance by Category', fontweight='bold')
         
         # 2. Top 10 areas by level
-        ax2 = plt.subplot(2, 3, 2)
-        sorted_areas = sorted(self.data['life_areas'].items(), key=lambda x: x[1]['level'], reverse=True)[:10]
-        names = [a[0].split(' - ')[-1] for a in sorted_areas]
+        ax2 = fig.add_subplot(grid[0, 2:4])
+        sorted_areas = self.aggregates.top(10)
+        names = [self.aggregates.short_names[a[0]] for a in sorted_areas]
         levels = [a[1]['level'] for a in sorted_areas]
         bars = ax2.barh(names, levels, color=plt.cm.viridis(range(len(names))))
         ax2.set_xlabel('Level')
@@ -529,8 +1094,8 @@ class PersonalLifeRPG:
         ax2.invert_yaxis()
         
         # 3. Income progress
-        ax3 = plt.subplot(2, 3, 3)
-        current = self.data['income']['current_month_earnings']
+        ax3 = fig.add_subplot(grid[0, 4:6])
+        current = self.ledger.month_total(month_of(self.today()))
         goal = self.data['income']['monthly_goal']
         remaining = max(goal - current, 0)
         ax3.pie([current, remaining], labels=['Earned', 'Remaining'], 
@@ -539,20 +1104,13 @@ class PersonalLifeRPG:
         ax3.set_title(f'Income Progress\n{current:,} / {goal:,} Lari', fontweight='bold')
         
         # 4. Daily scores trend
-        ax4 = plt.subplot(2, 3, 4)
-        if self.data['daily_scores']:
-            recent_scores = self.data['daily_scores'][-30:]  # Last 30 days
-            dates = [s['date'] for s in recent_scores]
-            scores = [s['score'] for s in recent_scores]
-            ax4.plot(range(len(scores)), scores, marker='o', linewidth=2, markersize=4)
-            ax4.set_ylabel('Score')
-            ax4.set_title('Daily Performance (Last 30 Days)', fontweight='bold')
+        ax4 = fig.add_subplot(grid[1, 0:2])
+        if self.plot_trend(ax4, 'score', days, '#1f77b4', f'Daily Performance ({span})', 'Score'):
             ax4.axhline(y=70, color='r', linestyle='--', alpha=0.3, label='A- threshold')
-            ax4.grid(True, alpha=0.3)
             ax4.set_ylim(0, 100)
         
         # 5. Habit streaks
-        ax5 = plt.subplot(2, 3, 5)
+        ax5 = fig.add_subplot(grid[1, 2:4])
         habits = list(self.data['habits'].keys())
         streaks = [self.data['habits'][h]['streak'] for h in habits]
         bars = ax5.bar(habits, streaks, color=['#FF6B6B', '#4ECDC4'])
@@ -564,7 +1122,7 @@ class PersonalLifeRPG:
                     f'{int(streak)}', ha='center', va='bottom')
         
         # 6. Epic milestones
-        ax6 = plt.subplot(2, 3, 6)
+        ax6 = fig.add_subplot(grid[1, 4:6])
         milestone_names = [m['description'][:20] for m in self.data['epic_milestones'].values()]
         completed = [1 if m['completed'] else 0 for m in self.data['epic_milestones'].values()]
         colors = ['#4CAF50' if c else '#CCCCCC' for c in completed]
@@ -574,202 +1132,454 @@ class PersonalLifeRPG:
         ax6.set_title('Epic Milestones', fontweight='bold')
         ax6.invert_yaxis()
         
+        # 7-8. Push-ups and screen time over the same range
+        ax7 = fig.add_subplot(grid[2, 0:3])
+        if self.plot_trend(ax7, 'pushups', days, '#FF6B6B', f'Push-ups ({span})', 'Push-ups'):
+            ax7.axhline(y=self.PUSHUP_REQUIREMENT, color='g', linestyle='--', alpha=0.3)
+        ax8 = fig.add_subplot(grid[2, 3:6])
+        if self.plot_trend(ax8, 'screen', days, '#9B59B6', f'Screen Time ({span})', 'Hours'):
+            ax8.axhline(y=self.SCREEN_TIME_LIMIT, color='r', linestyle='--', alpha=0.3)
+        
         plt.tight_layout()
         plt.savefig('life_rpg_dashboard.png', dpi=300, bbox_inches='tight')
         print("\n📊 Dashboard saved as 'life_rpg_dashboard.png'")
         plt.show()
 
 
-def main():
-    rpg = PersonalLifeRPG()
-    
+def narrow(rpg, entries, kind, ref, completed=False):
+    """Ask for a search query when a pick list is long; returns the matching entries, best first
+
+    A dialog step: call it with `yield from`.
+    """
+    if len(entries) <= rpg.LIST_LIMIT:
+        return entries
+    query = (yield f"🔎 {len(entries)} entries - search (Enter to list all): ").strip()
+    if not query:
+        return entries
+    by_ref = {ref(entry): entry for entry in entries}
+    hits = rpg.search(query, kind=kind, completed=completed, limit=rpg.LIST_LIMIT)
+    matches = [by_ref[hit_ref] for _, hit_ref, _ in hits if hit_ref in by_ref]
+    if not matches:
+        print("No matches.")
+    return matches
+
+
+# Menu dialogs. Each yields its prompts and gets the answers sent back, so the
+# same flow runs under input() (main) and the full-screen terminal UI.
+
+def pick_area(rpg, prompt="Choose area: ", areas=None, heading="Available areas:"):
+    print(f"\n{heading}")
+    areas = list(rpg.data['life_areas'].keys()) if areas is None else areas
+    for i, area in enumerate(areas, 1):
+        print(f"{i}. {area}")
+    area_idx = int((yield prompt)) - 1
+    return areas[area_idx]
+
+
+def log_pushups(rpg):
+    count = int((yield "How many push-ups did you do? "))
+    rpg.track_pushups(count)
+
+
+def log_sleep(rpg):
+    hours = float((yield "How many hours did you sleep? "))
+    rpg.log_sleep(hours)
+
+
+def log_screen_time(rpg):
+    hours = float((yield "Screen time (hours)? "))
+    day = (yield "Date (YYYY-MM-DD, Enter for today): ").strip()
+    rpg.track_screen_time(hours, day or None)
+
+
+def add_project(rpg):
+    name = yield "Project name: "
+    value = int((yield "Project value (Lari): "))
+    deadline = yield "Deadline (YYYY-MM-DD): "
+    rpg.add_project(name, value, deadline)
+
+
+def complete_project(rpg):
+    print("\n📋 ACTIVE PROJECTS:")
+    active_projects = [p for p in rpg.data['projects'] if not p['completed']]
+    if not active_projects:
+        print("No active projects!")
+        return
+    active_projects = yield from narrow(rpg, active_projects, 'project', lambda p: p['id'])
+    for p in active_projects:
+        print(f"[{p['id']}] {p['name']} - {p['value']} Lari (Due: {p['deadline']})")
+    project_id = int((yield "\nProject ID to complete: "))
+    rpg.complete_project(project_id)
+
+
+def add_todo(rpg):
+    task = yield "Task description: "
+    area = yield from pick_area(rpg, "Choose area number: ")
+    base_xp = int((yield "Base XP (will multiply based on completion time): "))
+    rule = (yield ("Repeat? (Enter for one-off; daily, weekly, monthly, every N days,\n"
+                   "  or a rule like FREQ=WEEKLY;BYDAY=MO,TH;COUNT=10): ")).strip()
+    if not rule:
+        deadline = yield "Deadline (YYYY-MM-DD): "
+        rpg.add_todo(task, area, base_xp, deadline)
+        return
+    start = (yield "Starting (YYYY-MM-DD, Enter for today): ").strip()
+    remind_at = (yield "Reminder time (HH:MM, Enter for none): ").strip()
+    try:
+        rpg.add_recurring(task, area, base_xp, rule, start or None, remind_at or None)
+    except ValueError as e:
+        print(f"❌ {e}")
+
+
+def complete_todo(rpg):
+    print("\n📝 PENDING TASKS:")
+    pending = [t for t in rpg.data['todos'] if not t['completed']]
+    due, _ = rpg.agenda_recurring(0)
+    if not pending and not due:
+        print("No pending tasks!")
+        return
+    pending = yield from narrow(rpg, pending, 'todo', lambda t: t['id'])
+    for t in pending:
+        print(f"[{t['id']}] {t['task']} - {t['area']} (Due: {t['deadline']})")
+    for day, item in due:
+        print(f"[R{item['id']}] 🔁 {item['task']} - {item['area']} (Due: {iso_day(day)})")
+    todo_id = (yield "\nTask ID to complete: ").strip().upper()
+    if todo_id.startswith('R'):
+        rpg.complete_recurring(int(todo_id[1:]))
+    else:
+        rpg.complete_todo(int(todo_id))
+
+
+def log_learning(rpg):
+    learning_areas = [a for a in rpg.data['life_areas'].keys()
+                      if 'University' in a or 'Work Skills' in a or 'Personal Sciences' in a]
+    area = yield from pick_area(rpg, areas=learning_areas, heading="Learning areas:")
+    hours = float((yield "Hours spent: "))
+    xp = int(hours * 20)  # 20 XP per hour
+    topic = yield "What did you study? "
+    rpg.add_xp(area, xp, f"{hours}h on {topic}", minutes=round(hours * 60))
+
+
+def log_memory(rpg):
+    minutes = int((yield "Memory practice minutes: "))
+    xp = minutes // 5  # 1 XP per 5 minutes
+    technique = yield "What technique? (e.g., palace, linking): "
+    rpg.add_xp('Memory Techniques', xp, f"{minutes}min - {technique}", minutes=minutes)
+
+
+def complete_milestone(rpg):
+    print("\n🏆 EPIC MILESTONES:")
+    numbered = list(enumerate(rpg.data['epic_milestones'].items(), 1))
+    for i, (key, milestone) in (yield from narrow(rpg, numbered, 'milestone', lambda n: n[1][0], completed=None)):
+        status = "✅" if milestone['completed'] else "⏳"
+        print(f"{i}. {status} {milestone['description']}")
+
+    choice_m = int((yield "\nWhich milestone did you complete? ")) - 1
+    milestone_key = list(rpg.data['epic_milestones'].keys())[choice_m]
+    confirm = yield f"Confirm completion of '{rpg.data['epic_milestones'][milestone_key]['description']}'? (yes/no): "
+    if confirm.lower() == 'yes':
+        rpg.complete_epic_milestone(milestone_key)
+
+
+def show_agenda(rpg):
+    print("\n📅 TODAY'S AGENDA:")
+    print("="*60)
+
+    # Pending tasks
+    today_tasks = [t for t in rpg.data['todos']
+                   if not t['completed'] and t['deadline'] <= rpg.today()]
+    if today_tasks:
+        print("\n🔥 URGENT TASKS (Due today or overdue):")
+        for t in today_tasks:
+            print(f"  • {t['task']} ({t['area']})")
+
+    # Upcoming tasks
+    upcoming = [t for t in rpg.data['todos']
+                if not t['completed'] and t['deadline'] > rpg.today()]
+    if upcoming:
+        print("\n📋 UPCOMING TASKS:")
+        for t in sorted(upcoming, key=lambda x: x['deadline'])[:5]:
+            print(f"  • {t['task']} (Due: {t['deadline']})")
+
+    # Recurring tasks (generated from their rules)
+    due, next_up = rpg.agenda_recurring()
+    if due:
+        print("\n🔁 RECURRING (due):")
+        for day, item in due:
+            print(f"  • {item['task']} ({item['area']}){'' if iso_day(day) == rpg.today() else f' since {iso_day(day)}'}")
+    if next_up:
+        print("\n🔁 RECURRING (next up):")
+        for day, item in next_up:
+            print(f"  • {item['task']} ({iso_day(day)})")
+
+    # Habits
+    print("\n✅ DAILY HABITS:")
+    today = rpg.today()
+    shower_done = rpg.data['habits']['shower']['last_done'] == today
+    workout_done = rpg.data['habits']['workout']['last_done'] == today
+    print(f"  {'✅' if shower_done else '⬜'} Shower")
+    print(f"  {'✅' if workout_done else '⬜'} Workout (100+ push-ups)")
+
+    print("="*60)
+
+
+def edit_income(rpg):
+    month = rpg.data['income']['target_month']
+    current = rpg.ledger.month_total(month)
+    print("\n💰 INCOME TRACKER:")
+    print(f"Current month earnings: {current:,} Lari")
+    print(f"Monthly goal: {rpg.data['income']['monthly_goal']:,} Lari")
+    print(f"Target month: {month}")
+    print(f"Last 12 months: {rpg.ledger.trailing_12_months(month):,} Lari")
+    for entry in rpg.ledger.month_entries(month)[-10:]:
+        print(f"  {entry['date']}  {entry['amount']:>+8,}  {entry['kind']}"
+              + (f" #{entry['project_id']}" if entry['project_id'] else "")
+              + (f" ({entry['note']})" if entry['note'] else ""))
+
+    edit = yield "\nEdit income? (yes/no): "
+    if edit.lower() == 'yes':
+        manual = int((yield "Enter corrected amount (Lari): "))
+        # Corrections are recorded as adjustments so the history stays intact
+        rpg.record_income(manual - current, kind='adjustment', note="Manual correction")
+        rpg.save_data()
+        print("✅ Income updated!")
+
+
+def generate_dashboard(rpg):
+    span = (yield "Trend range in days (Enter for 30, 'all' for full history): ").strip().lower()
+    rpg.create_visualization(None if span == 'all' else int(span) if span else 30)
+
+
+def adjust_xp(rpg):
+    area = yield from pick_area(rpg)
+    xp = int((yield "XP to add (negative to subtract): "))
+    reason = yield "Reason: "
+    rpg.add_xp(area, xp, reason)
+
+
+def sign_off(rpg):
+    print("\n🎮 Keep grinding! See you tomorrow! 🚀")
+    rpg.daily_summary()
+    if rpg.sync.remote:
+        rpg.sync_profile()
+
+
+def manage_budgets(rpg):
+    rpg.show_budgets()
+    action = (yield "\n[L]og usage, [N]ew budget, Enter to go back: ").strip().upper()
+    if action == 'L':
+        names = list(rpg.budgets)
+        for i, name in enumerate(names, 1):
+            print(f"{i}. {name}")
+        name = names[int((yield "Choose budget: ")) - 1]
+        amount = float((yield f"Amount ({rpg.budgets[name].unit}): "))
+        rpg.log_budget_usage(name, amount)
+    elif action == 'N':
+        name = (yield "Activity name: ").strip()
+        unit = (yield "Unit (e.g. times, hours, Lari): ").strip() or "times"
+        window = int((yield "Window in days (e.g. 7): "))
+        limit = float((yield f"Limit ({unit} per {window} days): "))
+        penalty = float((yield f"XP penalty per {unit} over the limit: "))
+        rpg.add_budget(name, window, limit, unit, penalty)
+
+
+def search_items(rpg):
+    query = (yield "🔎 Search todos, projects and milestones: ").strip()
+    kind = {'T': 'todo', 'P': 'project', 'M': 'milestone'}.get(
+        (yield "Only [T]odos, [P]rojects, [M]ilestones (Enter for all): ").strip().upper())
+    status = (yield "[O]pen, [D]one (Enter for both): ").strip().upper()
+    deadline_from = (yield "Deadline from (YYYY-MM-DD, Enter to skip): ").strip() or None
+    deadline_to = (yield "Deadline to (YYYY-MM-DD, Enter to skip): ").strip() or None
+    hits = rpg.search(query, kind=kind, completed={'O': False, 'D': True}.get(status),
+                      deadline_from=deadline_from, deadline_to=deadline_to)
+    if not hits:
+        print("No matches.")
+    icons = {'todo': "📝", 'project': "📋", 'milestone': "🏆"}
+    for kind, ref, item in hits:
+        text, area, completed, deadline = SearchIndex.fields(kind, item)
+        print(f"  {icons[kind]} {'✅' if completed else '⏳'} [{ref}] {text}"
+              + (f" - {area}" if area else "") + (f" (Due: {deadline})" if deadline else ""))
+
+
+def sync_devices(rpg):
+    if not rpg.sync.remote:
+        url = (yield "Sync server URL (e.g. http://192.168.1.10:8765): ").strip()
+        if not url:
+            return
+        rpg.sync.remote = url
+    rpg.sync_profile()
+
+
+def show_journal(rpg):
+    area = yield from pick_area(rpg)
+    today = day_ordinal(rpg.today())
+    start = (yield "From (YYYY-MM-DD, Enter for 30 days ago): ").strip() or iso_day(today - 29)
+    end = (yield "To (YYYY-MM-DD, Enter for today): ").strip() or rpg.today()
+    rpg.show_journal(area, start, end)
+
+
+def manage_recurring(rpg):
+    print("\n🔁 RECURRING TASKS:")
+    if not rpg.data['recurring']:
+        print("None yet - add one with option 9.")
+        return
+    today = day_ordinal(rpg.today())
+    for item in rpg.recurring:
+        upcoming = rpg.recurring.recurrence(item).next_after(today)
+        status = "▶️ " if item['active'] else "⏸️ "
+        print(f"[{item['id']}] {status} {item['task']} - {describe(item['rule'])}"
+              f" (next: {iso_day(upcoming) if upcoming else 'never'}"
+              + (f", reminder {item['remind_at']})" if item['remind_at'] else ")"))
+    item_id = (yield "\nID to pause/resume, Enter to go back: ").strip()
+    if item_id:
+        _, item = rpg.recurring.find(int(item_id))
+        rpg.set_recurring_active(int(item_id), not item['active'] if item else True)
+
+
+# (menu choice, single-key shortcut in the terminal UI, label, action taking the PersonalLifeRPG)
+MENU = [
+    ('1', '1', "📊 View Stats & Progress", lambda rpg: rpg.view_stats()),
+    ('2', '2', "💪 Log Workout (Push-ups)", log_pushups),
+    ('3', '3', "🚿 Log Shower", lambda rpg: rpg.check_shower()),
+    ('4', '4', "😴 Log Sleep", log_sleep),
+    ('5', '5', "📱 Log Screen Time", log_screen_time),
+    ('6', '6', "👥 Log Social Interaction", lambda rpg: rpg.log_social_interaction()),
+    ('7', '7', "📋 Add Project", add_project),
+    ('8', '8', "✅ Complete Project", complete_project),
+    ('9', '9', "📝 Add Todo/Task", add_todo),
+    ('10', 'C', "✨ Complete Todo/Task", complete_todo),
+    ('11', 'L', "📚 Log Learning Session", log_learning),
+    ('12', 'M', "🧠 Log Memory Practice", log_memory),
+    ('13', 'E', "🏆 Complete Epic Milestone", complete_milestone),
+    ('14', 'A', "📈 View Today's Tasks", show_agenda),
+    ('15', 'I', "💰 View/Edit Income", edit_income),
+    ('16', 'G', "🎨 Generate Dashboard", generate_dashboard),
+    ('17', 'D', "📊 Daily Summary", lambda rpg: rpg.daily_summary()),
+    ('18', 'X', "🔧 Manual XP Adjustment", adjust_xp),
+    ('19', 'Q', "❌ Exit", sign_off),
+    ('U', 'U', "↩️  Undo", lambda rpg: rpg.undo()),
+    ('R', 'R', "↪️  Redo", lambda rpg: rpg.redo()),
+    ('H', 'H', "🕘 History", lambda rpg: rpg.show_history()),
+    ('B', 'B', "⏳ Budgets", manage_budgets),
+    ('T', 'T', "🔁 Recurring", manage_recurring),
+    ('J', 'J', "📓 XP Journal", show_journal),
+    ('S', 'S', "🔎 Search", search_items),
+    ('Y', 'Y', "🔄 Sync with other devices", sync_devices),
+]
+EXIT = '19'
+
+
+def run_dialog(dialog, ask=input):
+    """Drive a menu action: answer each prompt it yields with ask(prompt)"""
+    if not isinstance(dialog, types.GeneratorType):
+        return  # a plain call; it has already run
+    answer = None
+    while True:
+        try:
+            prompt = dialog.send(answer)
+        except StopIteration:
+            return
+        answer = ask(prompt)
+
+
+def main(data_file='life_rpg_personal.json', reminders=True):
+    rpg = PersonalLifeRPG(data_file)
+    if reminders:
+        rpg.start_reminders()
+    actions = {choice: action for choice, _, _, action in MENU}
+
     while True:
         print("\n" + "="*60)
         print("🎮 PERSONAL LIFE RPG".center(60))
         print("="*60)
-        print("1.  📊 View Stats & Progress")
-        print("2.  💪 Log Workout (Push-ups)")
-        print("3.  🚿 Log Shower")
-        print("4.  😴 Log Sleep")
-        print("5.  📱 Log Screen Time")
-        print("6.  👥 Log Social Interaction")
-        print("7.  📋 Add Project")
-        print("8.  ✅ Complete Project")
-        print("9.  📝 Add Todo/Task")
-        print("10. ✨ Complete Todo/Task")
-        print("11. 📚 Log Learning Session")
-        print("12. 🧠 Log Memory Practice")
-        print("13. 🏆 Complete Epic Milestone")
-        print("14. 📈 View Today's Tasks")
-        print("15. 💰 View/Edit Income")
-        print("16. 🎨 Generate Dashboard")
-        print("17. 📊 Daily Summary")
-        print("18. 🔧 Manual XP Adjustment")
-        print("19. ❌ Exit")
+        for choice, _, label, _ in MENU:
+            if choice.isdigit():
+                print(f"{choice + '.':4}{label}")
+        print("U.  ↩️  Undo      R.  ↪️  Redo        H.  🕘 History")
+        print("B.  ⏳ Budgets    T.  🔁 Recurring   J.  📓 XP Journal   S.  🔎 Search")
+        print("Y.  🔄 Sync with other devices")
         print("="*60)
-        
-        choice = input("\n👉 Choose option: ").strip()
-        
-        if choice == '1':
-            rpg.view_stats()
-        
-        elif choice == '2':
-            count = int(input("How many push-ups did you do? "))
-            rpg.track_pushups(count)
-        
-        elif choice == '3':
-            rpg.check_shower()
-        
-        elif choice == '4':
-            hours = float(input("How many hours did you sleep? "))
-            rpg.log_sleep(hours)
-        
-        elif choice == '5':
-            hours = float(input("Screen time today (hours)? "))
-            rpg.track_screen_time(hours)
-        
-        elif choice == '6':
-            rpg.log_social_interaction()
-        
-        elif choice == '7':
-            name = input("Project name: ")
-            value = int(input("Project value (Lari): "))
-            deadline = input("Deadline (YYYY-MM-DD): ")
-            rpg.add_project(name, value, deadline)
-        
-        elif choice == '8':
-            print("\n📋 ACTIVE PROJECTS:")
-            active_projects = [p for p in rpg.data['projects'] if not p['completed']]
-            if not active_projects:
-                print("No active projects!")
-                continue
-            for p in active_projects:
-                print(f"[{p['id']}] {p['name']} - {p['value']} Lari (Due: {p['deadline']})")
-            project_id = int(input("\nProject ID to complete: "))
-            rpg.complete_project(project_id)
-        
-        elif choice == '9':
-            task = input("Task description: ")
-            print("\nAvailable areas:")
-            for i, area in enumerate(rpg.data['life_areas'].keys(), 1):
-                print(f"{i}. {area}")
-            area_idx = int(input("Choose area number: ")) - 1
-            area = list(rpg.data['life_areas'].keys())[area_idx]
-            base_xp = int(input("Base XP (will multiply based on completion time): "))
-            deadline = input("Deadline (YYYY-MM-DD): ")
-            rpg.add_todo(task, area, base_xp, deadline)
-        
-        elif choice == '10':
-            print("\n📝 PENDING TASKS:")
-            pending = [t for t in rpg.data['todos'] if not t['completed']]
-            if not pending:
-                print("No pending tasks!")
-                continue
-            for t in pending:
-                print(f"[{t['id']}] {t['task']} - {t['area']} (Due: {t['deadline']})")
-            todo_id = int(input("\nTask ID to complete: "))
-            rpg.complete_todo(todo_id)
-        
-        elif choice == '11':
-            print("\nLearning areas:")
-            learning_areas = [a for a in rpg.data['life_areas'].keys() 
-                            if 'University' in a or 'Work Skills' in a or 'Personal Sciences' in a]
-            for i, area in enumerate(learning_areas, 1):
-                print(f"{i}. {area}")
-            area_idx = int(input("Choose area: ")) - 1
-            area = learning_areas[area_idx]
-            hours = float(input("Hours spent: "))
-            xp = int(hours * 20)  # 20 XP per hour
-            topic = input("What did you study? ")
-            rpg.add_xp(area, xp, f"{hours}h on {topic}")
-        
-        elif choice == '12':
-            minutes = int(input("Memory practice minutes: "))
-            xp = minutes // 5  # 1 XP per 5 minutes
-            technique = input("What technique? (e.g., palace, linking): ")
-            rpg.add_xp('Memory Techniques', xp, f"{minutes}min - {technique}")
-        
-        elif choice == '13':
-            print("\n🏆 EPIC MILESTONES:")
-            for i, (key, milestone) in enumerate(rpg.data['epic_milestones'].items(), 1):
-                status = "✅" if milestone['completed'] else "⏳"
-                print(f"{i}. {status} {milestone['description']}")
-            
-            choice_m = int(input("\nWhich milestone did you complete? ")) - 1
-            milestone_key = list(rpg.data['epic_milestones'].keys())[choice_m]
-            confirm = input(f"Confirm completion of '{rpg.data['epic_milestones'][milestone_key]['description']}'? (yes/no): ")
-            if confirm.lower() == 'yes':
-                rpg.complete_epic_milestone(milestone_key)
-        
-        elif choice == '14':
-            print("\n📅 TODAY'S AGENDA:")
-            print("="*60)
-            
-            # Pending tasks
-            today_tasks = [t for t in rpg.data['todos'] 
-                          if not t['completed'] and t['deadline'] <= rpg.today()]
-            if today_tasks:
-                print("\n🔥 URGENT TASKS (Due today or overdue):")
-                for t in today_tasks:
-                    print(f"  • {t['task']} ({t['area']})")
-            
-            # Upcoming tasks
-            upcoming = [t for t in rpg.data['todos'] 
-                       if not t['completed'] and t['deadline'] > rpg.today()]
-            if upcoming:
-                print("\n📋 UPCOMING TASKS:")
-                for t in sorted(upcoming, key=lambda x: x['deadline'])[:5]:
-                    print(f"  • {t['task']} (Due: {t['deadline']})")
-            
-            # Habits
-            print("\n✅ DAILY HABITS:")
-            today = rpg.today()
-            shower_done = rpg.data['habits']['shower']['last_done'] == today
-            workout_done = rpg.data['habits']['workout']['last_done'] == today
-            print(f"  {'✅' if shower_done else '⬜'} Shower")
-            print(f"  {'✅' if workout_done else '⬜'} Workout (100+ push-ups)")
-            
-            print("="*60)
-        
-        elif choice == '15':
-            print("\n💰 INCOME TRACKER:")
-            print(f"Current month earnings: {rpg.data['income']['current_month_earnings']:,} Lari")
-            print(f"Monthly goal: {rpg.data['income']['monthly_goal']:,} Lari")
-            print(f"Target month: {rpg.data['income']['target_month']}")
-            
-            edit = input("\nEdit income? (yes/no): ")
-            if edit.lower() == 'yes':
-                manual = int(input("Enter corrected amount (Lari): "))
-                rpg.data['income']['current_month_earnings'] = manual
-                rpg.save_data()
-                print("✅ Income updated!")
-        
-        elif choice == '16':
-            rpg.create_visualization()
-        
-        elif choice == '17':
-            rpg.daily_summary()
-        
-        elif choice == '18':
-            print("\nAvailable areas:")
-            for i, area in enumerate(rpg.data['life_areas'].keys(), 1):
-                print(f"{i}. {area}")
-            area_idx = int(input("Choose area: ")) - 1
-            area = list(rpg.data['life_areas'].keys())[area_idx]
-            xp = int(input("XP to add (negative to subtract): "))
-            reason = input("Reason: ")
-            rpg.add_xp(area, xp, reason)
-        
-        elif choice == '19':
-            print("\n🎮 Keep grinding! See you tomorrow! 🚀")
-            rpg.daily_summary()
-            break
-        
+
+        choice = input("\n👉 Choose option: ").strip().upper()
+
+        if choice in actions:
+            run_dialog(actions[choice](rpg))
+            if choice == EXIT:
+                break
         else:
             print("❌ Invalid option. Try again.")
 
+    if rpg.channel:
+        rpg.channel.close()
+    if rpg.shared:
+        rpg.shared.close()
+
 
 if __name__ == "__main__":
-    print("\n🎮 Welcome to Your Personal Life RPG! 🎮")
-    print("Loading your character...")
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Personal Life RPG")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--profile', action='store_true',
+                        help="Print per-operation timings and bytes written on exit")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="Also save cProfile stats (pstats format) to FILE")
+    parser.add_argument('--undo', type=int, nargs='?', const=1, metavar='N',
+                        help="Undo the last N actions (default 1) and exit")
+    parser.add_argument('--redo', type=int, nargs='?', const=1, metavar='N',
+                        help="Redo the last N undone actions (default 1) and exit")
+    parser.add_argument('--history', action='store_true', help="List undo/redo history and exit")
+    parser.add_argument('--reminders', action='store_true',
+                        help="Run only the reminder scheduler (no menu) until interrupted")
+    parser.add_argument('--no-reminders', action='store_true', help="Don't send reminders while the menu runs")
+    parser.add_argument('--plain', action='store_true',
+                        help="Line-by-line menu instead of the full-screen terminal UI")
+    parser.add_argument('--sync', nargs='?', const='', metavar='URL',
+                        help="Sync with the sync server (remembering URL, if given) and exit")
+    args = parser.parse_args()
+    if args.profile or args.profile_output:
+        instrument.enable(args.profile_output)
+    
+    if args.undo or args.redo or args.history:
+        rpg = PersonalLifeRPG(args.data_file, publish=False)  # one-shot: leave dashboards to the running app
+        for _ in range(args.undo or 0):
+            if rpg.undo() is None:
+                break
+        for _ in range(args.redo or 0):
+            if rpg.redo() is None:
+                break
+        if args.history:
+            rpg.show_history()
+        raise SystemExit
+    
+    if args.sync is not None:
+        rpg = PersonalLifeRPG(args.data_file, publish=False)  # syncs on load when a server is set
+        if args.sync and args.sync.rstrip('/') != rpg.sync.remote:
+            rpg.sync.remote = args.sync
+            rpg.sync_profile()
+        elif not rpg.sync.remote:
+            print("❌ No sync server yet - pass its URL: --sync http://host:8765")
+        raise SystemExit
+    
+    if args.reminders:
+        rpg = PersonalLifeRPG(args.data_file, publish=False)
+        try:
+            asyncio.run(rpg.run_reminders())
+        except KeyboardInterrupt:
+            pass
+        raise SystemExit
+    
+    run_tui = None
+    if not args.plain and sys.stdin.isatty() and sys.stdout.isatty():
+        try:
+            from life_rpg_tui import run_tui  # needs curses (not in Windows' Python)
+        except ImportError:
+            pass
+    
+    try:
+        if run_tui:
+            run_tui(args.data_file, reminders=not args.no_reminders)
+        else:
+            print("\n🎮 Welcome to Your Personal Life RPG! 🎮")
+            print("Loading your character...")
+            main(args.data_file, reminders=not args.no_reminders)
+    finally:
+        if instrument.enabled:
+            instrument.dump()
\ No newline at end of file
@@ -0,0 +1,90 @@
+from bisect import bisect_right
+
+# Sorted thresholds; an achievement is earned for every threshold t with old < t <= new,
+# so a single large XP grant that skips several tiers awards all of them.
+TIERS = [(5, "Bronze"), (10, "Silver"), (20, "Gold"), (30, "Platinum")]
+TOTAL_LEVELS = [50, 100, 200, 400]
+STREAKS = [7, 30, 100, 365]
+
+TIER_LEVELS = [level for level, _ in TIERS]
+TIER_NAMES = dict(TIERS)
+
+
+def crossed(thresholds, old, new):
+    """Thresholds passed when a value rises from old to new"""
+    return thresholds[bisect_right(thresholds, old):bisect_right(thresholds, new)]
+
+
+class AchievementEngine:
+    """Unlocked achievements (set-backed index over the profile list) and the rules that award them"""
+
+    def __init__(self, achievements, index):
+        self.achievements = achievements  # the profile's list, kept in unlock order
+        self.unlocked = set(achievements)
+        self.index = index
+
+    def __contains__(self, name):
+        return name in self.unlocked
+
+    def award(self, names):
+        """Record names not unlocked yet; returns the new ones in order"""
+        new = []
+        for name in names:
+            if name not in self.unlocked:
+                self.unlocked.add(name)
+                self.achievements.append(name)
+                new.append(name)
+        return new
+
+    def revoke(self, name):
+        """Take back an unlock (undo); the name is normally the most recent one"""
+        if name in self.unlocked:
+            self.unlocked.discard(name)
+            self.achievements.reverse()
+            self.achievements.remove(name)
+            self.achievements.reverse()
+
+    def area_tier(self, area, level):
+        return f"{area} - {TIER_NAMES[level]} Tier"
+
+    def category_tier(self, category, level):
+        return f"{category} - {TIER_NAMES[level]} Mastery"
+
+    def category_floor(self, category):
+        return min(stats.level for _, stats in self.index.categories[category])
+
+    def level_changed(self, area, old_level, new_level):
+        """Achievements earned by one area moving from old_level to new_level"""
+        if new_level <= old_level:
+            return []
+        names = []
+        tiers = crossed(TIER_LEVELS, old_level, new_level)
+        if tiers:
+            names.extend(self.area_tier(area, level) for level in tiers)
+            category = self.index.area_categories[area]
+            floor = self.category_floor(category)
+            names.extend(self.category_tier(category, level) for level in tiers if level <= floor)
+        total = self.index.total_level
+        names.extend(f"Total Level {level}"
+                     for level in crossed(TOTAL_LEVELS, total - (new_level - old_level), total))
+        return self.award(names)
+
+    def streak_changed(self, habit, old_streak, new_streak):
+        return self.award(f"{habit.capitalize()} - {days} Day Streak"
+                          for days in crossed(STREAKS, old_streak, new_streak))
+
+    def evaluate(self, habits):
+        """Batch pass over the current state, e.g. after a replay or import; returns new unlocks"""
+        index = self.index
+        names = []
+        for area in index.names:
+            level = index.areas[area].level
+            names.extend(self.area_tier(area, t) for t in TIER_LEVELS[:bisect_right(TIER_LEVELS, level)])
+        for category in index.categories:
+            floor = self.category_floor(category)
+            names.extend(self.category_tier(category, t) for t in TIER_LEVELS[:bisect_right(TIER_LEVELS, floor)])
+        names.extend(f"Total Level {t}" for t in TOTAL_LEVELS[:bisect_right(TOTAL_LEVELS, index.total_level)])
+        for habit, data in habits.items():
+            streak = data.get('streak', 0)
+            names.extend(f"{habit.capitalize()} - {d} Day Streak" for d in STREAKS[:bisect_right(STREAKS, streak)])
+        return self.award(names)
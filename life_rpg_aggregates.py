@@ -0,0 +1,87 @@
+import heapq
+
+
+def category_of(area):
+    return area.split(' - ')[0]
+
+
+def short_name(area):
+    return area.split(' - ')[-1]
+
+
+class AreaIndex:
+    """Totals, category groups and level ranking of the life areas, kept current on every XP change
+
+    Views read these instead of re-summing and re-sorting all areas.
+    `categories` maps each category to its [(name, stats)] in profile order;
+    the stats are the live records, so it never needs rebuilding. The
+    ranking is a heap of (-level, position, version) keys, so ties keep
+    profile order exactly like sorted(..., reverse=True) on the levels did.
+    A level change pushes a new key and leaves the old one to be dropped
+    when it surfaces (its version is stale), so set_xp is O(log n) and top(k)
+    O(k log n) amortized; the heap is rebuilt once stale keys outnumber live
+    ones.
+    """
+
+    def __init__(self, areas):
+        self.areas = areas
+        self.total_level = 0
+        self.total_xp = 0
+        self.categories = {}
+        self.category_levels = {}
+        self.area_categories = {}
+        self.short_names = {}
+        self.names = []
+        self.positions = {}
+        self.ranking = []
+        self.versions = []  # per position: the version of its live ranking key
+        for name, stats in areas.items():
+            self._insert(name, stats)
+
+    def _insert(self, name, stats):
+        position = len(self.names)
+        self.names.append(name)
+        self.positions[name] = position
+        category = self.area_categories[name] = category_of(name)
+        self.categories.setdefault(category, []).append((name, stats))
+        self.category_levels[category] = self.category_levels.get(category, 0) + stats.level
+        self.short_names[name] = short_name(name)
+        self.total_level += stats.level
+        self.total_xp += stats.xp
+        self.versions.append(0)
+        heapq.heappush(self.ranking, (-stats.level, position, 0))
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def average_level(self):
+        return self.total_level / len(self.names) if self.names else 0
+
+    def set_xp(self, name, xp, level):
+        """Store new XP/level on the area and adjust every aggregate by the difference"""
+        stats = self.areas[name]
+        self.total_xp += xp - stats.xp
+        stats.xp = xp
+        if level != stats.level:
+            position = self.positions[name]
+            version = self.versions[position] = self.versions[position] + 1
+            heapq.heappush(self.ranking, (-level, position, version))
+            if len(self.ranking) > 2 * len(self.names):
+                self.ranking = [key for key in self.ranking if key[2] == self.versions[key[1]]]
+                heapq.heapify(self.ranking)
+            self.total_level += level - stats.level
+            self.category_levels[self.area_categories[name]] += level - stats.level
+            stats.level = level
+
+    def top(self, count):
+        """[(name, stats)] of the `count` highest-level areas"""
+        names, areas, versions = self.names, self.areas, self.versions
+        best = []
+        while self.ranking and len(best) < count:
+            key = heapq.heappop(self.ranking)
+            if key[2] == versions[key[1]]:
+                best.append(key)
+        for key in best:
+            heapq.heappush(self.ranking, key)
+        return [(names[position], areas[names[position]]) for _, position, _ in best]
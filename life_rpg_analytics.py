@@ -0,0 +1,123 @@
+import numpy as np
+
+from life_rpg_charts import dense
+from life_rpg_model import day_ordinal
+
+# Columns of the day x metric matrix; the daily score is what the others are compared against
+METRICS = ('score', 'sleep', 'screen', 'pushups')
+LABELS = {'sleep': 'Sleep', 'screen': 'Screen time', 'pushups': 'Push-ups'}
+LAGS = (0, 1)  # the metric on the same day as the score, and on the day before
+WINDOW = 30  # days in the rolling correlation
+MIN_PAIRS = 10  # fewer days with both values than this and a correlation means nothing
+MIN_WEEKDAYS = 3  # logged Mondays (etc.) before a weekday has a baseline
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+
+def correlate(x, y, window):
+    """Pearson r of every column of x against y, over all rows and over each trailing window
+
+    Rows where either side is NaN are left out pairwise. Returns
+    (r, pairs, rolling r); rolling has one row per window ending at
+    window-1 .. len(y)-1. r is NaN with fewer than MIN_PAIRS pairs or no
+    variance.
+    """
+    both = ~np.isnan(x) & ~np.isnan(y)[:, None]
+    x0 = np.where(both, x, 0.0)
+    y0 = np.where(both, y[:, None], 0.0)
+    # Running sums of n, x, y, x², y², xy for every column at once
+    sums = np.cumsum(np.stack([both, x0, y0, x0 * x0, y0 * y0, x0 * y0]), axis=1)
+    sums = np.concatenate([np.zeros((len(sums), 1, x.shape[1])), sums], axis=1)
+    total = sums[:, -1]
+    rolling = sums[:, window:] - sums[:, :-window] if len(y) >= window else sums[:, :0]
+
+    def pearson(n, sx, sy, sxx, syy, sxy):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        return np.where(n >= MIN_PAIRS, r, np.nan)
+    return pearson(*total), total[0].astype(np.int64), pearson(*rolling)
+
+
+class HabitAnalytics:
+    """How sleep, screen time and push-ups line up with the daily score
+
+    The score, screen time and push-up series come from the trend charts,
+    which already merge the archive with the live profile and cache the
+    result; sleep hours come from sleep_log. Everything is aligned into one
+    day x metric matrix (NaN where nothing was logged) and the statistics
+    are computed from it in a single pass. Results are kept until the
+    charts or the sleep log change.
+    """
+
+    def __init__(self, charts):
+        self.charts = charts
+        self.signature = None
+        self.first_day = None
+        self.matrix = np.empty((0, len(METRICS)))
+        self.results = None
+
+    def update(self, data):
+        """Recompute if new data arrived since the last call; returns True if it did"""
+        self.charts.update(data)
+        log = data['sleep_log']
+        signature = (self.charts.version, hash(tuple(log.items())))
+        if signature == self.signature:
+            return False
+        self.first_day, self.matrix = self.align(log)
+        self.results = self.analyze()
+        self.signature = signature
+        return True
+
+    def align(self, sleep_log):
+        """(first day ordinal, days x METRICS matrix) covering every logged day"""
+        series = {name: (self.charts.pyramids[name].levels['day'][0].astype(np.int64),
+                         self.charts.pyramids[name].levels['day'][2])
+                  for name in ('score', 'screen', 'pushups')}
+        series['sleep'] = (np.fromiter((day_ordinal(d) for d in sleep_log), np.int64, len(sleep_log)),
+                           np.fromiter(sleep_log.values(), np.float64, len(sleep_log)))
+        logged = [days for days, _ in series.values() if len(days)]
+        if not logged:
+            return None, np.empty((0, len(METRICS)))
+        first = int(min(days.min() for days in logged))
+        last = int(max(days.max() for days in logged))
+        matrix = np.column_stack([dense(*series[name], first, last) for name in METRICS])
+        # No push-ups logged on a day means none were done, once tracking has started
+        pushup_days = series['pushups'][0]
+        if len(pushup_days):
+            tracked = matrix[int(pushup_days.min()) - first:, METRICS.index('pushups')]
+            tracked[np.isnan(tracked)] = 0
+        return first, matrix
+
+    def analyze(self):
+        """Correlations (same and next day), their last-WINDOW-days values and weekday baselines"""
+        matrix = self.matrix
+        days = len(matrix)
+        score = matrix[:, 0]
+        others = matrix[:, 1:]
+        # Lag L: the metric L days before the score it's paired with
+        lagged = np.full((days, others.shape[1] * len(LAGS)), np.nan)
+        for i, lag in enumerate(LAGS):
+            lagged[lag:, i * others.shape[1]:(i + 1) * others.shape[1]] = others[:max(days - lag, 0)]
+        r, pairs, rolling = correlate(lagged, score, WINDOW)
+        correlations = {}
+        for i, (lag, metric) in enumerate((lag, metric) for lag in LAGS for metric in METRICS[1:]):
+            correlations[metric, lag] = {'r': r[i], 'pairs': int(pairs[i]),
+                                         'recent': rolling[-1, i] if len(rolling) else np.nan}
+
+        weekday = (self.first_day + np.arange(days) - 1) % 7 if days else np.empty(0, np.int64)
+        onehot = (weekday[:, None] == np.arange(7)).astype(np.float64)
+        logged = ~np.isnan(matrix)
+        counts = onehot.T @ logged
+        with np.errstate(invalid='ignore'):
+            baseline = (onehot.T @ np.where(logged, matrix, 0.0)) / counts
+        baseline[counts < MIN_WEEKDAYS] = np.nan
+        return {'days': days, 'correlations': correlations, 'weekday': baseline, 'weekday_days': counts}
+
+    def baseline(self, metric, day):
+        """Usual value of a metric on the weekday of `day` (an ordinal), NaN if rarely logged"""
+        return self.results['weekday'][(day - 1) % 7, METRICS.index(metric)]
+
+    def value(self, metric, day):
+        """A metric on one day (ordinal), NaN if not logged"""
+        if self.first_day is None or not 0 <= day - self.first_day < len(self.matrix):
+            return np.nan
+        return self.matrix[day - self.first_day, METRICS.index(metric)]
@@ -0,0 +1,185 @@
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from life_rpg_model import day_ordinal
+from life_rpg_snapshot import GRADES, GRADE_CODES
+
+# One row per archived day; every column is a fixed-width flat file so a
+# slice of history is just a memmap view. Missing values: score -1, grade
+# NO_GRADE, screen hours NaN.
+COLUMNS = (
+    ('day', np.int32),
+    ('score', np.int16),
+    ('grade', np.uint8),
+    ('screen', np.float32),
+)
+NO_GRADE = 255
+
+
+class ColumnarArchive:
+    """Closed months of daily_scores and screen_time.daily_log, memory-mapped"""
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.through = None
+        self.columns = {}
+        self.writes = 0  # in-place updates, so cached views of the columns know to refresh
+        self.open()
+
+    @classmethod
+    def for_profile(cls, data_file):
+        return cls(os.path.splitext(data_file)[0] + '_archive')
+
+    def column_file(self, name):
+        return os.path.join(self.path, f"{name}.{np.dtype(dict(COLUMNS)[name]).str[1:]}")
+
+    def meta_file(self):
+        return os.path.join(self.path, 'meta.json')
+
+    def open(self):
+        """(Re)map the column files; rows beyond the committed count are ignored"""
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+        if not os.path.exists(self.meta_file()):
+            return
+        with open(self.meta_file()) as f:
+            meta = json.load(f)
+        if meta.get('version') != self.VERSION:
+            raise ValueError(f"Unsupported archive version {meta.get('version')}")
+        self.rows = meta['rows']
+        self.through = meta['through']
+        if self.rows:
+            for name, dtype in COLUMNS:
+                self.columns[name] = np.memmap(self.column_file(name), dtype=dtype,
+                                               mode='r', shape=(self.rows,))
+
+    @property
+    def last_day(self):
+        return int(self.columns['day'][-1]) if self.rows else None
+
+    @property
+    def first_day(self):
+        return int(self.columns['day'][0]) if self.rows else None
+
+    def append(self, columns, through):
+        """Append rows (already sorted, all after last_day) and commit the new row count"""
+        count = len(columns['day'])
+        os.makedirs(self.path, exist_ok=True)
+        for name, dtype in COLUMNS:
+            with open(self.column_file(name), 'ab') as f:
+                # Drop any tail left by an interrupted append before writing
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+                f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+        self.commit(self.rows + count, through)
+
+    def commit(self, rows, through):
+        """Atomically record the row count and the last archived month, then remap"""
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self.meta_file() + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': self.VERSION, 'rows': rows, 'through': through}, f)
+        os.replace(tmp, self.meta_file())
+        self.open()
+
+    def slice(self, start_day=None, end_day=None):
+        """Zero-copy views of all columns for start_day <= day <= end_day (ordinals)"""
+        days = self.columns['day']
+        lo = 0 if start_day is None else int(np.searchsorted(days, start_day, 'left'))
+        hi = self.rows if end_day is None else int(np.searchsorted(days, end_day, 'right'))
+        return {name: col[lo:hi] for name, col in self.columns.items()}
+
+    def row_of(self, day):
+        """Row index of an archived day ordinal, or None"""
+        days = self.columns['day']
+        row = int(np.searchsorted(days, day))
+        return row if row < self.rows and days[row] == day else None
+
+    def covers(self, day):
+        """True if `day` falls in a month that has been archived"""
+        return self.through is not None and date.fromordinal(day).strftime('%Y-%m') <= self.through
+
+    def update(self, day, **values):
+        """Overwrite columns of one archived day in place (r+ memmap); inserts the row if missing"""
+        row = self.row_of(day)
+        if row is None:
+            self._insert(day)
+            row = self.row_of(day)
+        dtypes = dict(COLUMNS)
+        for name, value in values.items():
+            column = np.memmap(self.column_file(name), dtype=dtypes[name], mode='r+', shape=(self.rows,))
+            column[row] = value
+            column.flush()
+            del column
+        self.writes += 1
+
+    def _insert(self, day):
+        """Add an empty row for a day inside the archived range (rare: rewrites every column)"""
+        position = int(np.searchsorted(self.columns['day'], day))
+        empty = {'day': day, 'score': -1, 'grade': NO_GRADE, 'screen': np.nan}
+        for name, dtype in COLUMNS:
+            column = np.insert(np.asarray(self.columns[name]), position, empty[name]).astype(dtype)
+            tmp = self.column_file(name) + '.tmp'
+            column.tofile(tmp)
+            os.replace(tmp, self.column_file(name))
+        self.commit(self.rows + 1, self.through)
+
+    def recent_scores(self, count):
+        """Last `count` scored days as (day ordinals, scores, grade codes)"""
+        window = min(count, self.rows)
+        while True:
+            tail = {name: col[self.rows - window:] for name, col in self.columns.items()}
+            mask = tail['score'] >= 0
+            if mask.sum() >= count or window >= self.rows:
+                return tail['day'][mask][-count:], tail['score'][mask][-count:], tail['grade'][mask][-count:]
+            window = min(window * 2, self.rows)
+
+    def archive_closed_months(self, data, today):
+        """Move entries before the current month out of the live profile; returns rows moved"""
+        today = date.fromordinal(day_ordinal(today))
+        cutoff = today.replace(day=1).toordinal()
+        floor = self.last_day if self.rows else -1
+
+        rows = {}
+        kept_scores = []
+        for entry in data['daily_scores']:
+            day = day_ordinal(entry['date'])
+            if floor < day < cutoff and entry.get('grade') in GRADE_CODES:
+                rows.setdefault(day, [-1, NO_GRADE, np.nan])[:2] = [entry['score'], GRADE_CODES[entry['grade']]]
+            else:
+                kept_scores.append(entry)
+
+        log = data['screen_time']['daily_log']
+        kept_log = {}
+        for day_str, hours in log.items():
+            day = day_ordinal(day_str)
+            if floor < day < cutoff:
+                rows.setdefault(day, [-1, NO_GRADE, np.nan])[2] = hours
+            else:
+                kept_log[day_str] = hours
+
+        through = date.fromordinal(cutoff - 1).strftime('%Y-%m')
+        if not rows:
+            if self.through != through:
+                self.commit(self.rows, through)  # nothing to move, but don't scan these months again
+            return 0
+        days = sorted(rows)
+        self.append({
+            'day': days,
+            'score': [rows[d][0] for d in days],
+            'grade': [rows[d][1] for d in days],
+            'screen': [rows[d][2] for d in days],
+        }, through)
+        data['daily_scores'] = kept_scores
+        data['screen_time']['daily_log'] = kept_log
+        return len(days)
+
+    def grade_name(self, code):
+        return None if code == NO_GRADE else GRADES[code]
+
+    def grade_code(self, grade):
+        return GRADE_CODES.get(grade, NO_GRADE)
@@ -0,0 +1,516 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Headless rendering for both matplotlib and pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from life_rpg import PersonalLifeRPG
+from life_rpg_sections import unwrap
+
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=5):
+    """Register a benchmark; the function takes a context and returns the callable to time"""
+    def decorator(func):
+        BENCHMARKS.append((name, repeat, func))
+        return func
+    return decorator
+
+
+def make_profile(areas=22, years=2, todos=20000, projects=500, recurring=2000, seed=0):
+    """Synthetic profile with the same schema as create_initial_data()"""
+    rng = random.Random(seed)
+    today = datetime.now()
+    days = [(today - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(int(years * 365), 0, -1)]
+    categories = ['Health', 'University', 'Work Skills', 'Personal Sciences', 'Hobbies']
+    area_names = [f"{categories[i % len(categories)]} - Skill {i}" for i in range(areas)]
+    grades = ['F', 'D', 'C', 'B', 'A-', 'A', 'A+', 'S', 'SS', 'SSS']
+
+    life_areas = {}
+    for name in area_names:
+        xp = rng.randint(0, 6000)
+        life_areas[name] = {'level': xp // 150 + 1, 'xp': xp, 'last_active': rng.choice(days)}
+
+    todo_list = []
+    for i in range(todos):
+        created = rng.choice(days)
+        completed = rng.random() < 0.8
+        todo = {
+            'id': i + 1,
+            'task': f"Task {i} {rng.choice(['study', 'review', 'ship', 'write', 'fix'])}",
+            'area': rng.choice(area_names),
+            'base_xp': rng.randint(5, 60),
+            'deadline': created,
+            'completed': completed,
+            'created': created,
+        }
+        if completed:
+            todo['completion_date'] = rng.choice(days)
+        todo_list.append(todo)
+
+    project_list = []
+    for i in range(projects):
+        created = rng.choice(days)
+        completed = rng.random() < 0.7
+        project_list.append({
+            'id': i + 1,
+            'name': f"Project {i}",
+            'value': rng.randint(100, 5000),
+            'deadline': created,
+            'completed': completed,
+            'completion_date': rng.choice(days) if completed else None,
+            'created': created,
+        })
+
+    rules = ['daily', 'weekly', 'monthly', 'every 3 days', 'FREQ=WEEKLY;BYDAY=MO,WE,FR',
+             'FREQ=MONTHLY;BYMONTHDAY=1,15', 'FREQ=WEEKLY;INTERVAL=2;BYDAY=SU', 'FREQ=DAILY;COUNT=30']
+    recurring_list = []
+    for i in range(recurring):
+        start = rng.choice(days)
+        recurring_list.append({
+            'id': i + 1,
+            'task': f"Routine {i}",
+            'area': rng.choice(area_names),
+            'base_xp': rng.randint(5, 30),
+            'rule': rng.choice(rules),
+            'start': start,
+            'remind_at': f"{rng.randint(6, 22):02d}:{rng.choice(['00', '30'])}",
+            'active': rng.random() < 0.9,
+            'done': [],
+            'created': start,
+        })
+
+    # XP journal: a few grants a day, columns sorted by day per area
+    reasons = ["1.0h on study", "2.0h on study", "30min - palace", "Daily shower", "Task: review", "7.5h - good"]
+    journal = {'reasons': reasons, 'areas': {}}
+    for day in days:
+        ordinal = datetime.strptime(day, '%Y-%m-%d').toordinal()
+        for _ in range(rng.randint(1, 6)):
+            columns = journal['areas'].setdefault(rng.choice(area_names),
+                                                  {'day': [], 'delta': [], 'reason': [], 'minutes': []})
+            columns['day'].append(ordinal)
+            columns['delta'].append(rng.randint(5, 60))
+            columns['reason'].append(rng.randrange(len(reasons)))
+            columns['minutes'].append(rng.choice([0, 30, 60, 120]))
+
+    milestones = {
+        f"milestone_{i}": {'completed': rng.random() < 0.3, 'xp_reward': rng.randint(500, 2500),
+                           'description': f"Epic milestone number {i}"}
+        for i in range(20)
+    }
+
+    return {
+        'life_areas': life_areas,
+        'projects': project_list,
+        'todos': todo_list,
+        'recurring': recurring_list,
+        'habits': {
+            'shower': {'streak': 12, 'last_done': days[-1]},
+            'workout': {'streak': 9, 'last_done': days[-1],
+                        'pushup_history': [{'date': d, 'count': rng.randint(60, 160)} for d in days]},
+        },
+        'epic_milestones': milestones,
+        'screen_time': {'daily_log': {d: round(rng.uniform(0, 5), 1) for d in days},
+                        'weekly_violations': 0},
+        'social_interactions': {'weekly_count': 1, 'week_start': days[-1]},
+        'income': {'monthly_goal': 10000, 'current_month_earnings': 4200,
+                   'target_month': today.strftime('%Y-%m'), 'manual_override': None},
+        'daily_scores': [{'date': d, 'score': s, 'grade': grades[min(s // 10, 9)]}
+                         for d, s in ((d, rng.randint(0, 100)) for d in days)],
+        'sleep_log': {d: round(rng.uniform(4, 9.5), 1) for d in days},
+        'achievements': [],
+        'xp_journal': journal,
+        'last_login': today.strftime('%Y-%m-%d'),
+    }
+
+
+class BenchContext:
+    """Temporary profile on disk plus a loaded PersonalLifeRPG"""
+
+    def __init__(self, profile):
+        self.dir = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.dir.name, 'life_rpg_personal.json')
+        self.profile = profile
+        with open(self.data_file, 'w') as f:
+            json.dump(profile, f, indent=2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.rpg = PersonalLifeRPG(self.data_file, publish=False)
+        self._visual = None
+
+    @property
+    def visual(self):
+        if self._visual is None:
+            from ICD import LifeRPGVisual
+            self._visual = LifeRPGVisual(self.data_file)
+        return self._visual
+
+    def close(self):
+        self.dir.cleanup()
+
+
+@benchmark('storage.load_hot')
+def bench_load(ctx):
+    return ctx.rpg.load_data
+
+
+@benchmark('storage.load_full')
+def bench_load_full(ctx):
+    # Startup plus reading every section (what a whole-profile export or sync join pays)
+    return lambda: unwrap(ctx.rpg.load_data())
+
+
+@benchmark('storage.save')
+def bench_save(ctx):
+    return ctx.rpg.save_data
+
+
+@benchmark('storage.snapshot_load')
+def bench_snapshot_load(ctx):
+    from life_rpg_snapshot import check_cases, check_roundtrip, load_snapshot, save_snapshot
+    if not check_roundtrip(ctx.rpg.data):
+        raise AssertionError("snapshot round trip does not reproduce the JSON profile")
+    failed = check_cases()
+    if failed:
+        raise AssertionError(f"snapshot round trip differs for: {', '.join(failed)}")
+    path = os.path.join(ctx.dir.name, 'life_rpg_personal.lrpg')
+    save_snapshot(ctx.rpg.data, path)
+    return lambda: load_snapshot(path)
+
+
+@benchmark('storage.snapshot_save')
+def bench_snapshot_save(ctx):
+    from life_rpg_snapshot import save_snapshot
+    path = os.path.join(ctx.dir.name, 'life_rpg_personal.lrpg')
+    return lambda: save_snapshot(ctx.rpg.data, path)
+
+
+@benchmark('storage.archive_year', repeat=20)
+def bench_archive_year(ctx):
+    archive = ctx.rpg.archive
+    end = archive.last_day or 0
+
+    def run():
+        year = archive.slice(end - 365, end)
+        scores = year['score']
+        return float(scores[scores >= 0].mean()) if len(scores) else 0.0
+    return run
+
+
+@benchmark('scoring.decay')
+def bench_decay(ctx):
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    def run():
+        ctx.rpg.data['last_login'] = yesterday
+        ctx.rpg.apply_daily_decay()
+    return run
+
+
+@benchmark('scoring.daily_score', repeat=20)
+def bench_daily_score(ctx):
+    return ctx.rpg.calculate_daily_score
+
+
+@benchmark('scoring.add_xp', repeat=20)
+def bench_add_xp(ctx):
+    area = next(iter(ctx.rpg.data['life_areas']))
+    return lambda: ctx.rpg.add_xp(area, 1, "bench")
+
+
+@benchmark('tui.keystroke', repeat=20)
+def bench_tui_keystroke(ctx):
+    """scoring.add_xp as the terminal UI runs it: stats pane rows updated, saving left to the autosave task"""
+    from life_rpg_tui import Autosaver, StatsPane
+    area = next(iter(ctx.rpg.data['life_areas']))
+    pane = StatsPane(ctx.rpg)
+
+    def run():
+        saver = Autosaver(ctx.rpg)
+        ctx.rpg.listeners.append(pane.handle)
+        try:
+            ctx.rpg.add_xp(area, 1, "bench")
+        finally:
+            ctx.rpg.listeners.remove(pane.handle)
+            saver.detach()
+    return run
+
+
+@benchmark('scoring.area_summary', repeat=100)
+def bench_area_summary(ctx):
+    index = ctx.rpg.aggregates
+    return lambda: (index.total_level, index.total_xp, index.top(10), index.category_levels)
+
+
+@benchmark('scoring.achievements_replay', repeat=20)
+def bench_achievements_replay(ctx):
+    from life_rpg_achievements import AchievementEngine
+    return lambda: AchievementEngine([], ctx.rpg.aggregates).evaluate(ctx.rpg.data['habits'])
+
+
+@benchmark('scoring.journal_queries', repeat=100)
+def bench_journal_queries(ctx):
+    journal = ctx.rpg.journal
+    areas = list(journal.areas)
+    today = datetime.now().toordinal()
+    curve_days = list(range(today - 365, today + 1, 7))
+    return lambda: (journal.gained(areas[0], today - 29, today), journal.weekly(areas, today - 83, today),
+                    journal.cumulative(areas[0], curve_days))
+
+
+@benchmark('search.query', repeat=20)
+def bench_search(ctx):
+    rpg = ctx.rpg
+    rpg.search_index.build()
+    area = rpg.data['todos'][0]['area']
+    return lambda: (rpg.search("review"), rpg.search("ta 12"), rpg.search("", kind='todo', area=area, completed=False))
+
+
+@benchmark('scoring.income_queries', repeat=100)
+def bench_income_queries(ctx):
+    ledger = ctx.rpg.ledger
+    today = ctx.rpg.today()
+    month = today[:7]
+    goal = ctx.rpg.data['income']['monthly_goal']
+    return lambda: (ledger.month_total(month), ledger.trailing_12_months(month), ledger.goal_pace(today, goal))
+
+
+@benchmark('scheduling.recurring_agenda', repeat=10)
+def bench_recurring_agenda(ctx):
+    return ctx.rpg.agenda_recurring
+
+
+@benchmark('scheduling.reminders_load', repeat=10)
+def bench_reminders_load(ctx):
+    from life_rpg_recurrence import ReminderScheduler
+    ctx.rpg.reminders = ReminderScheduler(notify=lambda title, body: None)
+    return ctx.rpg.schedule_reminders
+
+
+@benchmark('render.visualization', repeat=3)
+def bench_visualization(ctx):
+    import matplotlib.pyplot as plt
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(ctx.dir.name)  # create_visualization writes into the working directory
+        try:
+            ctx.rpg.create_visualization()
+        finally:
+            plt.close('all')
+            os.chdir(cwd)
+    return run
+
+
+@benchmark('render.dashboard_view', repeat=30)
+def bench_dashboard_view(ctx):
+    return ctx.visual.draw_dashboard_view
+
+
+@benchmark('render.stats_view', repeat=30)
+def bench_stats_view(ctx):
+    return ctx.visual.draw_stats_view
+
+
+@benchmark('render.milestones_view', repeat=30)
+def bench_milestones_view(ctx):
+    return ctx.visual.draw_milestones_view
+
+
+@benchmark('render.milestones_scroll', repeat=100)
+def bench_milestones_scroll(ctx):
+    import pygame
+    visual = ctx.visual
+    milestones = {f"bench_{i}": {'completed': i % 3 == 0, 'xp_reward': 500 + i,
+                                 'description': f"Scroll benchmark milestone {i}"} for i in range(5000)}
+    visual.data = dict(visual.data, epic_milestones=milestones)
+    visual.milestone_list.set_rows(visual.milestone_rows())
+    wheel = pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1)
+
+    def run():
+        if visual.milestone_list.scroll >= visual.milestone_list.max_scroll:
+            visual.milestone_list.scroll_to(0)
+        visual.milestone_list.handle_event(wheel)
+        visual.draw_milestones_view()
+    return run
+
+
+@benchmark('render.trends_view', repeat=30)
+def bench_trends_view(ctx):
+    visual = ctx.visual
+    visual.trend_days = None  # whole history, uncached: the worst case
+
+    def run():
+        visual.trend_cache.clear()
+        visual.draw_trends_view()
+    return run
+
+
+@benchmark('render.profiler_overlay', repeat=30)
+def bench_profiler_overlay(ctx):
+    visual = ctx.visual
+
+    def run():
+        # A dashboard frame with the P overlay on and due for a redraw: section timing plus the overlay
+        visual.profiler.enabled = True
+        visual.profiler_overlay = None
+        try:
+            visual.profiler.begin_frame(1 / visual.FPS)
+            visual.draw_dashboard_view()
+            visual.draw_profiler_overlay()
+            visual.profiler.end_frame()
+        finally:
+            visual.profiler.enabled = False
+    return run
+
+
+@benchmark('render.xp_bar', repeat=100)
+def bench_xp_bar(ctx):
+    return lambda: ctx.visual.draw_xp_bar(470, 200, 460, 1234, 9)
+
+
+@benchmark('render.avatar', repeat=100)
+def bench_avatar(ctx):
+    return lambda: ctx.visual.draw_character_avatar(230, 220, 70, 120)
+
+
+@benchmark('analytics.insights', repeat=30)
+def bench_insights(ctx):
+    analytics = ctx.rpg.analytics
+
+    def run():
+        analytics.signature = None  # recompute as if new data arrived
+        analytics.update(ctx.rpg.data)
+    return run
+
+
+@benchmark('simulation.forecast', repeat=3)
+def bench_forecast(ctx):
+    from life_rpg_sim import LifeRPGSimulator
+    sim = LifeRPGSimulator(ctx.rpg, seed=0)
+    area = sim.areas[0]
+    return lambda: sim.run(10000, 365, target_area=area, target_level=20)
+
+
+def run_benchmarks(ctx, selected=None):
+    """Time every registered benchmark; returns {name: median seconds}"""
+    results = {}
+    for name, repeat, factory in BENCHMARKS:
+        if selected and not any(name.startswith(s) for s in selected):
+            continue
+        try:
+            func = factory(ctx)
+        except ImportError as e:
+            print(f"  {name:28} skipped ({e})")
+            continue
+        samples = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()  # warm-up
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - start)
+        results[name] = statistics.median(samples)
+        print(f"  {name:28} {results[name] * 1e3:10.3f} ms  (min {min(samples) * 1e3:.3f}, n={repeat})")
+    return results
+
+
+def measure_memory(count=100000):
+    """Resident size of `count` todos and push-up entries as JSON dicts vs model records"""
+    from life_rpg_model import attach
+    profile = make_profile(areas=22, years=1, todos=count, projects=0)
+    profile['habits']['workout']['pushup_history'] = [
+        {'date': t['created'], 'count': t['base_xp']} for t in profile['todos']]
+    text = json.dumps(profile)
+    results = {}
+    for label, convert in (('dicts', lambda d: d), ('records', attach)):
+        tracemalloc.start()
+        data = convert(json.loads(text))
+        results[label] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+    print(f"🧠 Memory for {count:,} todos + {count:,} push-up entries")
+    for label, size in results.items():
+        print(f"  {label:28} {size / 1e6:10.1f} MB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print ratios against a baseline; returns names that regressed beyond threshold"""
+    regressions = []
+    print("\n" + "="*70)
+    print("📊 COMPARISON WITH BASELINE".center(70))
+    print("="*70)
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:28} (no baseline)")
+            continue
+        ratio = seconds / base
+        flag = "❌ REGRESSION" if ratio > 1 + threshold else "✅"
+        if ratio > 1 + threshold:
+            regressions.append(name)
+        print(f"  {name:28} {base * 1e3:9.3f} → {seconds * 1e3:9.3f} ms  x{ratio:5.2f} {flag}")
+    print("="*70)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Life RPG benchmark suite")
+    parser.add_argument('--areas', type=int, default=22)
+    parser.add_argument('--years', type=float, default=2)
+    parser.add_argument('--todos', type=int, default=20000)
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--recurring', type=int, default=2000)
+    parser.add_argument('--only', nargs='*', help="Run benchmarks whose name starts with these prefixes")
+    parser.add_argument('--save-baseline', metavar='FILE', help="Store results as the new baseline")
+    parser.add_argument('--compare', metavar='FILE', help="Compare results with a stored baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Relative slowdown that counts as a regression (default 0.25)")
+    parser.add_argument('--memory', type=int, nargs='?', const=100000, metavar='N',
+                        help="Measure memory of N history records as dicts vs records and exit")
+    args = parser.parse_args()
+
+    if args.memory:
+        measure_memory(args.memory)
+        return
+
+    print(f"🏗️  Generating profile: {args.areas} areas, {args.years} years, "
+          f"{args.todos:,} todos, {args.projects:,} projects, {args.recurring:,} recurring tasks")
+    profile = make_profile(args.areas, args.years, args.todos, args.projects, args.recurring)
+    ctx = BenchContext(profile)
+    print(f"   {os.path.getsize(ctx.data_file) / 1e6:.1f} MB on disk\n")
+    try:
+        results = run_benchmarks(ctx, args.only)
+    finally:
+        ctx.close()
+
+    if args.save_baseline:
+        meta = {'areas': args.areas, 'years': args.years, 'todos': args.todos, 'projects': args.projects,
+                'recurring': args.recurring}
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+        print(f"\n💾 Baseline saved as '{args.save_baseline}'")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
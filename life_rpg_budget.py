@@ -0,0 +1,108 @@
+from life_rpg_model import day_ordinal, iso_day
+
+
+class Budget:
+    """Rolling total over the last `window` days, kept as a ring buffer of daily buckets
+
+    State lives in the profile as budgets[name] = {'window', 'limit', 'unit',
+    'penalty', 'head', 'buckets'}: the day with ordinal d is bucket d % window
+    and head is the newest day the buffer has been advanced to. Moving head
+    forward zeroes the buckets that fell out of the window and subtracts them
+    from a running total, so reading the rolling total is O(1) (O(window) at
+    worst after a long gap) and the window is exactly the last `window` days,
+    whenever you log.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.window = state['window']
+        self.buckets = state['buckets']
+        self.head = day_ordinal(state['head'])
+        self.total = sum(self.buckets)
+
+    @classmethod
+    def new_state(cls, window, limit, unit, penalty=0):
+        return {'window': window, 'limit': limit, 'unit': unit, 'penalty': penalty,
+                'head': None, 'buckets': [0] * window}
+
+    @property
+    def limit(self):
+        return self.state['limit']
+
+    @property
+    def unit(self):
+        return self.state['unit']
+
+    @property
+    def penalty(self):
+        return self.state['penalty']
+
+    def advance(self, day):
+        """Move the window so it ends at `day` (ordinal); older days drop out"""
+        if self.head is None:
+            self.head = day
+        elif day > self.head:
+            for d in range(self.head + 1, self.head + min(day - self.head, self.window) + 1):
+                slot = d % self.window
+                self.total -= self.buckets[slot]
+                self.buckets[slot] = 0
+            self.head = day
+        else:
+            return
+        self.state['head'] = iso_day(day)
+
+    def in_window(self, day):
+        return self.head is not None and self.head - self.window < day <= self.head
+
+    def add(self, day, amount):
+        """Add to a day's bucket; days already outside the window are ignored (returns False)"""
+        day = day_ordinal(day)
+        self.advance(day)
+        if not self.in_window(day):
+            return False
+        self.buckets[day % self.window] += amount
+        self.total += amount
+        return True
+
+    def get(self, day):
+        day = day_ordinal(day)
+        return self.buckets[day % self.window] if self.in_window(day) else 0
+
+    def set(self, day, value):
+        """Replace a day's value (e.g. screen time logged twice); returns the change"""
+        delta = value - self.get(day)
+        self.add(day, delta)
+        return delta
+
+    def used(self, today):
+        """Rolling total for the `window` days ending today"""
+        self.advance(day_ordinal(today))
+        return round(self.total, 6)  # float buckets (hours) accumulate rounding noise
+
+    def remaining(self, today):
+        return self.limit - self.used(today)
+
+    def over(self, today):
+        return max(0, self.used(today) - self.limit)
+
+
+class Budgets:
+    """All budgeted activities of a profile (built-in and user-defined), by name"""
+
+    def __init__(self, states):
+        self.states = states
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.states
+
+    def __iter__(self):
+        return iter(self.states)
+
+    def __getitem__(self, name):
+        # Re-wrap if the state dict was replaced (e.g. by undo)
+        state = self.states[name]
+        budget = self.cache.get(name)
+        if budget is None or budget.state is not state:
+            budget = self.cache[name] = Budget(state)
+        return budget
@@ -0,0 +1,186 @@
+from datetime import date
+
+import numpy as np
+
+from life_rpg_model import day_ordinal
+
+# Day ordinals (date.toordinal()) <-> numpy datetime64 days
+EPOCH = date(1970, 1, 1).toordinal()
+LEVELS = ('day', 'week', 'month')
+SERIES = ('score', 'screen', 'pushups')
+# A level is used while the range holds at most this many buckets per pixel;
+# LTTB then thins it to one point per pixel, so drawing cost tracks the width, not the range.
+POINTS_PER_PIXEL = 4
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the shape of (x, y)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp).tolist() + [n]
+    xs, ys = x.tolist(), y.tolist()
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi, next_hi = edges[i], edges[i + 1], edges[i + 2]
+        # Third vertex: average of the next bucket (the last point for the last bucket)
+        span = next_hi - hi
+        avg_x = sum(xs[hi:next_hi]) / span
+        avg_y = sum(ys[hi:next_hi]) / span
+        ax, ay = xs[a], ys[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected, dtype=np.intp)
+
+
+def dense(days, values, first, last):
+    """Scatter (day, value) pairs into one float per day from first..last, NaN where missing"""
+    out = np.full(last - first + 1, np.nan)
+    out[np.asarray(days, dtype=np.int64) - first] = values
+    return out
+
+
+class Pyramid:
+    """Min/mean/max of one daily series at day, week and month resolution
+
+    Every level keeps only non-empty buckets as parallel arrays (x = bucket
+    centre as a day ordinal, lo, mean, hi), so a date range is two
+    searchsorted calls on any level.
+    """
+
+    def __init__(self, first_day, values):
+        days = first_day + np.arange(len(values))
+        have = ~np.isnan(values)
+        days, values = days[have], values[have]
+        self.levels = {'day': (days.astype(np.float64), values, values, values)}
+        if not len(days):
+            self.levels['week'] = self.levels['month'] = self.levels['day']
+            return
+        weeks = (days - 1) // 7  # ordinal 1 is a Monday
+        months = (days - EPOCH).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        for name, keys in (('week', weeks), ('month', months)):
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            counts = np.diff(np.r_[starts, len(days)])
+            self.levels[name] = (
+                np.add.reduceat(days.astype(np.float64), starts) / counts,
+                np.minimum.reduceat(values, starts),
+                np.add.reduceat(values, starts) / counts,
+                np.maximum.reduceat(values, starts),
+            )
+
+    @property
+    def first_day(self):
+        x = self.levels['day'][0]
+        return int(x[0]) if len(x) else None
+
+    @property
+    def last_day(self):
+        x = self.levels['day'][0]
+        return int(x[-1]) if len(x) else None
+
+    def select(self, start_day, end_day, width):
+        """Finest level that fits `width` pixels for start_day..end_day, thinned to <= width points
+
+        Returns {'level', 'x', 'lo', 'mean', 'hi'}; lo/hi are the extremes of
+        everything each kept point stands for, so spikes survive downsampling.
+        """
+        for level in LEVELS:
+            x, lo, mean, hi = self.levels[level]
+            first = int(np.searchsorted(x, start_day, 'left'))
+            last = int(np.searchsorted(x, end_day + 1, 'left'))
+            if last - first <= POINTS_PER_PIXEL * width:
+                break
+        x, lo, mean, hi = x[first:last], lo[first:last], mean[first:last], hi[first:last]
+        if len(x) > width:
+            keep = lttb(x, mean, width)
+            # Each kept point covers the buckets up to the next one
+            lo, hi = np.minimum.reduceat(lo, keep), np.maximum.reduceat(hi, keep)
+            x, mean = x[keep], mean[keep]
+        return {'level': level, 'x': x, 'lo': lo, 'mean': mean, 'hi': hi}
+
+
+class TrendCharts:
+    """Pyramids for the daily score, screen time and push-up series of a profile
+
+    Archived days come from the columnar archive and are cached until it
+    grows; the live part of the profile is small. Pyramids are rebuilt only
+    when the profile's signature changes, so views can call update() every
+    frame.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.archived = None
+        self.archived_rows = None
+        self.signature = None
+        self.version = 0
+        self.pyramids = {name: Pyramid(0, np.empty(0)) for name in SERIES}
+
+    def _archived_points(self):
+        if self.archived_rows != (self.archive.rows, self.archive.writes):
+            columns = self.archive.slice()
+            scored = columns['score'] >= 0
+            logged = ~np.isnan(columns['screen'])
+            self.archived = {
+                'score': (np.asarray(columns['day'][scored]), np.asarray(columns['score'][scored], dtype=np.float64)),
+                'screen': (np.asarray(columns['day'][logged]), np.asarray(columns['screen'][logged], dtype=np.float64)),
+            }
+            self.archived_rows = (self.archive.rows, self.archive.writes)
+        return self.archived
+
+    def update(self, data):
+        """Rebuild the pyramids if the profile changed since the last call; returns True if it did"""
+        scores = data['daily_scores']
+        log = data['screen_time']['daily_log']
+        pushups = data['habits']['workout']['pushup_history']
+        signature = (self.archive.rows, self.archive.writes, hash(tuple(s['score'] for s in scores)),
+                     hash(tuple(log.items())), len(pushups), pushups[-1]['count'] if pushups else None)
+        if signature == self.signature:
+            return False
+        archived = self._archived_points()
+        points = {
+            'score': (np.r_[archived['score'][0], [day_ordinal(s['date']) for s in scores]],
+                      np.r_[archived['score'][1], [s['score'] for s in scores]]),
+            'screen': (np.r_[archived['screen'][0], [day_ordinal(d) for d in log]],
+                       np.r_[archived['screen'][1], list(log.values())]),
+        }
+        if pushups:
+            days = np.fromiter((day_ordinal(p['date']) for p in pushups), np.int64, len(pushups))
+            counts = np.fromiter((p['count'] for p in pushups), np.float64, len(pushups))
+            first = int(days.min())
+            totals = np.bincount(days - first, weights=counts)
+            logged = np.bincount(days - first) > 0
+            points['pushups'] = (np.flatnonzero(logged) + first, totals[logged])
+        else:
+            points['pushups'] = (np.empty(0, np.int64), np.empty(0))
+
+        for name, (days, values) in points.items():
+            if len(days):
+                first, last = int(days.min()), int(days.max())
+                self.pyramids[name] = Pyramid(first, dense(days, values, first, last))
+            else:
+                self.pyramids[name] = Pyramid(0, np.empty(0))
+        self.signature = signature
+        self.version += 1
+        return True
+
+    def span(self):
+        """(first, last) day ordinal over all series, or None without data"""
+        firsts = [p.first_day for p in self.pyramids.values() if p.first_day is not None]
+        lasts = [p.last_day for p in self.pyramids.values() if p.last_day is not None]
+        return (min(firsts), max(lasts)) if firsts else None
+
+    def select(self, series, start_day, end_day, width):
+        return self.pyramids[series].select(start_day, end_day, width)
+
+
+def to_datetime64(x):
+    """Day ordinals (possibly fractional bucket centres) -> datetime64 for plotting"""
+    return np.datetime64('1970-01-01') + np.round((np.asarray(x) - EPOCH) * 24).astype('timedelta64[h]')
@@ -0,0 +1,228 @@
+import functools
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+
+# What ICD.py's frame profiler splits a frame into; 'other' is whatever no section covered
+PANELS = ('card', 'xp_bars', 'avatar', 'text', 'effects', 'overlay', 'other')
+# Histogram buckets as in OperationStats (bit length of the duration in us), clipped to 16us..33ms
+HISTOGRAM_BUCKETS = range(5, 17)
+
+# Effect settings from most to least expensive; the governor moves along this list
+QUALITY_LEVELS = (
+    ('full', {'glow_layers': 3, 'gradients': True}),
+    ('reduced', {'glow_layers': 1, 'gradients': True}),
+    ('low', {'glow_layers': 1, 'gradients': False}),
+    ('minimal', {'glow_layers': 0, 'gradients': False}),
+)
+
+
+class FrameProfiler:
+    """Render time per panel over the last WINDOW frames, for ICD.py's P overlay
+
+    Draw code wraps each panel in section(name). Time spent in a nested
+    section (the text inside a card) counts only toward the inner one, so
+    the panels of a frame add up to its work time. Sections cost one
+    attribute check while the profiler is disabled; the work time and
+    interval of every frame are always recorded, since the quality governor
+    and the fps readout need them.
+    """
+
+    WINDOW = 120
+
+    def __init__(self, panels=PANELS, window=WINDOW):
+        self.enabled = False
+        self.panels = panels
+        self.index = {name: i for i, name in enumerate(panels)}
+        self.samples = np.full((window, len(panels)), np.nan)  # seconds per panel, NaN while disabled
+        self.work = np.zeros(window)  # seconds from begin_frame() to end_frame()
+        self.intervals = np.zeros(window)  # wall time between frames
+        self.count = 0
+        self.current = np.zeros(len(panels))
+        self.stack = []  # [panel index, time it last started counting]
+        self.frame_start = None
+        self.interval = 0.0
+
+    def begin_frame(self, dt):
+        self.frame_start = time.perf_counter()
+        self.interval = dt
+        self.current[:] = 0
+        self.stack.clear()
+
+    def section(self, name):
+        """Context manager timing the enclosed drawing under a panel"""
+        if not self.enabled:
+            return nullcontext()
+        return _Section(self, self.index[name])
+
+    def _enter(self, panel):
+        now = time.perf_counter()
+        if self.stack:
+            parent = self.stack[-1]
+            self.current[parent[0]] += now - parent[1]
+        self.stack.append([panel, now])
+
+    def _exit(self):
+        now = time.perf_counter()
+        panel, start = self.stack.pop()
+        self.current[panel] += now - start
+        if self.stack:
+            self.stack[-1][1] = now
+
+    def end_frame(self):
+        """Commit the frame to the window; returns its work time in seconds"""
+        work = time.perf_counter() - self.frame_start
+        row = self.count % len(self.work)
+        self.work[row] = work
+        self.intervals[row] = self.interval
+        if self.enabled:
+            other = self.index['other']
+            self.current[other] = max(0.0, work - self.current.sum() + self.current[other])
+            self.samples[row] = self.current
+        else:
+            self.samples[row] = np.nan
+        self.count += 1
+        return work
+
+    def recent(self):
+        """(work, intervals, per-panel samples) of the frames in the window, oldest first"""
+        size = len(self.work)
+        if self.count < size:
+            order = np.arange(self.count)
+        else:
+            order = (np.arange(size) + self.count) % size
+        return self.work[order], self.intervals[order], self.samples[order]
+
+    def summary(self):
+        """Mean and p95 (ms) plus a histogram per panel and for the whole frame, in one pass
+
+        Returns {name: (mean ms, p95 ms, bucket counts)}, with 'frame' for the
+        work time; panels without samples in the window are left out.
+        """
+        work, _, samples = self.recent()
+        columns = np.column_stack([samples, work]) if len(work) else np.empty((0, len(self.panels) + 1))
+        names = self.panels + ('frame',)
+        logged = ~np.isnan(columns)
+        values = np.where(logged, columns, 0.0)
+        counts = logged.sum(axis=0)
+        with np.errstate(invalid='ignore'):
+            means = values.sum(axis=0) / counts * 1e3
+        p95 = np.full(len(names), np.nan)
+        have = counts > 0
+        if have.any():
+            p95[have] = np.nanpercentile(np.where(logged, columns, np.nan)[:, have], 95, axis=0) * 1e3
+        buckets = np.frexp(np.floor(values * 1e6))[1]  # bit length of the duration in us
+        buckets = np.clip(buckets, HISTOGRAM_BUCKETS[0], HISTOGRAM_BUCKETS[-1])
+        hits = ((buckets[:, :, None] == np.array(HISTOGRAM_BUCKETS)) & logged[:, :, None]).sum(axis=0)
+        return {name: (means[i], p95[i], hits[i]) for i, name in enumerate(names) if counts[i]}
+
+    def fps(self):
+        _, intervals, _ = self.recent()
+        intervals = intervals[intervals > 0]
+        return len(intervals) / intervals.sum() if len(intervals) else 0.0
+
+
+class _Section:
+    __slots__ = ('profiler', 'panel')
+
+    def __init__(self, profiler, panel):
+        self.profiler = profiler
+        self.panel = panel
+
+    def __enter__(self):
+        self.profiler._enter(self.panel)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit()
+        return False
+
+
+def profiled(panel):
+    """Decorator timing a draw method under `panel` of its object's `profiler`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not self.profiler.enabled:
+                return func(self, *args, **kwargs)
+            with self.profiler.section(panel):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ProfiledFont:
+    """A pygame font whose render() calls count toward the profiler's 'text' panel"""
+
+    def __init__(self, font, profiler):
+        self.font = font
+        self.profiler = profiler
+
+    def render(self, *args, **kwargs):
+        if not self.profiler.enabled:
+            return self.font.render(*args, **kwargs)
+        with self.profiler.section('text'):
+            return self.font.render(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+
+class QualityGovernor:
+    """Steps effect quality down while frames run over budget and back up once there's headroom
+
+    Judges the work time of the last SAMPLE frames, not the time
+    clock.tick() sleeps away. A p90 over the budget drops one level
+    straight away. A p90 under RESTORE x budget, held for HOLD seconds,
+    restores one level. Each time a level has to be dropped, the wait
+    before trying it again doubles (up to MAX_HOLD), so a machine that
+    can't quite afford a level doesn't flicker between two. A pinned
+    governor keeps its level.
+    """
+
+    SAMPLE = 30
+    RESTORE = 0.7
+    HOLD = 2.0
+    MAX_HOLD = 60.0
+
+    def __init__(self, budget, level=0, pinned=False):
+        self.budget = budget
+        self.level = level
+        self.pinned = pinned
+        self.recent = deque(maxlen=self.SAMPLE)
+        self.calm = 0.0  # seconds of headroom in a row
+        self.strikes = [0] * len(QUALITY_LEVELS)  # times each level was dropped
+
+    @property
+    def name(self):
+        return QUALITY_LEVELS[self.level][0]
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level][1]
+
+    def update(self, work, dt):
+        """Feed one frame's work time and wall time (seconds); returns True if the level changed"""
+        self.recent.append(work)
+        if self.pinned or len(self.recent) < self.SAMPLE:
+            return False
+        p90 = sorted(self.recent)[int(self.SAMPLE * 0.9)]
+        if p90 > self.budget and self.level < len(QUALITY_LEVELS) - 1:
+            self.strikes[self.level] += 1
+            self.shift(1)
+            return True
+        if p90 < self.budget * self.RESTORE and self.level > 0:
+            self.calm += dt
+            if self.calm >= min(self.HOLD * 2 ** self.strikes[self.level - 1], self.MAX_HOLD):
+                self.shift(-1)
+                return True
+        else:
+            self.calm = 0.0
+        return False
+
+    def shift(self, step):
+        self.level += step
+        self.recent.clear()
+        self.calm = 0.0
@@ -0,0 +1,218 @@
+import copy
+import functools
+import json
+import os
+from collections import deque
+from contextlib import contextmanager
+
+from life_rpg_model import Project, PushupRecord, Record, Todo, to_json
+from life_rpg_sections import touch
+
+# Lists whose items are model records; appended values are rebuilt as records on redo
+RECORD_LISTS = {
+    ('todos',): Todo,
+    ('projects',): Project,
+    ('habits', 'workout', 'pushup_history'): PushupRecord,
+}
+MISSING = {'$missing': True}
+
+
+class HistoryMismatch(Exception):
+    """The profile no longer matches the journal (e.g. it was edited by hand)"""
+
+
+class History:
+    """Undo/redo journal of per-operation change records, persisted next to the profile
+
+    Each operation stores only what it changed: ['set', path, old, new],
+    ['append', path, value] or a custom kind registered by the app (e.g. an
+    area XP delta). Memory and file size therefore grow with the size of the
+    changes, not of the profile. Undo replays the last operation's records
+    backwards; depth is bounded by a deque.
+    """
+
+    def __init__(self, data, path, depth=50):
+        self.data = data
+        self.path = path
+        self.depth = depth
+        self.undo_stack = deque(maxlen=depth)
+        self.redo_stack = []
+        self.handlers = {
+            'set': (self._undo_set, self._redo_set),
+            'append': (self._undo_append, self._redo_append),
+        }
+        self.sections = {}  # kind -> profile path its handlers change in place
+        self.current = None
+        self.dirty = False
+        self.autosave = None  # called instead of writing, when set
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            self.undo_stack.extend(saved.get('undo', []))
+            self.redo_stack = saved.get('redo', [])
+
+    def register(self, kind, undo, redo, path=None):
+        """Handlers for a custom kind; `path` is the profile data they change in place, if any"""
+        self.handlers[kind] = (undo, redo)
+        if path is not None:
+            self.sections[kind] = path
+
+    @contextmanager
+    def operation(self, label):
+        """Group every change made inside the block into one undo step (nested blocks join the outer one)"""
+        if self.current is not None:
+            yield
+            return
+        self.current = {'label': label, 'ops': []}
+        try:
+            yield
+        finally:
+            op, self.current = self.current, None
+            if op['ops']:
+                self.undo_stack.append(op)
+                self.redo_stack.clear()
+                self.dirty = True
+                self.save()
+
+    def record(self, kind, *args):
+        if kind in self.sections:
+            touch(self.data, *self.sections[kind])
+        if self.current is not None:
+            self.current['ops'].append([kind, *args])
+
+    # Tracked writes for plain profile data
+    def _resolve(self, path):
+        touch(self.data, *path)  # a section's file is only rewritten once something changed it
+        container = self.data
+        for key in path[:-1]:
+            container = container[key]
+        return container, path[-1]
+
+    def set(self, path, value):
+        container, key = self._resolve(path)
+        old = container[key] if key in container else MISSING
+        container[key] = value
+        # Containers may be changed in place later; journal their value as of now
+        self.record('set', list(path), old, copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+
+    def append(self, path, value):
+        container, key = self._resolve(path)
+        container[key].append(value)
+        # Journal a copy: the live record may change later and must still match on undo
+        self.record('append', list(path), value.to_json() if isinstance(value, Record) else value)
+
+    def _check(self, container, key, path, expected):
+        current = container[key] if key in container else MISSING
+        if current != expected:
+            raise HistoryMismatch(f"{'/'.join(map(str, path))} no longer holds the value this step left there")
+
+    def _undo_set(self, path, old, new):
+        container, key = self._resolve(path)
+        self._check(container, key, path, new)
+        if old == MISSING:
+            del container[key]
+        else:
+            container[key] = copy.deepcopy(old)
+
+    def _redo_set(self, path, old, new):
+        container, key = self._resolve(path)
+        self._check(container, key, path, old)
+        if new == MISSING:
+            del container[key]
+        else:
+            container[key] = copy.deepcopy(new)
+
+    def _undo_append(self, path, value):
+        container, key = self._resolve(path)
+        items = container[key]
+        if not items or items[-1] != value:
+            raise HistoryMismatch(f"last entry of {'/'.join(map(str, path))} is not the one this step added")
+        items.pop()
+
+    def _redo_append(self, path, value):
+        container, key = self._resolve(path)
+        cls = RECORD_LISTS.get(tuple(path))
+        container[key].append(cls.coerce(value) if cls else value)
+
+    def undo(self):
+        """Revert the last operation; returns its label, or None if there is nothing to undo"""
+        if not self.undo_stack:
+            return None
+        op = self.undo_stack.pop()
+        self._replay(reversed(op['ops']), 0)
+        self.redo_stack.append(op)
+        self.dirty = True
+        return op['label']
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        op = self.redo_stack.pop()
+        self._replay(op['ops'], 1)
+        self.undo_stack.append(op)
+        self.dirty = True
+        return op['label']
+
+    def _replay(self, ops, side):
+        """Run the undo (side 0) or redo (side 1) handler of each record, all or nothing
+
+        If a record doesn't match the profile, the ones already replayed are
+        put back, so the profile is left exactly as it was; the journal is
+        then cleared, since it no longer describes the profile.
+        """
+        done = []
+        try:
+            for kind, *args in ops:
+                self.handlers[kind][side](*args)
+                if kind in self.sections:
+                    touch(self.data, *self.sections[kind])
+                done.append((kind, args))
+        except (HistoryMismatch, KeyError, IndexError) as e:
+            for kind, args in reversed(done):
+                self.handlers[kind][1 - side](*args)
+            self.clear()
+            if isinstance(e, HistoryMismatch):
+                raise
+            raise HistoryMismatch(f"a {kind} step refers to data that no longer exists") from e
+
+    def clear(self):
+        """Forget every step (the profile was rewritten in a way the journal can't follow)"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.dirty = True
+        self.save()
+
+    def labels(self):
+        """(undo labels newest first, redo labels next-to-redo first)"""
+        return [op['label'] for op in reversed(self.undo_stack)], [op['label'] for op in reversed(self.redo_stack)]
+
+    def save(self):
+        if not self.dirty:
+            return
+        if self.autosave is not None:
+            self.autosave()  # the owner's autosave task writes it (see render())
+            return
+        self.render()()
+
+    def render(self):
+        """Serialize the journal now; returns a function that writes it to disk"""
+        text = json.dumps({'undo': list(self.undo_stack), 'redo': self.redo_stack}, default=to_json)
+        self.dirty = False
+
+        def write():
+            with open(self.path, 'w') as f:
+                f.write(text)
+            return len(text)
+        return write
+
+
+def undoable(label):
+    """Method decorator: everything the call changes becomes one undo step"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            detail = ", ".join(str(a) for a in args)
+            with self.history.operation(f"{label} ({detail})" if detail else label):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
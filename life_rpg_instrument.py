@@ -0,0 +1,135 @@
+import cProfile
+import functools
+import pstats
+import time
+from contextlib import nullcontext
+
+
+class OperationStats:
+    """Counts, latency histogram and byte totals for one named operation"""
+
+    # Bucket i holds samples whose duration in microseconds has bit length i,
+    # i.e. [2**(i-1), 2**i) us, which covers 1us..~35min in 32 buckets.
+    BUCKETS = 32
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.histogram = [0] * self.BUCKETS
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+    def percentile(self, pct):
+        """Upper bound (seconds) of the histogram bucket holding the percentile"""
+        if not self.count:
+            return 0.0
+        needed = self.count * pct / 100
+        seen = 0
+        for bucket, hits in enumerate(self.histogram):
+            seen += hits
+            if seen >= needed:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+
+class Instrumentation:
+    """Process-wide timers; a disabled instance costs one attribute check per call"""
+
+    def __init__(self):
+        self.enabled = False
+        self.operations = {}
+        self.profiler = None
+        self.pstats_file = None
+
+    def enable(self, pstats_file=None):
+        self.enabled = True
+        if pstats_file:
+            self.pstats_file = pstats_file
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def reset(self):
+        self.operations = {}
+
+    def stats(self, name):
+        op = self.operations.get(name)
+        if op is None:
+            op = self.operations[name] = OperationStats()
+        return op
+
+    def record(self, name, seconds):
+        self.stats(name).add(seconds)
+
+    def record_bytes(self, name, count):
+        if self.enabled:
+            self.stats(name).bytes += count
+
+    def timer(self, name):
+        """Context manager timing the enclosed block"""
+        if not self.enabled:
+            return nullcontext()
+        return _Timer(self, name)
+
+    def report(self):
+        """Print per-operation counts, total/p95 latency and bytes"""
+        print("\n" + "="*78)
+        print("⏱️  PROFILE".center(78))
+        print("="*78)
+        print(f"{'Operation':28} {'Count':>7} {'Total ms':>10} {'Mean ms':>9} {'p95 ms':>9} {'Bytes':>10}")
+        print("-"*78)
+        for name, op in sorted(self.operations.items(), key=lambda x: -x[1].total):
+            mean = op.total / op.count if op.count else 0
+            print(f"{name:28} {op.count:7} {op.total * 1e3:10.2f} {mean * 1e3:9.3f} "
+                  f"{op.percentile(95) * 1e3:9.3f} {op.bytes:10,}")
+        print("="*78)
+
+    def dump(self):
+        """Print the report and write the cProfile stats file if one was requested"""
+        self.report()
+        if self.profiler:
+            self.profiler.disable()
+            pstats.Stats(self.profiler).dump_stats(self.pstats_file)
+            print(f"📄 cProfile stats saved as '{self.pstats_file}'")
+
+
+class _Timer:
+    __slots__ = ('instrument', 'name', 'start')
+
+    def __init__(self, instrument, name):
+        self.instrument = instrument
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.instrument.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+instrument = Instrumentation()
+
+
+def timed(name):
+    """Decorator recording each call's latency under `name` while enabled"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrument.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                instrument.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+
+# Events are single JSON objects, one per line, e.g.
+#   {"type": "area", "area": "Health - Exercise", "xp": 310, "level": 3}
+#   {"type": "habit", "habit": "workout", "streak": 8, "last_done": "2025-01-02"}
+#   {"type": "todo", "id": 7, "completed": true, "completion_date": "2025-01-02"}
+#   {"type": "income", "entry": {"date": ..., "amount": 800, ...}, "current_month_earnings": 4200}
+#   {"type": "milestone", "key": "...", "completed": true}
+#   {"type": "achievement", "name": "Health - Exercise - Bronze Tier"}
+#   {"type": "score", "date": "2025-01-02", "score": 85, "grade": "S"}
+#   {"type": "history", "action": "undo", "label": "Complete todo (7)"}
+# The subscriber also queues {"type": "connected"} each time it (re)connects.
+
+
+def profile_key(data_file):
+    """Short stable id for a profile path, used to name per-profile sockets and segments"""
+    return hashlib.sha1(os.path.abspath(data_file).encode()).hexdigest()[:12]
+
+
+def socket_path(data_file):
+    """Per-profile socket in the temp dir (Unix socket paths are limited to ~100 bytes)"""
+    return os.path.join(tempfile.gettempdir(), f"life_rpg-{profile_key(data_file)}.sock")
+
+
+class Publisher:
+    """Listening side, owned by PersonalLifeRPG; fans events out to connected dashboards"""
+
+    SEND_TIMEOUT = 0.05
+
+    def __init__(self, path):
+        self.path = path
+        self.clients = []
+        self.lock = threading.Lock()
+        self.server = None
+        self.elsewhere = False  # another live life_rpg.py owns this profile's dashboards
+        if not hasattr(socket, 'AF_UNIX'):
+            return
+        if os.path.exists(path):
+            if self._in_use():
+                self.elsewhere = True
+                return  # another life_rpg.py already publishes for this profile
+            os.unlink(path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(path)
+            server.listen()
+        except OSError:
+            server.close()
+            return
+        self.server = server
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _in_use(self):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except OSError:
+                return  # closed
+            client.settimeout(self.SEND_TIMEOUT)
+            with self.lock:
+                self.clients.append(client)
+
+    def emit(self, event):
+        """Send to every subscriber; slow or dead ones are dropped, never waited on"""
+        if not self.clients:
+            return
+        line = (json.dumps(event) + "\n").encode()
+        with self.lock:
+            alive = []
+            for client in self.clients:
+                try:
+                    client.sendall(line)
+                    alive.append(client)
+                except OSError:
+                    client.close()
+            self.clients = alive
+
+    def close(self):
+        if self.server is None:
+            return
+        self.server.close()
+        with self.lock:
+            for client in self.clients:
+                client.close()
+            self.clients = []
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.server = None
+
+
+class Subscriber:
+    """Connecting side, owned by the dashboard; a daemon thread reads events into a queue"""
+
+    RETRY_INTERVAL = 1.0
+
+    def __init__(self, path):
+        self.path = path
+        self.events = queue.Queue()
+        self.connected = False
+        self.running = hasattr(socket, 'AF_UNIX')
+        if self.running:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while self.running:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                time.sleep(self.RETRY_INTERVAL)
+                continue
+            self.connected = True
+            self.events.put({'type': 'connected'})
+            try:
+                for line in sock.makefile('rb'):
+                    try:
+                        self.events.put(json.loads(line))
+                    except ValueError:
+                        continue
+            except OSError:
+                pass
+            finally:
+                self.connected = False
+                sock.close()
+
+    def poll(self):
+        """All events received so far, without blocking"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        self.running = False
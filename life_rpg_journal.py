@@ -0,0 +1,148 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from life_rpg_history import HistoryMismatch
+from life_rpg_model import day_ordinal, iso_day
+
+# Per-area columns (name, array typecode), parallel and sorted by day
+COLUMNS = (('day', 'i'), ('delta', 'i'), ('reason', 'i'), ('minutes', 'i'))
+# Running totals kept per area; prefix[name][i] is the total of the first i entries
+PREFIXES = ('net', 'gained', 'minutes')
+
+
+class XPJournal:
+    """Every add_xp grant, per area, as sorted array columns with prefix sums
+
+    State lives in the profile as xp_journal = {'reasons': [...], 'areas':
+    {area: {'day', 'delta', 'reason', 'minutes'}}}; reason is an index into
+    the interned reasons table and minutes is the time logged with the grant
+    (learning and memory sessions). Columns are array('i') in memory and in
+    snapshots, plain lists in JSON. Prefix sums of net XP, gains and minutes
+    are built on load and extended on append, so totals over any date range
+    are two bisects and a subtraction. Decay and penalties are not grants
+    and are not journaled.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.reasons = state.setdefault('reasons', [])
+        self.reason_ids = {reason: i for i, reason in enumerate(self.reasons)}
+        self.areas = state.setdefault('areas', {})
+        self.prefix = {}
+        for area, columns in self.areas.items():
+            for name, code in COLUMNS:
+                if not isinstance(columns[name], array):
+                    columns[name] = array(code, columns[name])
+            self._rebuild(area, 0)
+
+    def __contains__(self, area):
+        return area in self.areas
+
+    def __len__(self):
+        return sum(len(columns['day']) for columns in self.areas.values())
+
+    def intern(self, reason):
+        reason_id = self.reason_ids.get(reason)
+        if reason_id is None:
+            reason_id = self.reason_ids[reason] = len(self.reasons)
+            self.reasons.append(reason)
+        return reason_id
+
+    def _columns(self, area):
+        columns = self.areas.get(area)
+        if columns is None:
+            columns = self.areas[area] = {name: array(code) for name, code in COLUMNS}
+            self.prefix[area] = {name: array('q', [0]) for name in PREFIXES}
+        return columns
+
+    def _rebuild(self, area, start):
+        """Recompute the prefix sums of an area from entry `start` on"""
+        columns = self.areas[area]
+        prefix = self.prefix.setdefault(area, {name: array('q', [0]) for name in PREFIXES})
+        for name in PREFIXES:
+            del prefix[name][start + 1:]
+        net, gained, minutes = prefix['net'], prefix['gained'], prefix['minutes']
+        for i in range(start, len(columns['day'])):
+            delta = columns['delta'][i]
+            net.append(net[-1] + delta)
+            gained.append(gained[-1] + max(delta, 0))
+            minutes.append(minutes[-1] + columns['minutes'][i])
+
+    def add(self, area, day, delta, reason='', minutes=0):
+        """Journal one grant; O(1) for today, O(n) for a backdated day"""
+        columns = self._columns(area)
+        day = day_ordinal(day)
+        row = (day, delta, self.intern(reason), minutes)
+        position = bisect_right(columns['day'], day)
+        if position == len(columns['day']):
+            for (name, _), value in zip(COLUMNS, row):
+                columns[name].append(value)
+            prefix = self.prefix[area]
+            prefix['net'].append(prefix['net'][-1] + delta)
+            prefix['gained'].append(prefix['gained'][-1] + max(delta, 0))
+            prefix['minutes'].append(prefix['minutes'][-1] + minutes)
+        else:
+            for (name, _), value in zip(COLUMNS, row):
+                columns[name].insert(position, value)
+            self._rebuild(area, position)
+
+    def remove(self, area, day, delta, reason='', minutes=0):
+        """Drop the latest matching entry (undo of add())"""
+        columns = self.areas.get(area)
+        day = day_ordinal(day)
+        reason_id = self.reason_ids.get(reason)
+        if columns is not None:
+            lo = bisect_left(columns['day'], day)
+            for i in range(bisect_right(columns['day'], day) - 1, lo - 1, -1):
+                if (columns['delta'][i], columns['reason'][i], columns['minutes'][i]) == (delta, reason_id, minutes):
+                    for name, _ in COLUMNS:
+                        del columns[name][i]
+                    self._rebuild(area, i)
+                    return
+        raise HistoryMismatch(f"no journal entry {area} {iso_day(day)} {delta:+} XP to remove")
+
+    def _rows(self, area, start, end):
+        """Row range [lo, hi) of an area's entries from start through end (ordinals or ISO; None = open)"""
+        days = self.areas[area]['day']
+        lo = 0 if start is None else bisect_left(days, day_ordinal(start))
+        hi = len(days) if end is None else bisect_right(days, day_ordinal(end))
+        return lo, max(lo, hi)
+
+    def total(self, area, start=None, end=None, column='net'):
+        """Sum of net XP, gained XP or minutes in an area from start through end, in O(log n)"""
+        if area not in self.areas:
+            return 0
+        lo, hi = self._rows(area, start, end)
+        prefix = self.prefix[area][column]
+        return prefix[hi] - prefix[lo]
+
+    def gained(self, area, start=None, end=None):
+        return self.total(area, start, end, 'gained')
+
+    def minutes(self, area, start=None, end=None):
+        return self.total(area, start, end, 'minutes')
+
+    def cumulative(self, area, days):
+        """Net journaled XP of an area up to and including each of `days` (a cumulative-XP curve)"""
+        if area not in self.areas:
+            return [0] * len(days)
+        column, prefix = self.areas[area]['day'], self.prefix[area]['net']
+        return [prefix[bisect_right(column, day_ordinal(day))] for day in days]
+
+    def weekly(self, areas, start, end, column='minutes'):
+        """[(monday ordinal, total over `areas`)] for every week touching start..end"""
+        first = (day_ordinal(start) - 1) // 7 * 7 + 1  # ordinal 1 is a Monday
+        last = day_ordinal(end)
+        weeks = []
+        for monday in range(first, last + 1, 7):
+            weeks.append((monday, sum(self.total(area, monday, monday + 6, column) for area in areas)))
+        return weeks
+
+    def entries(self, area, start=None, end=None):
+        """[(ISO day, delta, reason, minutes)] of an area from start through end"""
+        if area not in self.areas:
+            return []
+        columns = self.areas[area]
+        lo, hi = self._rows(area, start, end)
+        return [(iso_day(columns['day'][i]), columns['delta'][i], self.reasons[columns['reason'][i]],
+                 columns['minutes'][i]) for i in range(lo, hi)]
@@ -0,0 +1,122 @@
+import calendar
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+
+def month_of(day):
+    """'YYYY-MM-DD' -> 'YYYY-MM'"""
+    return day[:7]
+
+
+def shift_month(month, delta):
+    year, mon = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + delta, 12)
+    return f"{year:04d}-{mon + 1:02d}"
+
+
+class IncomeLedger:
+    """Append-only income transactions, partitioned by month with cached prefix sums
+
+    Entries live in the profile as income['ledger'] (dicts with date, amount,
+    kind, project_id and note). months is the sorted list of months that have
+    entries and prefix[i] is the total of months[0..i], so a month total is a
+    dict lookup and any month range is two bisects and a subtraction.
+    income['current_month_earnings'] is kept equal to the target month's total
+    for older readers of the profile.
+    """
+
+    def __init__(self, income):
+        self.income = income
+        self.entries = income.setdefault('ledger', [])
+        if not self.entries and income.get('current_month_earnings'):
+            # Profiles from before the ledger: carry the counter over as an opening balance
+            self.entries.append({'date': f"{income['target_month']}-01",
+                                 'amount': income['current_month_earnings'],
+                                 'kind': 'opening', 'project_id': None, 'note': None})
+        self.partitions = {}
+        self.prefix = []
+        for index, entry in enumerate(self.entries):
+            self.partitions.setdefault(month_of(entry['date']), []).append(index)
+        self.months = sorted(self.partitions)
+        self.totals = {m: sum(self.entries[i]['amount'] for i in self.partitions[m]) for m in self.months}
+        self._rebuild_prefix(0)
+
+    def _rebuild_prefix(self, start):
+        del self.prefix[start:]
+        running = self.prefix[-1] if self.prefix else 0
+        for month in self.months[start:]:
+            running += self.totals[month]
+            self.prefix.append(running)
+
+    def record(self, day, amount, kind='project', project_id=None, note=None):
+        """Append a transaction; O(1) for the current month, O(months) when backdated"""
+        entry = {'date': day, 'amount': amount, 'kind': kind, 'project_id': project_id, 'note': note}
+        self.entries.append(entry)
+        month = month_of(day)
+        new_month = month not in self.partitions
+        if new_month:
+            self.partitions[month] = []
+            self.totals[month] = 0
+            insort(self.months, month)
+        self.partitions[month].append(len(self.entries) - 1)
+        self.totals[month] += amount
+        if self.months[-1] != month:
+            self._rebuild_prefix(bisect_left(self.months, month))
+        elif new_month:
+            self.prefix.append((self.prefix[-1] if self.prefix else 0) + amount)
+        else:
+            self.prefix[-1] += amount
+        if month == self.income.get('target_month'):
+            self.income['current_month_earnings'] = self.totals[month]
+        return entry
+
+    def pop(self):
+        """Remove the most recent transaction (undo of record()); returns it"""
+        entry = self.entries.pop()
+        month = month_of(entry['date'])
+        self.partitions[month].pop()
+        self.totals[month] -= entry['amount']
+        position = bisect_left(self.months, month)
+        if not self.partitions[month]:
+            del self.partitions[month], self.totals[month], self.months[position]
+        self._rebuild_prefix(position)
+        if month == self.income.get('target_month'):
+            self.income['current_month_earnings'] = self.month_total(month)
+        return entry
+
+    def month_total(self, month):
+        return self.totals.get(month, 0)
+
+    def month_entries(self, month):
+        return [self.entries[i] for i in self.partitions.get(month, ())]
+
+    def range_total(self, first_month, last_month):
+        """Earnings from first_month through last_month inclusive"""
+        lo = bisect_left(self.months, first_month)
+        hi = bisect_right(self.months, last_month)
+        if hi <= lo:
+            return 0
+        return self.prefix[hi - 1] - (self.prefix[lo - 1] if lo else 0)
+
+    def trailing_12_months(self, month):
+        return self.range_total(shift_month(month, -11), month)
+
+    def goal_pace(self, today, goal):
+        """Month-to-date vs goal: (earned, expected by today, projected month end, Lari/day still needed)"""
+        day = date.fromisoformat(today)
+        days_in_month = calendar.monthrange(day.year, day.month)[1]
+        earned = self.month_total(month_of(today))
+        expected = goal * day.day / days_in_month
+        projected = earned * days_in_month / day.day
+        days_left = days_in_month - day.day + 1
+        needed = max(goal - earned, 0) / days_left
+        return earned, expected, projected, needed
+
+    def rollover(self, today):
+        """Move target_month to today's month; returns the month that closed, or None"""
+        month = month_of(today)
+        closed = self.income.get('target_month')
+        if closed == month:
+            return None
+        self.income['target_month'] = month
+        self.income['current_month_earnings'] = self.month_total(month)
+        return closed
@@ -0,0 +1,329 @@
+import sys
+from array import array
+from datetime import date, datetime
+from operator import attrgetter
+
+# Dates are stored on records as day ordinals; the ISO strings used in the JSON
+# profile are produced (and parsed) through these caches.
+_ISO = {}
+_ORDINAL = {}
+
+
+def day_ordinal(value):
+    """'YYYY-MM-DD' (also unpadded, '2026-1-5') -> day ordinal (None passes through); ValueError if not a date"""
+    if value is None or isinstance(value, int):
+        return value
+    ordinal = _ORDINAL.get(value)
+    if ordinal is None:
+        ordinal = _ORDINAL[value] = datetime.strptime(value, '%Y-%m-%d').toordinal()
+    return ordinal
+
+
+def record_day(value):
+    """A record's date field: the day ordinal, or the value as given if it isn't a date (free-form deadlines)"""
+    try:
+        return day_ordinal(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def iso_day(ordinal):
+    """Day ordinal -> 'YYYY-MM-DD' (None and undated strings pass through)"""
+    if ordinal is None or isinstance(ordinal, str):
+        return ordinal
+    name = _ISO.get(ordinal)
+    if name is None:
+        name = _ISO[ordinal] = date.fromordinal(ordinal).isoformat()
+    return name
+
+
+# Per-class (de)serializers are generated once, the same way dataclasses builds
+# __init__, so loading and saving large profiles avoids a generic per-key loop.
+
+def _compile_from_json(cls):
+    lines = [
+        "def from_json(entry):",
+        "    if not entry.keys() <= keys:",
+        "        return generic(entry)",
+        "    record = new(cls)",
+        "    record._extra = None",
+    ]
+    for key in cls.FIELDS:
+        lines.append(f"    if {key!r} in entry:")
+        lines.append(f"        value = entry[{key!r}]")
+        if key in cls.DATE_FIELDS:
+            lines.append("        if value is not None:")
+            lines.append("            value = ordinals.get(value) or record_day(value)")
+        elif key in cls.INTERNED_FIELDS:
+            lines.append("        if isinstance(value, str):")
+            lines.append("            value = intern(value)")
+        lines.append(f"        record.{key} = value")
+    lines.append("    return record")
+    namespace = {
+        'keys': frozenset(cls.FIELDS), 'generic': lambda entry: Record.from_json.__func__(cls, entry),
+        'new': cls.__new__, 'cls': cls, 'ordinals': _ORDINAL, 'record_day': record_day,
+        'intern': sys.intern,
+    }
+    exec("\n".join(lines), namespace)
+    return namespace['from_json']
+
+
+def _compile_to_json(cls):
+    lines = ["def to_json(self):", "    out = {}"]
+    for key in cls.FIELDS:
+        lines.append("    try:")
+        lines.append(f"        value = self.{key}")
+        lines.append("    except AttributeError:")
+        lines.append("        pass")
+        lines.append("    else:")
+        if key in cls.DATE_FIELDS:
+            lines.append("        if value is not None:")
+            lines.append("            value = names.get(value) or iso_day(value)")
+        lines.append(f"        out[{key!r}] = value")
+    lines.append("    if self._extra:")
+    lines.append("        out.update(self._extra)")
+    lines.append("    return out")
+    namespace = {'names': _ISO, 'iso_day': iso_day}
+    exec("\n".join(lines), namespace)
+    return namespace['to_json']
+
+
+def _compile_from_row(cls):
+    targets = ", ".join(f"record.{key}" for key in cls.FIELDS)
+    lines = [
+        "def from_rows(rows):",
+        "    out = []",
+        "    append = out.append",
+        "    for row in rows:",
+        "        record = new(cls)",
+        "        record._extra = None",
+        f"        {targets}, = row",
+        "        append(record)",
+        "    return out",
+    ]
+    namespace = {'new': cls.__new__, 'cls': cls}
+    exec("\n".join(lines), namespace)
+    return namespace['from_rows']
+
+
+class Record:
+    """Slotted record with a dict-style facade over its JSON keys
+
+    Attribute access (`todo.deadline`) gives the stored value, with dates as
+    day ordinals (a value that isn't a date, like a free-form deadline, is
+    kept as the string it was given). Item access (`todo['deadline']`) behaves like the original
+    JSON dict, dates as 'YYYY-MM-DD', so existing code and ICD.py keep working.
+    Keys outside FIELDS are kept in a per-record dict so nothing is lost.
+    """
+
+    __slots__ = ('_extra',)
+    FIELDS = ()
+    DATE_FIELDS = frozenset()
+    INTERNED_FIELDS = frozenset()
+
+    def __init__(self, **fields):
+        self._extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.from_json = staticmethod(_compile_from_json(cls))
+        cls.to_json = _compile_to_json(cls)
+        cls.from_rows = staticmethod(_compile_from_row(cls))
+        cls.row = attrgetter(*cls.FIELDS)
+
+    @classmethod
+    def from_json(cls, entry):
+        record = cls.__new__(cls)
+        record._extra = None
+        for key, value in entry.items():
+            record[key] = value
+        return record
+
+    @classmethod
+    def coerce(cls, entry):
+        return entry if isinstance(entry, cls) else cls.from_json(entry)
+
+    # Compact pickling (used by binary snapshots): bitmask of set fields + their values
+    def __getstate__(self):
+        mask = 0
+        values = []
+        for i, key in enumerate(self.FIELDS):
+            try:
+                values.append(getattr(self, key))
+            except AttributeError:
+                continue
+            mask |= 1 << i
+        return (mask, self._extra, *values)
+
+    def __setstate__(self, state):
+        mask, self._extra, *values = state
+        values = iter(values)
+        for i, key in enumerate(self.FIELDS):
+            if mask & (1 << i):
+                setattr(self, key, next(values))
+
+    # Dict facade
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return iso_day(value) if key in self.DATE_FIELDS else value
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            if key in self.DATE_FIELDS:
+                value = record_day(value)
+            elif key in self.INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self.FIELDS:
+            return hasattr(self, key)
+        return bool(self._extra) and key in self._extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [k for k in self.FIELDS if hasattr(self, k)]
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_json() == (other.to_json() if isinstance(other, Record) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_json()!r})"
+
+
+class LifeArea(Record):
+    __slots__ = ('level', 'xp', 'last_active')
+    FIELDS = ('level', 'xp', 'last_active')
+    DATE_FIELDS = frozenset({'last_active'})
+
+
+class Todo(Record):
+    __slots__ = ('id', 'task', 'area', 'base_xp', 'deadline', 'completed', 'created', 'completion_date')
+    FIELDS = __slots__
+    DATE_FIELDS = frozenset({'deadline', 'created', 'completion_date'})
+    INTERNED_FIELDS = frozenset({'area'})
+
+
+class Project(Record):
+    __slots__ = ('id', 'name', 'value', 'deadline', 'completed', 'completion_date', 'created')
+    FIELDS = __slots__
+    DATE_FIELDS = frozenset({'deadline', 'completion_date', 'created'})
+
+
+class PushupRecord(Record):
+    __slots__ = ('date', 'count')
+    FIELDS = __slots__
+    DATE_FIELDS = frozenset({'date'})
+
+
+def attach(data):
+    """Convert the nested-dict sections of a loaded profile into records, in place"""
+    data['life_areas'] = {sys.intern(name): LifeArea.coerce(stats)
+                          for name, stats in data['life_areas'].items()}
+    data['todos'] = [Todo.coerce(t) for t in data['todos']]
+    data['projects'] = [Project.coerce(p) for p in data['projects']]
+    workout = data['habits']['workout']
+    workout['pushup_history'] = [PushupRecord.coerce(p) for p in workout['pushup_history']]
+    return data
+
+
+def to_columns(cls, records):
+    """Records -> (one list per field, {field: rows where it is unset}, {row: extra keys})"""
+    rows = []
+    missing = {}
+    extras = {}
+    for index, record in enumerate(records):
+        record = cls.coerce(record)
+        try:
+            rows.append(cls.row(record))
+        except AttributeError:
+            values = []
+            for key in cls.FIELDS:
+                try:
+                    values.append(getattr(record, key))
+                except AttributeError:
+                    missing.setdefault(key, []).append(index)
+                    values.append(None)
+            rows.append(tuple(values))
+        if record._extra:
+            extras[index] = record._extra
+    columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in cls.FIELDS]
+    return columns, missing, extras
+
+
+def from_columns(cls, columns, missing=None, extras=None):
+    records = cls.from_rows(zip(*columns))
+    for key, indices in (missing or {}).items():
+        for index in indices:
+            delattr(records[index], key)
+    for index, extra in (extras or {}).items():
+        records[index]._extra = extra
+    return records
+
+
+def to_plain(data):
+    """Shallow copy of a profile with record sections turned back into JSON dicts
+
+    Converting up front is much cheaper than json.dump(default=...), which sends
+    every record through the pure-Python encoder's fallback path.
+    """
+    out = dict(data)
+    out['life_areas'] = {name: stats.to_json() for name, stats in data['life_areas'].items()}
+    out['todos'] = [t.to_json() for t in data['todos']]
+    out['projects'] = [p.to_json() for p in data['projects']]
+    habits = out['habits'] = dict(data['habits'])
+    workout = habits['workout'] = dict(habits['workout'])
+    workout['pushup_history'] = [p.to_json() for p in workout['pushup_history']]
+    return out
+
+
+def to_json(obj):
+    """json.dump(default=...) hook for records and array columns"""
+    if isinstance(obj, Record):
+        return obj.to_json()
+    if isinstance(obj, array):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
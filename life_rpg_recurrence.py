@@ -0,0 +1,387 @@
+import asyncio
+import calendar
+import heapq
+import itertools
+import json
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+from life_rpg_model import day_ordinal, iso_day
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+FREQS = ('DAILY', 'WEEKLY', 'MONTHLY')
+
+
+def parse_rule(text):
+    """RRULE subset -> dict: FREQ, INTERVAL, BYDAY, BYMONTHDAY, COUNT, UNTIL
+
+    Also accepts the shorthands 'daily', 'weekly', 'monthly' and
+    'every N days'. Raises ValueError for anything else.
+    """
+    text = text.strip()
+    words = text.lower().split()
+    if text.lower() in ('daily', 'weekly', 'monthly'):
+        text = f"FREQ={text.upper()}"
+    elif len(words) == 3 and words[0] == 'every' and words[2] in ('day', 'days') and words[1].isdigit():
+        text = f"FREQ=DAILY;INTERVAL={words[1]}"
+    rule = {'FREQ': None, 'INTERVAL': 1, 'BYDAY': None, 'BYMONTHDAY': None, 'COUNT': None, 'UNTIL': None}
+    for part in filter(None, text.upper().split(';')):
+        key, _, value = part.partition('=')
+        if key not in rule:
+            raise ValueError(f"unsupported rule part {key!r}")
+        if key == 'FREQ':
+            if value not in FREQS:
+                raise ValueError(f"unsupported FREQ {value!r}")
+            rule[key] = value
+        elif key in ('INTERVAL', 'COUNT'):
+            if not value.isdigit():
+                raise ValueError(f"{key} must be a whole number, not {value!r}")
+            rule[key] = int(value)
+        elif key == 'BYDAY':
+            days = value.split(',')
+            unknown = [day for day in days if day not in WEEKDAYS]
+            if unknown:
+                raise ValueError(f"unknown weekday {unknown[0]!r} (use MO,TU,WE,TH,FR,SA,SU)")
+            rule[key] = sorted(WEEKDAYS.index(day) for day in days)
+        elif key == 'BYMONTHDAY':
+            if not all(day.lstrip('-').isdigit() for day in value.split(',')):
+                raise ValueError(f"BYMONTHDAY must be day numbers, not {value!r}")
+            rule[key] = [int(day) for day in value.split(',')]
+            if not all(1 <= abs(day) <= 31 for day in rule[key]):
+                raise ValueError("BYMONTHDAY days must be 1..31 or -31..-1")
+        else:  # UNTIL, as YYYYMMDD or YYYY-MM-DD
+            digits = value.replace('-', '')
+            if len(digits) != 8 or not digits.isdigit():
+                raise ValueError(f"UNTIL must be YYYYMMDD or YYYY-MM-DD, not {value!r}")
+            rule[key] = date(int(digits[:4]), int(digits[4:6]), int(digits[6:8])).toordinal()
+    if rule['FREQ'] is None:
+        raise ValueError("rule needs FREQ (or daily / weekly / monthly / every N days)")
+    if rule['INTERVAL'] < 1:
+        raise ValueError("INTERVAL must be at least 1")
+    return rule
+
+
+class Recurrence:
+    """Occurrence dates (day ordinals) of a rule starting at `start`, generated lazily
+
+    The generator seeks straight to the requested day, so asking for the
+    next occurrence costs the same a week or ten years after the start.
+    COUNT is folded into an end day once, on first use.
+    """
+
+    def __init__(self, rule, start):
+        self.rule = parse_rule(rule) if isinstance(rule, str) else rule
+        self.start = day_ordinal(start)
+        self._end = None
+        self._end_known = False
+
+    @property
+    def end(self):
+        """Last day the series can fall on (UNTIL, or the COUNT-th occurrence); None if endless"""
+        if not self._end_known:
+            end = self.rule['UNTIL']
+            if self.rule['COUNT'] is not None:
+                last = self.start - 1  # COUNT=0: no occurrences at all
+                for last in itertools.islice(self._candidates(self.start), self.rule['COUNT']):
+                    pass
+                end = last if end is None else min(end, last)
+            self._end, self._end_known = end, True
+        return self._end
+
+    def occurrences(self, after=None):
+        """Occurrences on or after `after` (ordinal; default: the start)"""
+        after = self.start if after is None else max(after, self.start)
+        end = self.end
+        for day in self._candidates(after):
+            if end is not None and day > end:
+                return
+            if day >= after:
+                yield day
+
+    def next_after(self, day):
+        """First occurrence on or after `day`, or None"""
+        return next(self.occurrences(day), None)
+
+    def last_before(self, day):
+        """Latest occurrence on or before `day`, or None (the one currently due)"""
+        # Widest possible gap between two occurrences (BYMONTHDAY=31 skips short months)
+        rule = self.rule
+        gap = {'DAILY': 7 if rule['BYDAY'] else 1, 'WEEKLY': 7, 'MONTHLY': 62}[rule['FREQ']]
+        span = gap * rule['INTERVAL']
+        if self.end is not None:
+            day = min(day, self.end)  # a finished series stays due on its last occurrence
+        latest = None
+        for occurrence in self.occurrences(max(self.start, day - span)):
+            if occurrence > day:
+                break
+            latest = occurrence
+        return latest
+
+    def _candidates(self, after):
+        rule = self.rule
+        interval = rule['INTERVAL']
+        if rule['FREQ'] == 'DAILY':
+            if rule['BYDAY'] and interval % 7 == 0 and (self.start - 1) % 7 not in rule['BYDAY']:
+                return  # every step lands on the start's weekday, which is excluded
+            skip = max(0, -(-(after - self.start) // interval))
+            day = self.start + skip * interval
+            while True:
+                if rule['BYDAY'] is None or (day - 1) % 7 in rule['BYDAY']:
+                    yield day
+                day += interval
+        elif rule['FREQ'] == 'WEEKLY':
+            weekdays = rule['BYDAY'] or [(self.start - 1) % 7]
+            start_week = (self.start - 1) // 7
+            skip = max(0, -(-((after - 1) // 7 - start_week) // interval))
+            week = start_week + skip * interval
+            while True:
+                monday = week * 7 + 1
+                for weekday in weekdays:
+                    if monday + weekday >= self.start:
+                        yield monday + weekday
+                week += interval
+        else:
+            first = date.fromordinal(self.start)
+            month_days = rule['BYMONTHDAY'] or [first.day]
+            start_month = first.year * 12 + first.month - 1
+            target = date.fromordinal(max(after, self.start))
+            skip = max(0, (target.year * 12 + target.month - 1 - start_month) // interval)
+            month = start_month + skip * interval
+            misses = 0
+            while misses < 100:  # e.g. day 30 every 12 months from February never occurs
+                year, mon = divmod(month, 12)
+                length = calendar.monthrange(year, mon + 1)[1]
+                days = sorted({d if d > 0 else length + d + 1 for d in month_days if 1 <= abs(d) <= length})
+                misses = 0 if days else misses + 1
+                for day in days:
+                    ordinal = date(year, mon + 1, day).toordinal()
+                    if ordinal >= self.start:
+                        yield ordinal
+                month += interval
+
+
+class RecurringTasks:
+    """The profile's recurring tasks (data['recurring']), with occurrences generated on demand
+
+    Each item stores its rule, start day and the ISO days of the occurrences
+    already completed; nothing is ever materialized into todos. Only the
+    latest occurrence on or before today is due, so a missed one lapses
+    when the next arrives instead of piling up.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.cache = {}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def find(self, item_id):
+        for index, item in enumerate(self.items):
+            if item['id'] == item_id:
+                return index, item
+        return None, None
+
+    def recurrence(self, item):
+        # Re-parse only when the rule changed (or the item was replaced by undo)
+        cached = self.cache.get(item['id'])
+        if cached is None or cached[0] != (item['rule'], item['start']):
+            cached = self.cache[item['id']] = ((item['rule'], item['start']), Recurrence(item['rule'], item['start']))
+        return cached[1]
+
+    def due(self, today):
+        """[(occurrence, item)] currently due and not done, oldest first"""
+        today = day_ordinal(today)
+        due = []
+        for item in self.items:
+            if item['active']:
+                occurrence = self.recurrence(item).last_before(today)
+                if occurrence is not None and iso_day(occurrence) not in item['done']:
+                    due.append((occurrence, item))
+        due.sort(key=lambda pair: pair[0])
+        return due
+
+    def upcoming(self, today, limit):
+        """The next `limit` occurrences after today over all items, merged lazily"""
+        after = day_ordinal(today) + 1
+        streams = [zip(self.recurrence(item).occurrences(after), itertools.repeat(n))
+                   for n, item in enumerate(self.items) if item['active']]
+        return [(day, self.items[n]) for day, n in itertools.islice(heapq.merge(*streams), limit)]
+
+    def pending(self, item, after):
+        """Occurrences of an item from `after` on that are not done yet (for reminders)"""
+        done = item['done']
+        return (day for day in self.recurrence(item).occurrences(day_ordinal(after)) if iso_day(day) not in done)
+
+    def prune(self, before):
+        """Forget completions before `before` (ordinal); those occurrences can no longer be due"""
+        cutoff = iso_day(before)
+        for item in self.items:
+            if item['done'] and item['done'][0] < cutoff:
+                item['done'][:] = [day for day in item['done'] if day >= cutoff]
+
+
+def describe(rule):
+    rule = parse_rule(rule) if isinstance(rule, str) else rule
+    unit = {'DAILY': 'day', 'WEEKLY': 'week', 'MONTHLY': 'month'}[rule['FREQ']]
+    text = f"every {unit}" if rule['INTERVAL'] == 1 else f"every {rule['INTERVAL']} {unit}s"
+    if rule['BYDAY']:
+        text += " on " + ",".join(WEEKDAYS[d].title() for d in rule['BYDAY'])
+    if rule['BYMONTHDAY']:
+        text += " on day " + ",".join("last" if d == -1 else str(d) for d in rule['BYMONTHDAY'])
+    if rule['COUNT']:
+        text += f", {rule['COUNT']} times"
+    if rule['UNTIL']:
+        text += f" until {iso_day(rule['UNTIL'])}"
+    return text
+
+
+def fire_times(days, at):
+    """Day ordinals -> epoch seconds at local time `at` ('HH:MM')"""
+    hour, minute = map(int, at.split(':'))
+    for day in days:
+        moment = date.fromordinal(day)
+        yield datetime(moment.year, moment.month, moment.day, hour, minute).timestamp()
+
+
+def terminal_notify(title, body):
+    print(f"\a\n⏰ {title}: {body}", flush=True)
+
+
+def desktop_notify(title, body):
+    """Terminal line plus a desktop notification where a notifier is installed"""
+    terminal_notify(title, body)
+    system_notify(title, body)
+
+
+def system_notify(title, body):
+    """Desktop notification only (notify-send or osascript); may block up to 5 s"""
+    if shutil.which('notify-send'):
+        command = ['notify-send', title, body]
+    elif sys.platform == 'darwin' and shutil.which('osascript'):
+        # AppleScript string literals are double-quoted with backslash escapes, as in JSON
+        script = f'display notification {json.dumps(body, ensure_ascii=False)} with title {json.dumps(title, ensure_ascii=False)}'
+        command = ['osascript', '-e', script]
+    else:
+        return
+    try:
+        subprocess.run(command, check=False, timeout=5, capture_output=True)
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+class ReminderScheduler:
+    """asyncio reminder timer: a min-heap holding each source's next fire time
+
+    A source is a lazily advanced iterator of ascending fire times (epoch
+    seconds), so only one live heap entry per reminder exists however far
+    its recurrence runs. The loop sleeps until the earliest entry and is
+    woken only when an added source becomes the earliest. Adding is
+    O(log n); removing leaves the entry to be skipped when it surfaces.
+    Both are safe to call from other threads.
+
+    `notify` never runs inline on the loop: a plain function (which may
+    block, like desktop_notify waiting on notify-send) goes to the default
+    executor, a coroutine function (a UI hook that must run on the loop) is
+    started as a task.
+    """
+
+    def __init__(self, notify=desktop_notify, clock=time.time):
+        self.notify = notify
+        self.clock = clock
+        self.heap = []  # (fire time, sequence, key, generation)
+        self.sources = {}  # key -> (iterator, title, body, generation)
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.loop = None
+        self.wake = None
+        self.fired = 0
+        self.hooks = set()
+
+    def add(self, key, times, title, body):
+        """(Re)schedule `key`; fire times before now are skipped"""
+        now = self.clock()
+        times = itertools.dropwhile(lambda moment: moment < now, times)
+        with self.lock:
+            generation = self.sources[key][3] + 1 if key in self.sources else 0
+            self.sources[key] = (times, title, body, generation)
+            self._push(key)
+            earliest = bool(self.heap) and self.heap[0][2] == key
+        if earliest:
+            self._wake()
+
+    def clear(self):
+        with self.lock:
+            self.heap.clear()
+            self.sources.clear()
+
+    def remove(self, key):
+        with self.lock:
+            self.sources.pop(key, None)  # its heap entry is dropped when it surfaces
+
+    def _push(self, key):
+        times, _, _, generation = self.sources[key]
+        moment = next(times, None)
+        if moment is None:
+            del self.sources[key]
+        else:
+            heapq.heappush(self.heap, (moment, next(self.sequence), key, generation))
+
+    def _wake(self):
+        if self.loop is not None and self.wake is not None:
+            self.loop.call_soon_threadsafe(self.wake.set)
+
+    def due(self):
+        """Pop every entry whose time has come; returns [(key, title, body)]"""
+        now = self.clock()
+        fired = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                _, _, key, generation = heapq.heappop(self.heap)
+                source = self.sources.get(key)
+                if source is None or source[3] != generation:
+                    continue  # removed or rescheduled since this entry was pushed
+                fired.append((key, source[1], source[2]))
+                self._push(key)
+        return fired
+
+    def next_fire(self):
+        with self.lock:
+            return self.heap[0][0] if self.heap else None
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        self.wake = asyncio.Event()
+        while True:
+            for _, title, body in self.due():
+                self.fired += 1
+                if asyncio.iscoroutinefunction(self.notify):
+                    task = self.loop.create_task(self.notify(title, body))
+                    self.hooks.add(task)  # the loop only keeps weak references to tasks
+                    task.add_done_callback(self.hooks.discard)
+                else:
+                    self.loop.run_in_executor(None, self.notify, title, body)
+            self.wake.clear()
+            upcoming = self.next_fire()
+            timeout = None if upcoming is None else max(0.0, upcoming - self.clock())
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start_thread(self, prepare=None):
+        """Run the scheduler on its own event loop in a daemon thread (for the blocking menu)
+
+        `prepare` (e.g. loading the reminders) runs first, on that thread.
+        """
+        def main():
+            if prepare is not None:
+                prepare()
+            asyncio.run(self.run())
+        thread = threading.Thread(target=main, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,148 @@
+from bisect import bisect_left
+
+from life_rpg_model import day_ordinal, iso_day
+from life_rpg_sections import touch
+
+# Points per component (100 in total)
+SHOWER_POINTS = 20
+WORKOUT_POINTS = 20
+TODO_POINTS = 10
+TODO_CAP = 30
+SCREEN_POINTS = 15
+SOCIAL_POINTS = 15
+GRADE_FLOORS = [(95, "SSS"), (90, "SS"), (85, "S"), (80, "A+"), (75, "A"),
+                (70, "A-"), (60, "B"), (50, "C"), (40, "D"), (0, "F")]
+
+
+def grade_of(score):
+    for floor, grade in GRADE_FLOORS:
+        if score >= floor:
+            return grade
+
+
+class ScoreTable:
+    """Daily scores keyed by day, with the per-day counters they are computed from
+
+    data['daily_scores'] stays a date-sorted list (the format the archive,
+    snapshots and dashboards read) but holds at most one entry per day;
+    index maps day ordinal -> position for upserts. data['score_components']
+    maps ISO day -> counters that events update as they happen: shower and
+    workout (0/1), todos (count), screen (hours) and social (count). A day's
+    score depends only on its own counters and the social counts of the
+    budget window before it, so scoring is O(1) and a late or backfilled
+    event re-scores just the days it can affect. data['latest_score'] copies
+    the newest entry into the hot part of the profile, for readers (the
+    shared-memory snapshot) that shouldn't load the whole list.
+    """
+
+    def __init__(self, data, archive, budgets, screen_limit):
+        self.archive = archive
+        self.budgets = budgets
+        self.screen_limit = screen_limit
+        self.data = data
+        self.components = data.setdefault('score_components', {})
+        self.entries = None  # daily_scores is a lazily loaded section: indexed on first use
+        if 'latest_score' not in data:
+            # Profiles from before latest_score: one read of the section, then it is kept up to date
+            data['latest_score'] = dict(data['daily_scores'][-1]) if data['daily_scores'] else None
+
+    def _load(self):
+        data = self.data
+        # Older profiles appended an entry per summary; keep the last one of each day
+        latest = {}
+        for entry in data['daily_scores']:
+            latest[day_ordinal(entry['date'])] = entry
+        if len(latest) != len(data['daily_scores']) or list(latest) != sorted(latest):
+            data['daily_scores'][:] = [latest[day] for day in sorted(latest)]
+            touch(data, 'daily_scores')
+        self.entries = data['daily_scores']
+        self.days = sorted(latest)
+        self.index = {day: i for i, day in enumerate(self.days)}
+
+    def get(self, day, field):
+        return self.components.get(iso_day(day), {}).get(field, 0)
+
+    def set(self, day, field, value):
+        """Set one counter, or remove it with None; returns the old value (None if it wasn't set)
+
+        Unset and 0 differ for screen time: 0 hours logged earns the screen
+        points, nothing logged doesn't, so undoing a day's first log must
+        remove the counter rather than write 0.
+        """
+        counters = self.components.setdefault(iso_day(day), {})
+        old = counters.get(field)
+        if value is None:
+            counters.pop(field, None)
+        else:
+            counters[field] = value
+        return old
+
+    def score(self, day):
+        """(score, grade) for a day ordinal from its counters"""
+        counters = self.components.get(iso_day(day), {})
+        score = 0
+        if counters.get('shower'):
+            score += SHOWER_POINTS
+        if counters.get('workout'):
+            score += WORKOUT_POINTS
+        score += min(counters.get('todos', 0) * TODO_POINTS, TODO_CAP)
+        screen = counters.get('screen')
+        if screen is not None and screen <= self.screen_limit:
+            score += SCREEN_POINTS
+        social = self.budgets['social']
+        week = sum(self.get(day - back, 'social') for back in range(social.window))
+        if week <= social.limit:
+            score += SOCIAL_POINTS
+        return score, grade_of(score)
+
+    def is_scored(self, day):
+        if self.entries is None:
+            self._load()
+        if day in self.index:
+            return True
+        row = self.archive.row_of(day)
+        return row is not None and self.archive.columns['score'][row] >= 0
+
+    def upsert(self, day, score, grade):
+        """Insert or replace a day's entry, in the archive if its month was archived"""
+        if self.entries is None:
+            self._load()
+        if day in self.index:
+            self.entries[self.index[day]].update(score=score, grade=grade)
+            touch(self.data, 'daily_scores')
+        elif self.archive.covers(day):
+            self.archive.update(day, score=score, grade=self.archive.grade_code(grade))
+        else:
+            touch(self.data, 'daily_scores')
+            position = bisect_left(self.days, day)
+            self.days.insert(position, day)
+            self.entries.insert(position, {'date': iso_day(day), 'score': score, 'grade': grade})
+            if position < len(self.days) - 1:
+                self.index = {d: i for i, d in enumerate(self.days)}  # backfilled before the end
+            else:
+                self.index[day] = position
+        latest = self.data['latest_score']
+        if latest is None or day >= day_ordinal(latest['date']):
+            self.data['latest_score'] = {'date': iso_day(day), 'score': score, 'grade': grade}
+
+    def affected(self, day, field):
+        """Days whose score depends on this counter of `day`"""
+        if field == 'social':
+            return range(day, day + self.budgets['social'].window)
+        return (day,)
+
+    def rescore(self, day, field):
+        """Recompute already-scored days a changed counter affects; returns [(day, score, grade)]"""
+        changed = []
+        for affected in self.affected(day, field):
+            if iso_day(affected) in self.components and self.is_scored(affected):
+                score, grade = self.score(affected)
+                self.upsert(affected, score, grade)
+                changed.append((affected, score, grade))
+        return changed
+
+    def prune(self, before):
+        """Drop counters of days before `before` (ordinal); they can no longer be re-scored"""
+        cutoff = iso_day(before)
+        for day in [d for d in self.components if d < cutoff]:
+            del self.components[day]
@@ -0,0 +1,190 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+
+TOKEN = re.compile(r"\w+")
+KINDS = ('todo', 'project', 'milestone')
+# Score weight of a term that only prefix-matches a word, relative to an exact match
+PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text):
+    return TOKEN.findall((text or "").casefold())
+
+
+class SearchIndex:
+    """Inverted index over todo tasks, project names and milestone descriptions
+
+    postings maps word -> {doc key: count}, where a doc key is ('todo', id),
+    ('project', id) or ('milestone', key); vocabulary is the sorted word list,
+    so a query term matches every word it is a prefix of via one bisect.
+    Kind, area and completed state are kept as sets of doc keys, so those
+    filters are set intersections; the deadline range is checked on the
+    survivors. Every query term must match; hits are ranked by tf-idf with
+    prefix matches weighted down, then by deadline.
+
+    The index is built on the first query and kept up to date by add() and
+    update(); invalidate() (e.g. after an undo) defers a rebuild to the next
+    query.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.built = False
+
+    def build(self):
+        self.postings = {}
+        self.docs = {}  # key -> (item, words, filter keys)
+        self.order = {}  # key -> tie-break string among equal scores: deadline, kind, ref
+        self.by_order = {}  # tie-break string -> key
+        self.ranked = []  # all tie-break strings, sorted
+        self.filters = {}  # ('kind' | 'area' | 'completed', value) -> set of keys
+        for todo in self.data['todos']:
+            self._add(('todo', todo['id']), todo)
+        for project in self.data['projects']:
+            self._add(('project', project['id']), project)
+        for key, milestone in self.data['epic_milestones'].items():
+            self._add(('milestone', key), milestone)
+        self.vocabulary = sorted(self.postings)
+        self.ranked.sort()
+        self.built = True
+
+    def invalidate(self):
+        self.built = False
+
+    @staticmethod
+    def fields(kind, item):
+        """(text, area, completed, deadline) of an item"""
+        if kind == 'todo':
+            return item['task'], item['area'], item['completed'], item['deadline']
+        if kind == 'project':
+            return item['name'], None, item['completed'], item['deadline']
+        return item['description'], None, item['completed'], None
+
+    def _add(self, key, item):
+        text, area, completed, deadline = self.fields(key[0], item)
+        words = {}
+        for word in tokenize(text):
+            words[word] = words.get(word, 0) + 1
+        filter_keys = (('kind', key[0]), ('area', area), ('completed', bool(completed)))
+        self.docs[key] = (item, words, filter_keys)
+        order = self.order[key] = f"{deadline or '9999-12-31'}\0{KINDS.index(key[0])}\0{key[1]}"
+        self.by_order[order] = key
+        if self.built:
+            insort(self.ranked, order)
+        else:
+            self.ranked.append(order)
+        for word, count in words.items():
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = {}
+                if self.built:
+                    insort(self.vocabulary, word)
+            posting[key] = count
+        for filter_key in filter_keys:
+            self.filters.setdefault(filter_key, set()).add(key)
+
+    def _remove(self, key):
+        _, words, filter_keys = self.docs.pop(key)
+        order = self.order.pop(key)
+        del self.by_order[order]
+        del self.ranked[bisect_left(self.ranked, order)]
+        for word in words:
+            posting = self.postings[word]
+            del posting[key]
+            if not posting:
+                del self.postings[word]
+                del self.vocabulary[bisect_left(self.vocabulary, word)]
+        for filter_key in filter_keys:
+            self.filters[filter_key].discard(key)
+
+    def add(self, kind, ref, item):
+        """Index a new item (no-op until the index is first built)"""
+        if self.built:
+            self._add((kind, ref), item)
+
+    def update(self, kind, ref, item):
+        """Re-index an item whose text or state changed"""
+        if self.built:
+            if (kind, ref) in self.docs:
+                self._remove((kind, ref))
+            self._add((kind, ref), item)
+
+    def expand(self, term):
+        """Vocabulary words starting with `term`"""
+        start = bisect_left(self.vocabulary, term)
+        end = bisect_left(self.vocabulary, term + '\U0010ffff')
+        return self.vocabulary[start:end]
+
+    def search(self, query, kind=None, area=None, completed=None, deadline_from=None, deadline_to=None, limit=20):
+        """Ranked [(kind, ref, item)] matching every term of `query` and the filters
+
+        An empty query returns everything that passes the filters, by deadline.
+        """
+        if not self.built:
+            self.build()
+        allowed = None
+        for filter_key, value in (('kind', kind), ('area', area), ('completed', completed)):
+            if value is not None:
+                keys = self.filters.get((filter_key, value), set())
+                allowed = keys if allowed is None else allowed & keys
+
+        scores = None
+        total = len(self.docs) or 1
+        # Narrowest term first, so the running intersection stays small
+        terms = sorted(set(tokenize(query)), key=lambda term: len(self.postings.get(term, ())))
+        for term in terms:
+            gate = allowed if scores is None else scores
+            term_scores = {}
+            for word in self.expand(term):
+                posting = self.postings[word]
+                weight = math.log(1 + total / len(posting)) * (1.0 if word == term else PREFIX_WEIGHT)
+                if gate is None and not term_scores:
+                    term_scores = {key: count * weight for key, count in posting.items()}
+                    continue
+                for key, count in posting.items():
+                    if gate is None or key in gate:
+                        term_scores[key] = term_scores.get(key, 0.0) + count * weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: scores[key] + score for key, score in term_scores.items()}
+            if not scores:
+                return []
+
+        if scores is None:
+            scores = dict.fromkeys(self.docs if allowed is None else allowed, 0.0)
+
+        if deadline_from is not None or deadline_to is not None:
+            def in_range(key):
+                deadline = self.docs[key][0]['deadline'] if key[0] != 'milestone' else None
+                return (deadline is not None and (deadline_from is None or deadline >= deadline_from)
+                        and (deadline_to is None or deadline <= deadline_to))
+            scores = {key: score for key, score in scores.items() if in_range(key)}
+
+        # Everything above the limit-th best score makes it; ties at that score go by order
+        order = self.order
+        if len(scores) <= limit:
+            best = sorted(scores, key=lambda key: (-scores[key], order[key]))
+        else:
+            top = heapq.nlargest(limit, scores.values())
+            cutoff = top[-1]
+            best = []
+            if top[0] > cutoff:
+                best = sorted((key for key, score in scores.items() if score > cutoff),
+                              key=lambda key: (-scores[key], order[key]))
+            need = limit - len(best)
+            if list(scores.values()).count(cutoff) * 8 > len(self.ranked):
+                # A large share of all documents tie (e.g. an empty query): walk the global order
+                for name in self.ranked:
+                    key = self.by_order[name]
+                    if scores.get(key) == cutoff:
+                        best.append(key)
+                        need -= 1
+                        if not need:
+                            break
+            else:
+                tied = [key for key, score in scores.items() if score == cutoff]
+                best += heapq.nsmallest(need, tied, key=order.__getitem__)
+        return [(key[0], key[1], self.docs[key][0]) for key in best]
@@ -0,0 +1,279 @@
+import json
+import os
+import sys
+import threading
+
+from life_rpg_instrument import instrument
+from life_rpg_model import LifeArea, Project, PushupRecord, Record, Todo, to_json
+
+# Cold parts of a JSON profile, each kept in its own file under <profile>_sections/:
+# name -> (path in the profile, record class of its items or None)
+SECTIONS = {
+    'todos': (('todos',), Todo),
+    'projects': (('projects',), Project),
+    'pushup_history': (('habits', 'workout', 'pushup_history'), PushupRecord),
+    'daily_scores': (('daily_scores',), None),
+    'daily_log': (('screen_time', 'daily_log'), None),
+    'xp_journal': (('xp_journal',), None),
+    'sleep_log': (('sleep_log',), None),
+}
+# What the profile file holds in place of a section, e.g. "todos": {"$section": "todos"}
+MARKER = '$section'
+SECTION_AT = {path: name for name, (path, _) in SECTIONS.items()}
+
+
+class Unloaded:
+    """Stands in for a section inside its parent LazyDict until first access"""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"<section {self.name} not loaded>"
+
+
+class LazyDict(dict):
+    """A profile dict (or a dict on the way to a section) that reads sections on first access
+
+    Indexing, get(), setdefault() and pop() load the section and keep the
+    result in place, so later access is a plain dict lookup. items() and
+    values() load every section at this level first. Loading is locked, so
+    two threads touching the same section get the same object. Assigning or
+    removing a section marks it changed in the store.
+    """
+
+    __slots__ = ('store', 'path')
+
+    def __init__(self, items, store, path=()):
+        super().__init__(items)
+        self.store = store
+        self.path = path
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is Unloaded:
+            with self.store.lock:
+                value = dict.__getitem__(self, key)
+                if type(value) is Unloaded:
+                    value = self.store.load(value.name)
+                    dict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.store.touch(self.path + (key,))
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.store.touch(self.path + (key,))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def load_all(self):
+        for key in [key for key, value in dict.items(self) if type(value) is Unloaded]:
+            self[key]
+
+    def loaded(self, key):
+        return type(dict.get(self, key)) is not Unloaded
+
+
+def raw(container, key):
+    """container[key] without loading it (an Unloaded for a section still on disk)"""
+    return dict.get(container, key)
+
+
+def section_loaded(data, name):
+    """False while a section of a lazily loaded profile is still only on disk"""
+    path = SECTIONS[name][0]
+    parent = data
+    for key in path[:-1]:
+        parent = raw(parent, key)
+        if not isinstance(parent, dict):
+            return True
+    return type(raw(parent, path[-1])) is not Unloaded
+
+
+def touch(data, *path):
+    """Mark the section holding data[path[0]][path[1]]... changed, so the next save writes it
+
+    For code that changes a section in place; history writes and section
+    assignments are tracked already. A no-op for profiles not split into
+    sections.
+    """
+    store = getattr(data, 'store', None)
+    if store is not None:
+        store.touch(path)
+
+
+def unwrap(data):
+    """Fully loaded copy of a profile as plain dicts (for pickling or whole-file exports)"""
+    out = dict(data.items())
+    for path, _ in SECTIONS.values():
+        parent = out
+        for key in path[:-1]:
+            if not isinstance(parent.get(key), dict):
+                break
+            parent[key] = dict(parent[key].items())
+            parent = parent[key]
+    return out
+
+
+class SectionStore:
+    """Reads and writes a JSON profile split into a hot file and per-section files
+
+    The profile file keeps everything a session needs on start (areas,
+    habits, milestones, budgets, income, ...) and a marker for each
+    section. A section is parsed the first time it's accessed, and written
+    back on save only if something changed it since it was last read or
+    written: History writes, section assignments and touch() mark it. A
+    profile with sections inline (older files, exports, benchmarks) loads
+    eagerly and is split on its next save.
+    """
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.dir = os.path.splitext(data_file)[0] + '_sections'
+        self.stored = set()  # sections whose file holds what the profile has (unless also in changed)
+        self.changed = set()
+        self.lock = threading.RLock()
+
+    def path(self, name):
+        return os.path.join(self.dir, name + '.json')
+
+    def files(self):
+        """Every file the profile is stored in"""
+        names = sorted(os.listdir(self.dir)) if os.path.isdir(self.dir) else []
+        return [self.data_file] + [os.path.join(self.dir, name) for name in names if name.endswith('.json')]
+
+    def signature(self, name):
+        """[mtime_ns, size] of a section's file (None if it has none), to tell whether it changed"""
+        try:
+            stat = os.stat(self.path(name))
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def touch(self, path):
+        """Mark the section a change at this profile path went to (if any)"""
+        for depth in range(1, len(path) + 1):
+            name = SECTION_AT.get(tuple(path[:depth]))
+            if name is not None:
+                self.changed.add(name)
+                return
+
+    def load(self, name):
+        with instrument.timer('storage.section_load'):
+            with open(self.path(name)) as f:
+                text = f.read()
+            instrument.record_bytes('storage.section_load', len(text))
+            value = json.loads(text)
+            cls = SECTIONS[name][1]
+            return [cls.coerce(item) for item in value] if cls else value
+
+    def load_profile(self):
+        """The hot part of the profile, with sections loading on first access"""
+        with open(self.data_file) as f:
+            text = f.read()
+        instrument.record_bytes('storage.load', len(text))
+        data = LazyDict(json.loads(text), self)
+        data['life_areas'] = {sys.intern(name): LifeArea.coerce(stats) for name, stats in data['life_areas'].items()}
+        for name, (path, cls) in SECTIONS.items():
+            parent = data
+            for key in path[:-1]:
+                child = raw(parent, key)
+                if not isinstance(child, dict):
+                    parent = None
+                    break
+                if not isinstance(child, LazyDict):
+                    child = LazyDict(child, self, parent.path + (key,))
+                    dict.__setitem__(parent, key, child)
+                parent = child
+            if parent is None or path[-1] not in parent:
+                continue
+            value = raw(parent, path[-1])
+            if isinstance(value, dict) and value.get(MARKER) == name:
+                dict.__setitem__(parent, path[-1], Unloaded(name))
+                self.stored.add(name)
+            else:
+                self.stored.discard(name)  # inline: goes to its own file on the next save
+                if cls:
+                    dict.__setitem__(parent, path[-1], [cls.coerce(item) for item in value])
+        return data
+
+    def save_profile(self, data):
+        """Write changed sections, then the profile file with markers in their place; returns bytes written"""
+        return self.write(self.render(data))
+
+    def render(self, data):
+        """Serialize what save_profile would write: [(section name or None for the profile file, text)]
+
+        Only CPU work, so a caller can render where nothing changes the
+        profile mid-dump and hand the disk writes to another thread. A plain
+        dict profile (a new one, not loaded through this store) can't track
+        changes, so each of its sections is written.
+        """
+        tracked = isinstance(data, LazyDict) and data.store is self
+        writes = []
+        out = dict(data)  # raw values: unloaded sections stay Unloaded
+        for name, (path, cls) in SECTIONS.items():
+            parent = out
+            for key in path[:-1]:
+                child = raw(parent, key)
+                if not isinstance(child, dict):
+                    parent = None
+                    break
+                parent[key] = dict(child)
+                parent = parent[key]
+            if parent is None or path[-1] not in parent:
+                continue
+            value = parent[path[-1]]
+            parent[path[-1]] = {MARKER: name}
+            if type(value) is Unloaded or (tracked and name in self.stored and name not in self.changed):
+                continue
+            self.changed.discard(name)
+            if cls:
+                value = [item.to_json() if isinstance(item, Record) else item for item in value]
+            writes.append((name, json.dumps(value, separators=(',', ':'), default=to_json)))
+        out['life_areas'] = {name: stats.to_json() for name, stats in data['life_areas'].items()}
+        writes.append((None, json.dumps(out, indent=2, default=to_json)))
+        return writes
+
+    def write(self, writes):
+        """Write what render() returned (sections first, each atomically); returns bytes written"""
+        written = 0
+        for name, text in writes:
+            if name is None:
+                path = self.data_file
+            else:
+                os.makedirs(self.dir, exist_ok=True)
+                path = self.path(name)
+            with open(path + '.tmp', 'w') as f:
+                f.write(text)
+            os.replace(path + '.tmp', path)
+            if name is not None:
+                self.stored.add(name)
+            written += len(text)
+        return written
@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from life_rpg_ipc import profile_key
+from life_rpg_model import day_ordinal, iso_day
+from life_rpg_sections import SectionStore, unwrap
+from life_rpg_snapshot import GRADES, GRADE_CODES
+
+# Segment layout: seqlock header, then the payload.
+#   header  seq (odd while the writer is mid-update), retired flag, payload length, names length,
+#           publish time (time.monotonic(), for latency measurements)
+#   payload names JSON (areas, habits, milestone keys; only re-decoded when it changes)
+#           then fixed-width fields:
+#             per area       xp i4, level i4
+#             per habit      streak i4, last_done day ordinal i4 (0 = never)
+#             per milestone  completed u1
+#             income         current_month_earnings q, monthly_goal q
+#             latest score   day ordinal i4 (0 = none), score i2, grade code u1
+HEADER = struct.Struct('<QIIId')
+MIN_SIZE = 64 * 1024
+
+
+def segment_name(data_file):
+    return f"life_rpg_{profile_key(data_file)}"
+
+
+def hot_fields(data):
+    """The parts of a profile dashboards redraw every frame"""
+    if 'latest_score' in data:
+        latest = data['latest_score']  # kept by ScoreTable, so publishing doesn't load daily_scores
+    else:
+        latest = data['daily_scores'][-1] if data['daily_scores'] else None
+    return {
+        'areas': {name: (stats['xp'], stats['level']) for name, stats in data['life_areas'].items()},
+        'habits': {name: (habit['streak'], habit['last_done']) for name, habit in data['habits'].items()},
+        'milestones': {key: m['completed'] for key, m in data['epic_milestones'].items()},
+        'income': (data['income']['current_month_earnings'], data['income']['monthly_goal']),
+        'latest_score': (latest['date'], latest['score'], latest['grade']) if latest else None,
+    }
+
+
+def fixed_format(names):
+    areas, habits, milestones = len(names['areas']), len(names['habits']), len(names['milestones'])
+    return struct.Struct(f"<{areas * 2}i{habits * 2}i{milestones}B2qihB")
+
+
+def encode(hot):
+    names = {'areas': list(hot['areas']), 'habits': list(hot['habits']), 'milestones': list(hot['milestones'])}
+    names_blob = json.dumps(names).encode()
+    values = []
+    for xp, level in hot['areas'].values():
+        values += (xp, level)
+    for streak, last_done in hot['habits'].values():
+        values += (streak, day_ordinal(last_done) or 0)
+    values += [int(bool(done)) for done in hot['milestones'].values()]
+    values += hot['income']
+    if hot['latest_score']:
+        day, score, grade = hot['latest_score']
+        values += (day_ordinal(day), score, GRADE_CODES.get(grade, 0))
+    else:
+        values += (0, 0, 0)
+    return names_blob, fixed_format(names).pack(*values)
+
+
+class SnapshotWriter:
+    """Publishes hot fields into shared memory; one writer per profile"""
+
+    def __init__(self, name):
+        self.name = name
+        self.shm = None
+        self.seq = 0
+
+    def _ensure(self, size):
+        if self.shm is not None and self.shm.size >= size:
+            return
+        if self.shm is not None:
+            self.retire()
+        capacity = max(MIN_SIZE, 2 * size)
+        try:
+            self.shm = shared_memory.SharedMemory(self.name, create=True, size=capacity)
+        except FileExistsError:
+            # Left behind by a writer that did not exit cleanly (PersonalLifeRPG only creates
+            # a writer after Publisher found no live owner for the profile)
+            stale = shared_memory.SharedMemory(self.name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(self.name, create=True, size=capacity)
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, 0, 0.0)
+
+    def publish(self, data):
+        names_blob, fixed = encode(hot_fields(data))
+        payload = len(names_blob) + len(fixed)
+        self._ensure(HEADER.size + payload)
+        buf = self.shm.buf
+        self.seq += 1  # odd: readers retry
+        HEADER.pack_into(buf, 0, self.seq, 0, payload, len(names_blob), time.monotonic())
+        start = HEADER.size
+        buf[start:start + len(names_blob)] = names_blob
+        buf[start + len(names_blob):start + payload] = fixed
+        self.seq += 1  # even: consistent
+        struct.pack_into('<Q', buf, 0, self.seq)
+
+    def retire(self):
+        """Flag the segment so readers re-attach, then remove it"""
+        if self.shm is None:
+            return
+        HEADER.pack_into(self.shm.buf, 0, self.seq, 1, 0, 0, 0.0)
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            # Already removed by someone else; stop the resource tracker unlinking it again at exit
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.shm = None
+
+    close = retire
+
+
+class SnapshotReader:
+    """Attaches to a writer's segment; poll() is a single header read when nothing changed"""
+
+    RETRIES = 100
+
+    def __init__(self, name):
+        self.name = name
+        self.shm = None
+        self.seen = 0
+        self.names_blob = None
+        self.names = None
+        self.format = None
+        self.published = 0.0
+
+    def attach(self):
+        if self.shm is not None:
+            return True
+        try:
+            self.shm = shared_memory.SharedMemory(self.name)
+        except FileNotFoundError:
+            return False
+        # Attaching registers the segment with this process's resource tracker,
+        # which would unlink it when we exit; only the writer owns its lifetime.
+        resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.seen = 0
+        return True
+
+    def detach(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def version(self):
+        return struct.unpack_from('<Q', self.shm.buf, 0)[0]
+
+    def poll(self):
+        """Hot fields if a newer consistent snapshot was published since the last call, else None"""
+        if not self.attach():
+            return None
+        seq, retired, _, _, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if retired:
+            self.detach()
+            return None
+        if seq == self.seen or seq == 0:
+            return None
+        for _ in range(self.RETRIES):
+            hot = self._read()
+            if hot is not None:
+                return hot
+            time.sleep(0)
+        return None
+
+    def _read(self):
+        buf = self.shm.buf
+        seq, retired, payload, names_length, published = HEADER.unpack_from(buf, 0)
+        if seq & 1 or retired:
+            return None
+        start = HEADER.size
+        names_blob = bytes(buf[start:start + names_length])
+        fixed = bytes(buf[start + names_length:start + payload])
+        if struct.unpack_from('<Q', buf, 0)[0] != seq:
+            return None  # torn read, writer got in between
+        if names_blob != self.names_blob:
+            self.names_blob = names_blob
+            self.names = json.loads(names_blob)
+            self.format = fixed_format(self.names)
+        self.seen = seq
+        self.published = published
+        return self.decode(self.format.unpack(fixed))
+
+    def decode(self, values):
+        names = self.names
+        pos = 0
+        areas = {}
+        for name in names['areas']:
+            areas[name] = (values[pos], values[pos + 1])
+            pos += 2
+        habits = {}
+        for name in names['habits']:
+            habits[name] = (values[pos], iso_day(values[pos + 1] or None))
+            pos += 2
+        milestones = {}
+        for key in names['milestones']:
+            milestones[key] = bool(values[pos])
+            pos += 1
+        income = (values[pos], values[pos + 1])
+        day, score, grade = values[pos + 2:pos + 5]
+        return {
+            'areas': areas, 'habits': habits, 'milestones': milestones, 'income': income,
+            'latest_score': (iso_day(day), score, GRADES[grade]) if day else None,
+        }
+
+
+def _reader_process(name, updates):
+    """Body of one benchmark reader (a separate interpreter, like a real dashboard)"""
+    reader = SnapshotReader(name)
+    latencies = []
+    print("ready", flush=True)
+    deadline = time.monotonic() + 30
+    while len(latencies) < updates and time.monotonic() < deadline:
+        if reader.poll() is not None:
+            latencies.append(time.monotonic() - reader.published)
+        else:
+            time.sleep(0)
+    print(json.dumps(latencies), flush=True)
+
+
+def benchmark(data, readers_list, updates=200, interval=0.002):
+    """Publish `updates` snapshots and measure how long each reader takes to see them"""
+    import statistics
+    import subprocess
+    import sys
+
+    print(f"{'Readers':>8} {'Seen':>8} {'p50 us':>10} {'p99 us':>10} {'max us':>10}")
+    for readers in readers_list:
+        writer = SnapshotWriter(f"life_rpg_bench_{os.getpid()}")
+        writer.publish(data)
+        procs = [subprocess.Popen([sys.executable, __file__, '--reader', writer.name, str(updates)],
+                                  stdout=subprocess.PIPE, text=True)
+                 for _ in range(readers)]
+        try:
+            for proc in procs:
+                proc.stdout.readline()  # "ready"
+            area = next(iter(data['life_areas']))
+            for _ in range(updates):
+                data['life_areas'][area]['xp'] += 1
+                writer.publish(data)
+                time.sleep(interval)
+            latencies = []
+            for proc in procs:
+                latencies.extend(json.loads(proc.stdout.readline()))
+                proc.wait()
+        finally:
+            writer.close()
+        latencies.sort()
+        if not latencies:
+            print(f"{readers:8} {0:8}")
+            continue
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{readers:8} {len(latencies):8} {statistics.median(latencies) * 1e6:10.1f} "
+              f"{p99 * 1e6:10.1f} {latencies[-1] * 1e6:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory snapshot reader latency benchmark")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--readers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--reader', nargs=2, metavar=('SEGMENT', 'UPDATES'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.reader:
+        _reader_process(args.reader[0], int(args.reader[1]))
+        return
+
+    start = time.perf_counter()
+    data = unwrap(SectionStore(args.data_file).load_profile())
+    json_time = time.perf_counter() - start
+    print(f"📄 Full load of the profile (every section): {json_time * 1e6:,.0f} us")
+    writer = SnapshotWriter(f"life_rpg_bench_{os.getpid()}")
+    reader_cost = SnapshotReader(writer.name)
+    try:
+        writer.publish(data)
+        reader_cost.poll()
+        start = time.perf_counter()
+        for _ in range(1000):
+            reader_cost.poll()
+        idle = (time.perf_counter() - start) / 1000
+        start = time.perf_counter()
+        for _ in range(1000):
+            reader_cost.seen = 0
+            reader_cost.poll()
+        full = (time.perf_counter() - start) / 1000
+        # Same process as the writer: hand the tracker registration back before it unlinks
+        resource_tracker.register(reader_cost.shm._name, 'shared_memory')
+        reader_cost.detach()
+    finally:
+        writer.close()
+    print(f"🔎 Reader poll: {idle * 1e6:.2f} us unchanged, {full * 1e6:.2f} us decoding a new snapshot\n")
+    benchmark(data, args.readers, args.updates)
+
+
+if __name__ == "__main__":
+    main()
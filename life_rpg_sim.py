@@ -0,0 +1,303 @@
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from life_rpg import PersonalLifeRPG
+
+
+class LifeRPGSimulator:
+    """Monte Carlo projection of area levels and monthly income"""
+
+    # Multipliers returned by calculate_time_multiplier: early, within a week, late
+    TIME_MULTIPLIERS = (1.5, 1.0, 0.5)
+    # Resolution of the per-area daily outcome lookup table
+    GAIN_BINS = 65536
+    # Journal reasons of one-off rewards, which are not regular sessions
+    ONE_OFF_REASONS = ("Task: ", "Project: ", "EPIC MILESTONE")
+
+    def __init__(self, rpg, seed=None):
+        self.rpg = rpg
+        self.data = rpg.data
+        self.areas = list(self.data['life_areas'].keys())
+        self.rng = np.random.default_rng(seed)
+        self.fit_rates()
+
+    def parse_date(self, date_str):
+        return datetime.strptime(date_str, '%Y-%m-%d')
+
+    def history_start(self):
+        """Earliest date that appears anywhere in the profile history"""
+        dates = [self.data['last_login']]
+        dates += [s['date'] for s in self.data['daily_scores']]
+        dates += list(self.data['screen_time']['daily_log'].keys())
+        dates += [p['date'] for p in self.data['habits']['workout']['pushup_history']]
+        dates += [t['created'] for t in self.data['todos']]
+        dates += [p['created'] for p in self.data['projects']]
+        if self.rpg.archive.rows:
+            dates.append(date.fromordinal(self.rpg.archive.first_day).isoformat())
+        return min(dates)
+
+    def pushup_xp(self, count, streak):
+        """XP for one push-up session, same rule as track_pushups"""
+        if count < self.rpg.PUSHUP_REQUIREMENT:
+            return 0
+        xp = self.rpg.DAILY_DECAY
+        xp += min((count - self.rpg.PUSHUP_REQUIREMENT) // 10, 10)
+        if streak >= 7:
+            xp += streak // 7 * 5
+        return xp
+
+    def fit_rates(self):
+        """Estimate per-area daily session/todo rates and income rates from history"""
+        today = self.parse_date(self.rpg.today())
+        self.span_days = max((today - self.parse_date(self.history_start())).days + 1, 1)
+        n = len(self.areas)
+        index = {area: i for i, area in enumerate(self.areas)}
+
+        # Dated XP events we can reconstruct exactly
+        session_days = [set() for _ in range(n)]
+        session_xp = np.zeros(n)
+        todo_xp = np.zeros(n)
+        grant_xp = np.zeros(n)  # one-off project rewards, not sessions
+        first_active = [self.data['life_areas'][a].get('last_active') for a in self.areas]
+
+        def active(i, day):
+            if day and (first_active[i] is None or day < first_active[i]):
+                first_active[i] = day
+
+        exercise = index.get('Health - Exercise')
+        if exercise is not None:
+            streak = 0
+            last = None
+            for entry in self.data['habits']['workout']['pushup_history']:
+                day = self.parse_date(entry['date'])
+                streak = streak + 1 if last and (day - last).days == 1 else 1
+                last = day
+                session_xp[exercise] += self.pushup_xp(entry['count'], streak)
+                session_days[exercise].add(entry['date'])
+                active(exercise, entry['date'])
+
+        # Todos: completion rate, base XP and how late they tend to be
+        todo_counts = np.zeros(n)
+        todo_base = np.zeros(n)
+        lateness = np.ones(3)  # Laplace prior over early / within week / late
+        for todo in self.data['todos']:
+            if not todo['completed'] or todo['area'] not in index:
+                continue
+            i = index[todo['area']]
+            completed = todo.get('completion_date') or todo['created']
+            multiplier = self.rpg.calculate_time_multiplier(todo['deadline'], completed)
+            todo_counts[i] += 1
+            todo_base[i] += todo['base_xp']
+            todo_xp[i] += int(todo['base_xp'] * multiplier)
+            lateness[{1.5: 0, 1.0: 1, 0.5: 2}[multiplier]] += 1
+            active(i, completed)
+
+        # Completed projects split their XP across the work skills, as in complete_project
+        work_areas = [index[a] for a in self.areas if a.startswith('Work Skills')]
+        for project in self.data['projects']:
+            if not project['completed'] or not work_areas:
+                continue
+            completed = project.get('completion_date') or project['created']
+            multiplier = self.rpg.calculate_time_multiplier(project['deadline'], completed)
+            share = int(project['value'] // 10 * multiplier) // len(work_areas)
+            for i in work_areas:
+                grant_xp[i] += share
+                active(i, completed)
+
+        self.p_todo = np.minimum(todo_counts / self.span_days, 1.0)
+        self.todo_xp = np.divide(todo_base, todo_counts, out=np.zeros(n), where=todo_counts > 0)
+        self.lateness = lateness / lateness.sum()
+
+        # The XP journal dates every grant since it was introduced
+        for i, area in enumerate(self.areas):
+            for day, delta, reason, _ in self.rpg.journal.entries(area):
+                if delta > 0:
+                    active(i, day)
+                    if not reason.startswith(self.ONE_OFF_REASONS):
+                        session_days[i].add(day)
+
+        # Everything else (learning, sleep, shower, manual grants) only survives as
+        # the current XP total, so back out the earnings the decay has eaten since
+        # the area's first recorded activity.
+        current_xp = np.array([self.data['life_areas'][a]['xp'] for a in self.areas], dtype=float)
+        active_days = np.array([(today - self.parse_date(day)).days if day else 0 for day in first_active], dtype=float)
+        decay_paid = np.where(current_xp > 0, self.rpg.DAILY_DECAY * np.maximum(active_days, 0), 0)
+        residual_xp = np.maximum(current_xp + decay_paid - session_xp - todo_xp - grant_xp, 0)
+
+        sessions = np.zeros(n)
+        for i, area in enumerate(self.areas):
+            last_active = self.data['life_areas'][area].get('last_active')
+            if residual_xp[i] > 0 and last_active:
+                session_days[i].add(last_active)
+            sessions[i] = len(session_days[i])
+
+        self.p_session = np.minimum(sessions / self.span_days, 1.0)
+        earned = session_xp + residual_xp
+        self.session_xp = np.divide(earned, sessions, out=np.zeros(n), where=sessions > 0)
+
+        # Income: completed projects per day and their values
+        completed = [p for p in self.data['projects'] if p['completed']]
+        self.p_project = min(len(completed) / self.span_days, 1.0)
+        self.project_values = np.array([p['value'] for p in completed] or [0], dtype=np.float32)
+
+    def gain_table(self):
+        """Per-area lookup of daily XP gain indexed by a uniform 16-bit draw
+
+        Each day an area either gets a session, completes one todo (early,
+        within a week or late), or stays idle. Mapping all outcomes onto one
+        random draw keeps the inner loop to a single table gather.
+        """
+        n = len(self.areas)
+        u = (np.arange(self.GAIN_BINS) + 0.5) / self.GAIN_BINS
+        table = np.zeros((n, self.GAIN_BINS), dtype=np.float32)
+        for i in range(n):
+            edge = 0.0
+            outcomes = [(self.p_session[i], self.session_xp[i])]
+            for share, multiplier in zip(self.lateness, self.TIME_MULTIPLIERS):
+                outcomes.append((self.p_todo[i] * share, int(self.todo_xp[i] * multiplier)))
+            for prob, xp in outcomes:
+                table[i, (u >= edge) & (u < edge + prob)] = xp
+                edge += prob
+        return table
+
+    def run(self, trajectories=10000, days=365, target_area=None, target_level=None, chunk=8):
+        """Simulate trajectories day by day; returns a dict of result arrays"""
+        n = len(self.areas)
+        # Area-major (areas x trajectories): each area's table lookups stay inside its own 256 KB row
+        xp = np.repeat(np.array([self.data['life_areas'][a]['xp'] for a in self.areas],
+                                dtype=np.float32)[:, None], trajectories, axis=1)
+        decay = np.float32(self.rpg.DAILY_DECAY)
+        per_level = self.rpg.XP_PER_LEVEL
+
+        target = self.areas.index(target_area) if target_area else None
+        first_day = np.full(trajectories, -1, dtype=np.int32)
+        if target is not None:
+            target_xp = (target_level - 1) * per_level
+            first_day[xp[target] >= target_xp] = 0
+
+        gain_table = self.gain_table()
+
+        # Income, bucketed by calendar month of each simulated day
+        start = self.parse_date(self.rpg.today())
+        months = [(start + timedelta(days=d + 1)).strftime('%Y-%m') for d in range(days)]
+        month_keys = sorted(set(months))
+        month_index = np.array([month_keys.index(m) for m in months])
+        earnings = np.zeros((trajectories, len(month_keys)), dtype=np.float32)
+        current_month = start.strftime('%Y-%m')
+        if current_month in month_keys:
+            earnings[:, month_keys.index(current_month)] = self.data['income']['current_month_earnings']
+
+        for block_start in range(0, days, chunk):
+            block = min(chunk, days - block_start)
+            # Draw a whole block of days at once; only the decay clamp is sequential
+            u = self.rng.integers(0, self.GAIN_BINS, (n, block, trajectories), dtype=np.uint16)
+            gain = np.empty(u.shape, dtype=np.float32)
+            for i in range(n):
+                gain_table[i].take(u[i], out=gain[i])
+
+            projects = self.rng.random((block, trajectories), dtype=np.float32) < self.p_project
+            values = self.rng.choice(self.project_values, size=(block, trajectories))
+            income = projects * values
+
+            for d in range(block):
+                day = block_start + d
+                xp -= decay
+                np.maximum(xp, 0, out=xp)
+                xp += gain[:, d]
+                earnings[:, month_index[day]] += income[d]
+                if target is not None:
+                    hit = (first_day < 0) & (xp[target] >= target_xp)
+                    first_day[hit] = day + 1
+
+        return {
+            'xp': xp.T,
+            'levels': (xp.T // per_level + 1).astype(np.int32),
+            'first_day': first_day,
+            'months': month_keys,
+            'earnings': earnings,
+        }
+
+    def report(self, trajectories=10000, days=365, target_area=None, target_level=20,
+               percentiles=(10, 50, 90)):
+        """Print projection summary"""
+        result = self.run(trajectories, days, target_area, target_level)
+        start = self.parse_date(self.rpg.today())
+
+        print("\n" + "="*70)
+        print("🔮 LIFE RPG FORECAST".center(70))
+        print("="*70)
+        print(f"{trajectories:,} trajectories x {days} days | history: {self.span_days} day(s)")
+
+        if target_area:
+            first_day = result['first_day']
+            reached = first_day >= 0
+            chance = reached.mean() * 100
+            print(f"\n🎯 {target_area} → Level {target_level}")
+            print(f"Chance within {days} days: {chance:.1f}%")
+            if reached.any():
+                for pct, day in zip(percentiles, np.percentile(first_day[reached], percentiles)):
+                    date = (start + timedelta(days=int(day))).strftime('%Y-%m-%d')
+                    print(f"  P{pct:<3} {date} (day {int(day)})")
+
+        print("\n📈 PROJECTED LEVELS (median after horizon)")
+        print("-"*70)
+        median_levels = np.median(result['levels'], axis=0)
+        for area, level in sorted(zip(self.areas, median_levels), key=lambda x: -x[1])[:10]:
+            print(f"  {area:35} | Lv {int(level):3}")
+
+        income = self.data['income']
+        goal = income['monthly_goal']
+        target_month = income['target_month']
+        print("\n💰 INCOME GOAL")
+        print("-"*70)
+        if target_month in result['months']:
+            col = result['earnings'][:, result['months'].index(target_month)]
+            print(f"Chance of {goal:,} Lari in {target_month}: {(col >= goal).mean() * 100:.1f}%")
+            print(f"Median {target_month} earnings: {np.median(col):,.0f} Lari")
+        else:
+            print(f"Target month {target_month} is outside the simulated horizon")
+        hit_goal = result['earnings'] >= goal
+        any_hit = hit_goal.any(axis=1)
+        print(f"Chance of any {goal:,}+ month within horizon: {any_hit.mean() * 100:.1f}%")
+        print("="*70)
+        return result
+
+
+def benchmark(rpg, trajectories=10000, days=365):
+    """Time a full simulation run"""
+    sim = LifeRPGSimulator(rpg, seed=0)
+    area = sim.areas[0]
+    start = time.perf_counter()
+    sim.run(trajectories, days, target_area=area, target_level=20)
+    elapsed = time.perf_counter() - start
+    status = "✅" if elapsed < 1.0 else "⚠️ "
+    print(f"{status} {trajectories:,} trajectories x {days} days in {elapsed:.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Life RPG Monte Carlo forecast")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--area', default='Work Skills - React')
+    parser.add_argument('--level', type=int, default=20)
+    parser.add_argument('--trajectories', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--benchmark', action='store_true', help="Time the simulator and exit")
+    args = parser.parse_args()
+
+    rpg = PersonalLifeRPG(args.data_file, publish=False)
+    if args.benchmark:
+        benchmark(rpg, args.trajectories, args.days)
+        return
+    if args.area not in rpg.data['life_areas']:
+        print(f"Area '{args.area}' not found!")
+        return
+    LifeRPGSimulator(rpg, seed=args.seed).report(args.trajectories, args.days, args.area, args.level)
+
+
+if __name__ == "__main__":
+    main()
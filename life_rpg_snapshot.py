@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import pickle
+import struct
+import time
+from array import array
+from datetime import date
+
+from life_rpg_model import (LifeArea, Project, PushupRecord, Todo, attach, day_ordinal, from_columns, iso_day,
+                            to_columns, to_json)
+from life_rpg_sections import LazyDict, SectionStore, unwrap
+
+# File layout: header (magic, format version, payload length) + pickle protocol 5 payload.
+# Time-series sections are stored as packed arrays keyed by day ordinal instead of
+# lists of small dicts, which is where most of the parse time of a long history goes.
+MAGIC = b'LRPGSNAP'
+VERSION = 1
+HEADER = struct.Struct('<8sHQ')
+SNAPSHOT_EXT = '.lrpg'
+
+GRADES = ['F', 'D', 'C', 'B', 'A-', 'A', 'A+', 'S', 'SS', 'SSS']
+GRADE_CODES = {g: i for i, g in enumerate(GRADES)}
+
+
+def is_snapshot(path):
+    return path.endswith(SNAPSHOT_EXT)
+
+
+def packed_day(value):
+    """A date string as its day ordinal; ValueError unless unpacking gives back the same string"""
+    ordinal = day_ordinal(value)
+    if not isinstance(value, str) or iso_day(ordinal) != value:
+        raise ValueError(f"not a YYYY-MM-DD date: {value!r}")
+    return ordinal
+
+
+class DayNames:
+    """Ordinal -> 'YYYY-MM-DD' backed by the snapshot's contiguous day table"""
+
+    def __init__(self, base, names):
+        self.base = base
+        self.names = names
+
+    @classmethod
+    def covering(cls, ordinals):
+        if not ordinals:
+            return cls(0, [])
+        base = min(ordinals)
+        names = [date.fromordinal(o).isoformat() for o in range(base, max(ordinals) + 1)]
+        return cls(base, names)
+
+
+def pack_scores(scores):
+    """daily_scores list -> packed columns, or None if entries don't match the schema"""
+    days, values, grades = array('i'), array('h'), bytearray()
+    for entry in scores:
+        if (len(entry) != 3 or not isinstance(entry.get('score'), int)
+                or entry.get('grade') not in GRADE_CODES or not isinstance(entry.get('date'), str)):
+            return None
+        days.append(packed_day(entry['date']))
+        values.append(entry['score'])
+        grades.append(GRADE_CODES[entry['grade']])
+    return {'day': days, 'score': values, 'grade': bytes(grades)}
+
+
+def unpack_scores(packed, days):
+    names, base = days.names, days.base
+    return [{'date': names[d - base], 'score': s, 'grade': GRADES[g]}
+            for d, s, g in zip(packed['day'], packed['score'], packed['grade'])]
+
+
+def pack_daily_log(log):
+    days, hours, is_int = array('i'), array('d'), bytearray()
+    for day, value in log.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        days.append(packed_day(day))
+        hours.append(value)
+        is_int.append(isinstance(value, int))
+    return {'day': days, 'hours': hours, 'is_int': bytes(is_int)}
+
+
+def unpack_daily_log(packed, days):
+    names, base = days.names, days.base
+    return {names[d - base]: int(h) if i else h
+            for d, h, i in zip(packed['day'], packed['hours'], packed['is_int'])}
+
+
+def pack_pushups(history):
+    days, counts = array('i'), array('i')
+    for entry in history:
+        if isinstance(entry, PushupRecord) and entry._extra is None and isinstance(entry.count, int):
+            days.append(entry.date)
+            counts.append(entry.count)
+            continue
+        if len(entry) != 2 or not isinstance(entry.get('count'), int) or 'date' not in entry:
+            return None
+        days.append(packed_day(entry['date']))
+        counts.append(entry['count'])
+    return {'day': days, 'count': counts}
+
+
+def unpack_pushups(packed, days):
+    return from_columns(PushupRecord, [packed['day'].tolist(), packed['count'].tolist()])
+
+
+def record_packers(cls):
+    """Column-wise packing for a list of model records"""
+    def pack_list(records):
+        columns, missing, extras = to_columns(cls, records)
+        return {'columns': columns, 'missing': missing, 'extras': extras}
+
+    def unpack_list(packed, days):
+        return from_columns(cls, packed['columns'], packed['missing'], packed['extras'])
+    return pack_list, unpack_list
+
+
+def pack_areas(areas):
+    packed = record_packers(LifeArea)[0](areas.values())
+    packed['names'] = list(areas)
+    return packed
+
+
+def unpack_areas(packed, days):
+    return dict(zip(packed['names'], record_packers(LifeArea)[1](packed, days)))
+
+
+# (path to the section, packer, unpacker)
+SECTIONS = [
+    (('daily_scores',), pack_scores, unpack_scores),
+    (('screen_time', 'daily_log'), pack_daily_log, unpack_daily_log),
+    (('sleep_log',), pack_daily_log, unpack_daily_log),
+    (('habits', 'workout', 'pushup_history'), pack_pushups, unpack_pushups),
+    (('life_areas',), pack_areas, unpack_areas),
+    (('todos',), *record_packers(Todo)),
+    (('projects',), *record_packers(Project)),
+]
+
+
+def _lookup(data, path):
+    for key in path[:-1]:
+        data = data.get(key)
+        if not isinstance(data, dict):
+            return None, None
+    return data, path[-1]
+
+
+def pack(data):
+    """Split a profile into the plain remainder and packed time-series columns"""
+    rest = unwrap(data) if isinstance(data, LazyDict) else dict(data)
+    packed = {}
+    # Copy the dicts along each section path so the live profile is untouched
+    for path, packer, _ in SECTIONS:
+        parent = rest
+        for key in path[:-1]:
+            if not isinstance(parent.get(key), dict):
+                parent = None
+                break
+            parent[key] = dict(parent[key])
+            parent = parent[key]
+        if parent is None or path[-1] not in parent:
+            continue
+        try:
+            columns = packer(parent[path[-1]])
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            columns = None  # not in the expected shape; keep it in the pickled remainder
+        if columns is not None:
+            packed['/'.join(path)] = columns
+            del parent[path[-1]]
+    ordinals = set()
+    for columns in packed.values():
+        ordinals.update(columns.get('day', ()))
+    days = DayNames.covering(ordinals)
+    return {'rest': rest, 'packed': packed, 'days': (days.base, days.names)}
+
+
+def unpack(payload):
+    data = payload['rest']
+    names = DayNames(*payload['days'])
+    for path, _, unpacker in SECTIONS:
+        columns = payload['packed'].get('/'.join(path))
+        if columns is None:
+            continue
+        parent, key = _lookup(data, path)
+        parent[key] = unpacker(columns, names)
+    return data
+
+
+def dumps(data):
+    body = pickle.dumps(pack(data), protocol=5)
+    return HEADER.pack(MAGIC, VERSION, len(body)) + body
+
+
+def loads(blob):
+    if len(blob) < HEADER.size:
+        raise ValueError("Not a Life RPG snapshot (file too short)")
+    magic, version, length = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a Life RPG snapshot (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+    body = memoryview(blob)[HEADER.size:HEADER.size + length]
+    if len(body) != length:
+        raise ValueError("Truncated Life RPG snapshot")
+    return unpack(pickle.loads(body))
+
+
+def save_snapshot(data, path):
+    return write_snapshot(dumps(data), path)
+
+
+def write_snapshot(blob, path):
+    """Write a snapshot atomically: a crash mid-write leaves the previous file intact"""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def load_snapshot(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def export_json(snapshot_path, json_path):
+    """Write a snapshot back out as the human-readable JSON profile"""
+    with open(json_path, 'w') as f:
+        json.dump(load_snapshot(snapshot_path), f, indent=2, default=to_json)
+
+
+def import_json(json_path, snapshot_path):
+    return save_snapshot(SectionStore(json_path).load_profile(), snapshot_path)
+
+
+def check_roundtrip(data):
+    """True if JSON -> snapshot -> JSON reproduces the profile exactly"""
+    restored = loads(dumps(data))
+    return (json.dumps(restored, sort_keys=True, default=to_json)
+            == json.dumps(data, sort_keys=True, default=to_json))
+
+
+def roundtrip_cases():
+    """{name: profile} covering what the packers must hand back unchanged
+
+    Empty sections, dates that aren't YYYY-MM-DD (free-form deadlines,
+    unpadded or made-up days) and entries off the schema, which fall back
+    to the pickled remainder, each as a small profile.
+    """
+    def profile(**sections):
+        data = {'life_areas': {'Focus': {'level': 1, 'xp': 0, 'last_active': '2026-10-01'}},
+                'habits': {'workout': {'streak': 0, 'last_done': None, 'pushup_history': []}},
+                'screen_time': {'daily_log': {}}, 'sleep_log': {}, 'daily_scores': [],
+                'todos': [], 'projects': [], 'last_login': '2026-10-01'}
+        for path, value in sections.items():
+            parent = data
+            *parents, key = path.split('__')
+            for name in parents:
+                parent = parent[name]
+            parent[key] = value
+        return data
+
+    todo = {'id': 1, 'task': 'Essay', 'area': 'Focus', 'base_xp': 20, 'deadline': '2026-10-20',
+            'completed': False, 'created': '2026-10-01'}
+    return {
+        'empty sections': profile(life_areas={}),
+        'free-form dates': profile(
+            todos=[dict(todo, deadline='next week'), dict(todo, id=2, deadline=''), dict(todo, id=3, deadline=None)],
+            projects=[{'id': 1, 'name': 'Thesis', 'value': 500, 'deadline': 'end of term', 'completed': False,
+                       'completion_date': None, 'created': '2026-10-01'}],
+            screen_time__daily_log={'2026-10-1': 3, '2026-10-02': 2.5},
+            sleep_log={'yesterday': 7},
+            daily_scores=[{'date': 'today', 'score': 40, 'grade': 'C'}],
+            habits__workout__pushup_history=[{'date': '2026-1-5', 'count': 100}]),
+        'fallback shapes': profile(
+            todos=[dict(todo, note='extra key'), {k: v for k, v in todo.items() if k != 'created'}],
+            screen_time__daily_log={'2026-10-01': True, '2026-10-02': 'n/a'},
+            sleep_log={'2026-10-01': None},
+            daily_scores=[{'date': '2026-10-01', 'score': 40.5, 'grade': 'C'},
+                          {'date': '2026-10-02', 'score': 40, 'grade': 'Z'},
+                          {'date': '2026-10-03', 'score': 40, 'grade': 'C', 'note': 'extra'}],
+            habits__workout__pushup_history=[{'date': '2026-10-01', 'count': 1.5},
+                                             {'date': '2026-10-02', 'count': 10, 'set': 2}]),
+        'missing sections': {'life_areas': {}, 'todos': [], 'projects': [], 'habits': {'workout': {}},
+                             'screen_time': 'off'},
+    }
+
+
+def check_cases():
+    """Names of the roundtrip_cases() that don't survive a snapshot, as JSON dicts or as records"""
+    failed = []
+    for name, data in roundtrip_cases().items():
+        if not check_roundtrip(data):
+            failed.append(name)
+        elif 'pushup_history' in data['habits']['workout'] and not check_roundtrip(attach(data)):
+            failed.append(f"{name} (records)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Life RPG binary snapshots")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('import', help="JSON profile -> snapshot")
+    p.add_argument('json_file')
+    p.add_argument('snapshot_file')
+    p = sub.add_parser('export', help="Snapshot -> JSON profile")
+    p.add_argument('snapshot_file')
+    p.add_argument('json_file')
+    p = sub.add_parser('check', help="Verify round trip and compare load times")
+    p.add_argument('json_file')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        size = import_json(args.json_file, args.snapshot_file)
+        print(f"💾 Snapshot saved as '{args.snapshot_file}' ({size:,} bytes)")
+    elif args.command == 'export':
+        export_json(args.snapshot_file, args.json_file)
+        print(f"📄 Profile exported to '{args.json_file}'")
+    else:
+        # The profile file plus every section file, as the app would read them all
+        store = SectionStore(args.json_file)
+        size = sum(os.path.getsize(path) for path in store.files())
+        start = time.perf_counter()
+        data = unwrap(store.load_profile())
+        json_time = time.perf_counter() - start
+        blob = dumps(data)
+        start = time.perf_counter()
+        loads(blob)
+        snap_time = time.perf_counter() - start
+        ok = check_roundtrip(data)
+        print(f"{'✅' if ok else '❌'} Round trip {'matches' if ok else 'DIFFERS from'} the JSON profile")
+        failed = check_cases()
+        print(f"{'❌' if failed else '✅'} Edge cases: " + (f"{', '.join(failed)} differ" if failed else "all match"))
+        print(f"JSON:     {size:>12,} bytes, load {json_time * 1e3:8.2f} ms")
+        print(f"Snapshot: {len(blob):>12,} bytes, load {snap_time * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
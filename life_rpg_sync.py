@@ -0,0 +1,708 @@
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_right, insort
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from life_rpg_model import LifeArea, PushupRecord, Todo
+from life_rpg_sections import SectionStore, section_loaded, touch
+
+# Synced records, keyed 'kind:name':
+#   area:<name>        {'base', 'p': {device: n}, 'n': {device: n}, 'last_active',
+#                       'decay': [[first day, last day, XP lost per day], ...]}
+#                      XP is base + sum(p) - sum(n) - the decay: every device only grows
+#                      its own p/n entry, so concurrent gains and losses add up. Decay
+#                      is kept by day instead, so a day decayed on two offline devices
+#                      counts once
+#   todo:<uid>         the todo's fields; completed/completion_date only move forward
+#   habit:<name>       {'streak', 'last_done'}; the newer version wins, concurrent
+#                      edits keep the later last_done (then the longer streak)
+#   pushup:<uid>       one push-up entry {'date', 'count'}; never changes
+#   milestone:<key>    {'description', 'xp_reward', 'completed'}; completed only moves forward
+#   meta:profile       {'last_login'}; the latest wins, so decay runs once per day
+# Every record carries 'vv', its version vector {device: counter}. A device numbers
+# its edits from one counter, so "everything newer than vector K" is a delta query.
+DEFAULT_PORT = 8765
+
+
+def vv_join(a, b):
+    out = dict(a)
+    for device, counter in b.items():
+        if counter > out.get(device, 0):
+            out[device] = counter
+    return out
+
+
+def vv_compare(a, b):
+    """'equal', 'before' (a < b), 'after' (a > b) or 'concurrent'"""
+    less = any(counter > a.get(device, 0) for device, counter in b.items())
+    more = any(counter > b.get(device, 0) for device, counter in a.items())
+    if less and more:
+        return 'concurrent'
+    return 'before' if less else 'after' if more else 'equal'
+
+
+def merge(key, ours, theirs):
+    """Join two replicas of a record; commutative, idempotent, and never loses a device's edits"""
+    if ours is None:
+        return theirs
+    kind = key.partition(':')[0]
+    order = vv_compare(ours['vv'], theirs['vv'])
+    if kind == 'area':
+        out = dict(ours, base=max(ours['base'], theirs['base']), p=vv_join(ours['p'], theirs['p']),
+                   n=vv_join(ours['n'], theirs['n']), last_active=max(ours['last_active'], theirs['last_active']))
+        if ours.get('decay') or theirs.get('decay'):
+            out['decay'] = span_union(ours.get('decay', []), theirs.get('decay', []))
+    elif kind in ('todo', 'milestone'):
+        out = dict(ours, completed=ours['completed'] or theirs['completed'])
+        if kind == 'todo':
+            dates = [d for d in (ours['completion_date'], theirs['completion_date']) if d]
+            out['completion_date'] = min(dates) if dates else None
+    elif kind == 'habit':
+        if order == 'concurrent':
+            out = dict(max(ours, theirs, key=lambda s: (s['last_done'] or '', s['streak'])))
+        else:
+            out = dict(theirs if order == 'before' else ours)
+    elif kind == 'meta':
+        out = dict(ours, last_login=max(ours['last_login'], theirs['last_login']))
+    else:
+        out = dict(ours)
+    out['vv'] = vv_join(ours['vv'], theirs['vv'])
+    return out
+
+
+def span_union(*groups):
+    """Merge lists of [first, last, XP per day] day spans; a day in several keeps its largest loss"""
+    bounds = sorted({bound for group in groups for first, last, _ in group for bound in (first, last + 1)})
+    out = []
+    for start, end in zip(bounds, bounds[1:]):
+        amounts = [amount for group in groups for first, last, amount in group if first <= start and end - 1 <= last]
+        if not amounts:
+            continue
+        amount = max(amounts)
+        if out and out[-1][1] == start - 1 and out[-1][2] == amount:
+            out[-1][1] = end - 1
+        else:
+            out.append([start, end - 1, amount])
+    return out
+
+
+def span_total(spans):
+    return sum((last - first + 1) * amount for first, last, amount in spans)
+
+
+def decay_spans(first, last, per_day, lost):
+    """Spans for `lost` XP of decay over days first..last: whole days first, what XP ran out on at the end"""
+    full = min(lost // per_day, last - first + 1) if per_day else 0
+    spans = [[first, first + full - 1, per_day]] if full else []
+    if first + full <= last:
+        spans.append([first + full, first + full, lost - full * per_day])
+        if first + full < last:
+            spans.append([first + full + 1, last, 0])
+    return spans
+
+
+def area_xp(state):
+    lost = span_total(state.get('decay', []))
+    return max(0, state['base'] + sum(state['p'].values()) - sum(state['n'].values()) - lost)
+
+
+def encode(payload):
+    return gzip.compress(json.dumps(payload, separators=(',', ':')).encode(), 6)
+
+
+def decode(body):
+    return json.loads(gzip.decompress(body)) if body else {}
+
+
+class SyncError(Exception):
+    """The sync server could not be reached or refused the request"""
+
+
+class SyncClient:
+    """One device's replica of the synced records plus what it knows of the server
+
+    State lives next to the profile (never inside it - the profile is what
+    gets synced): the device id, the server URL, the device's edit counter,
+    'known' (the server's version vector as of the last sync), the records,
+    the uid <-> local id map of todos, and 'shadow' - the area XP and
+    push-up count last written to the profile. Local edits are found by
+    diffing the profile against the records (and shadow), so none of the
+    PersonalLifeRPG write paths need to know about sync.
+
+    <profile>_sync.json holds the state as of the last compaction and
+    <profile>_sync.log one JSON line per save with the records and ids that
+    changed, so a save costs O(changes); the log is folded back into the
+    snapshot once it outgrows it.
+    """
+
+    TIMEOUT = 10  # seconds per request
+    MIN_LOG = 64 * 1024  # bytes of log kept before compacting, even for a tiny snapshot
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = os.path.splitext(path)[0] + '.log'
+        self.state = {'device': uuid.uuid4().hex[:8], 'remote': None, 'clock': 0, 'known': {},
+                      'records': {}, 'ids': {}, 'shadow': {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+        self.records = self.state['records']
+        self.ids = self.state['ids']
+        self.shadow = self.state['shadow']
+        if os.path.exists(self.log_path):
+            with open(self.log_path) as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        break  # torn last line: that save never completed
+                    self.records.update(change.pop('records'))
+                    for uid, local_id in change.pop('ids').items():
+                        if local_id is None:
+                            self.ids.pop(uid, None)
+                        else:
+                            self.ids[uid] = local_id
+                    self.shadow.update(change.pop('shadow'))
+                    self.state.update(change)
+        self.dirty = set()
+        self.dirty_ids = {}
+        self.rewrite = not os.path.exists(path)
+        self.last = None  # stats of the last sync()
+
+    @classmethod
+    def for_profile(cls, data_file):
+        return cls(os.path.splitext(data_file)[0] + '_sync.json')
+
+    @property
+    def device(self):
+        return self.state['device']
+
+    @property
+    def remote(self):
+        return self.state['remote']
+
+    @remote.setter
+    def remote(self, url):
+        self.state['remote'] = url.rstrip('/') if url else None
+
+    def save(self):
+        log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if self.rewrite or log_size > max(self.MIN_LOG, os.path.getsize(self.path)):
+            payload = json.dumps(self.state, separators=(',', ':'))
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+            if log_size:
+                os.remove(self.log_path)
+            self.rewrite = False
+        else:
+            change = {key: value for key, value in self.state.items() if key not in ('records', 'ids')}
+            change['records'] = {key: self.records[key] for key in self.dirty}
+            change['ids'] = self.dirty_ids
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(change, separators=(',', ':')) + '\n')
+        self.dirty = set()
+        self.dirty_ids = {}
+
+    def _set(self, key, state):
+        self.records[key] = state
+        self.dirty.add(key)
+
+    def _map(self, uid, local_id):
+        """Point a todo uid at a local id (None drops the mapping)"""
+        if local_id is None:
+            del self.ids[uid]
+        else:
+            self.ids[uid] = local_id
+        self.dirty_ids[uid] = local_id
+
+    def record_decay(self, area, first, last, per_day, lost):
+        """apply_daily_decay took `lost` XP from an area for days first..last (ordinals)
+
+        Kept until the next collect() turns it into the area record's decay
+        spans rather than an XP loss, so two devices decaying the same
+        days while offline don't both count them.
+        """
+        if not self.remote:
+            return
+        decays = self.state.setdefault('decays', {})
+        decays[area] = span_union(decays.get(area, []), decay_spans(first, last, per_day, lost))
+        self.save()
+
+    def _bump(self, key, state):
+        self.state['clock'] += 1
+        state['vv'] = dict(state.get('vv', {}), **{self.device: self.state['clock']})
+        self._set(key, state)
+
+    def _uid(self):
+        return f"{self.device}.{self.state['clock'] + 1}"
+
+    # -- local edits -> records ---------------------------------------------
+
+    def collect(self, data, pending=None):
+        """Fold profile edits made since the last sync into the records; returns how many changed
+
+        `pending` is {area: xp} already merged but not yet written to the profile.
+        """
+        bumps = self.state['clock']
+        pending = pending or {}
+        store = getattr(data, 'store', None)
+        seen = self.state.setdefault('sections', {})
+
+        def unchanged(name):
+            """A section still on disk as the last collect saw it holds no new edits (and stays unloaded)"""
+            if store is None:
+                return False
+            if section_loaded(data, name):
+                seen[name] = None  # may differ from its file; look again next time
+                return False
+            signature = store.signature(name)
+            if signature is not None and seen.get(name) == signature:
+                return True
+            seen[name] = signature
+            return False
+
+        decays = self.state.pop('decays', {})
+        for name, stats in data['life_areas'].items():
+            key = f"area:{name}"
+            state = self.records.get(key)
+            if state is None:
+                self._bump(key, {'base': stats['xp'], 'p': {}, 'n': {}, 'last_active': stats['last_active']})
+                self.shadow[key] = stats['xp']
+                continue
+            xp = pending.get(name, stats['xp'])
+            decay = state.get('decay', [])
+            if name in decays:
+                decay = span_union(decay, decays[name])
+            # The part of the change the new decay days account for isn't a p/n edit
+            lost = span_total(decay) - span_total(state.get('decay', []))
+            delta = xp - self.shadow[key] + lost
+            if delta or lost or stats['last_active'] > state['last_active']:
+                state = dict(state, last_active=max(stats['last_active'], state['last_active']))
+                if lost:
+                    state['decay'] = decay
+                side = 'p' if delta > 0 else 'n'
+                if delta:
+                    state[side] = dict(state[side], **{self.device: state[side].get(self.device, 0) + abs(delta)})
+                self._bump(key, state)
+                self.shadow[key] = xp
+
+        uids = {local_id: uid for uid, local_id in self.ids.items()}
+        records = self.records
+        for todo in [] if unchanged('todos') else data['todos']:
+            uid = uids.get(todo.id)
+            state = records.get(f"todo:{uid}") if uid else None
+            if state is not None and (state['task'], state['area']) != (todo.task, todo.area):
+                self._map(uid, None)  # the id was freed by an undo and reused for another todo
+                state = None
+            if state is None:
+                uid = self._uid()
+                self._map(uid, todo.id)
+                self._bump(f"todo:{uid}", {field: todo.get(field) for field in Todo.FIELDS if field != 'id'})
+            elif todo.completed and not state['completed']:
+                self._bump(f"todo:{uid}", dict(state, completed=True, completion_date=todo.get('completion_date')))
+
+        for name, habit in data['habits'].items():
+            key = f"habit:{name}"
+            state = self.records.get(key)
+            if state is None or (state['streak'], state['last_done']) != (habit['streak'], habit['last_done']):
+                self._bump(key, dict(state or {}, streak=habit['streak'], last_done=habit['last_done']))
+
+        if not unchanged('pushup_history'):
+            history = data['habits']['workout']['pushup_history']
+            for entry in history[self.shadow.get('pushups', 0):]:
+                self._bump(f"pushup:{self._uid()}", {'date': entry['date'], 'count': entry['count']})
+            self.shadow['pushups'] = len(history)
+
+        for name, milestone in data['epic_milestones'].items():
+            key = f"milestone:{name}"
+            state = self.records.get(key)
+            if state is None:
+                self._bump(key, {'description': milestone['description'], 'xp_reward': milestone['xp_reward'],
+                                 'completed': milestone['completed']})
+            elif milestone['completed'] and not state['completed']:
+                self._bump(key, dict(state, completed=True))
+
+        state = self.records.get('meta:profile')
+        if state is None or data['last_login'] > state['last_login']:
+            self._bump('meta:profile', {'last_login': data['last_login']})
+        return self.state['clock'] - bumps
+
+    # -- records -> profile -------------------------------------------------
+
+    def apply(self, data, key, state, new, changed):
+        """Write a merged record into the profile
+
+        Area XP is not written: it goes into `changed` as {area: xp} for the
+        caller's own XP path (levels and aggregates); areas new to this device
+        are added with 0 XP first.
+        """
+        kind, _, name = key.partition(':')
+        if kind == 'area':
+            stats = data['life_areas'].get(name)
+            if stats is None:
+                stats = data['life_areas'][name] = LifeArea(level=1, xp=0, last_active=state['last_active'])
+            stats['last_active'] = state['last_active']
+            changed[name] = self.shadow[key] = area_xp(state)
+        elif kind == 'todo':
+            touch(data, 'todos')
+            local_id = self.ids.get(name)
+            if local_id is None:
+                local_id = len(data['todos']) + 1
+                self._map(name, local_id)
+                data['todos'].append(Todo(id=local_id, **state_fields(state, Todo.FIELDS)))
+            else:
+                todo = find_todo(data['todos'], local_id)
+                if todo is not None and state['completed'] and not todo['completed']:
+                    todo['completed'], todo['completion_date'] = True, state['completion_date']
+        elif kind == 'habit':
+            habit = data['habits'].setdefault(name, {})
+            habit['streak'], habit['last_done'] = state['streak'], state['last_done']
+        elif kind == 'pushup' and new:
+            data['habits']['workout']['pushup_history'].append(PushupRecord(date=state['date'], count=state['count']))
+            touch(data, 'habits', 'workout', 'pushup_history')
+            self.shadow['pushups'] = self.shadow.get('pushups', 0) + 1
+        elif kind == 'milestone':
+            milestone = data['epic_milestones'].setdefault(
+                name, {'description': state['description'], 'xp_reward': state['xp_reward'], 'completed': False})
+            milestone['completed'] = milestone['completed'] or state['completed']
+        elif kind == 'meta':
+            data['last_login'] = max(data['last_login'], state['last_login'])
+
+    def _join(self, data, remote):
+        """First contact with a server that already has records: adopt them, keeping local extras
+
+        Areas take the server's XP. Local todos and push-ups that match a
+        server one (same task/created, same date/count) are mapped onto it;
+        the rest stay and are pushed as new.
+        """
+        self.records.clear()
+        self.ids.clear()
+        self.shadow.clear()
+        self.rewrite = True
+        todos = {}
+        for todo in data['todos']:
+            todos.setdefault((todo['task'], todo['created']), []).append(todo)
+        pushups = {}
+        for entry in data['habits']['workout']['pushup_history']:
+            pushups.setdefault((entry['date'], entry['count']), []).append(entry)
+        kept_todos, new_todos, history = [], [], []
+        for key, state in remote.items():
+            kind, _, name = key.partition(':')
+            if kind == 'todo':
+                match = todos.get((state['task'], state['created']))
+                todo = match.pop(0) if match else Todo(id=0, **state_fields(state, Todo.FIELDS))
+                if state['completed'] and not todo['completed']:
+                    todo['completed'], todo['completion_date'] = True, state['completion_date']
+                kept_todos.append((state['created'], name, todo))
+            elif kind == 'pushup':
+                match = pushups.get((state['date'], state['count']))
+                history.append(match.pop(0) if match else PushupRecord(date=state['date'], count=state['count']))
+            self.records[key] = state
+        kept_todos.sort(key=lambda entry: entry[:2])
+        for uid, todo in ((uid, todo) for _, uid, todo in kept_todos):
+            todo['id'] = len(new_todos) + 1
+            self.ids[uid] = todo['id']
+            new_todos.append(todo)
+        for todo in (todo for group in todos.values() for todo in group):
+            todo['id'] = len(new_todos) + 1  # local-only: collect() gives it a uid
+            new_todos.append(todo)
+        data['todos'][:] = new_todos
+        touch(data, 'todos')
+        history.sort(key=lambda entry: entry['date'])
+        self.shadow['pushups'] = len(history)
+        history.extend(entry for group in pushups.values() for entry in group)
+        data['habits']['workout']['pushup_history'][:] = history
+        touch(data, 'habits', 'workout', 'pushup_history')
+        changed = {}
+        for key, state in remote.items():
+            if not key.startswith(('todo:', 'pushup:')):
+                self.apply(data, key, state, True, changed)
+        return changed
+
+    # -- network ------------------------------------------------------------
+
+    def request(self, method, path, payload=None, body=None):
+        """(response body, bytes sent, bytes received); raises SyncError when offline"""
+        if body is None and payload is not None:
+            body = encode(payload)
+        request = Request(self.remote + path, data=body, method=method,
+                          headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+        try:
+            with urlopen(request, timeout=self.TIMEOUT) as response:
+                reply = response.read()
+        except (URLError, OSError) as e:
+            raise SyncError(f"{self.remote}: {getattr(e, 'reason', e)}") from e
+        return reply, len(body or b''), len(reply)
+
+    def sync(self, data):
+        """Push local edits, pull everyone else's, and merge them into `data`
+
+        Returns {area: new XP} for the caller to write (see apply()). Stats
+        land in self.last. Raises SyncError when the server can't be
+        reached; local edits are kept for the next attempt.
+        """
+        if not self.remote:
+            raise SyncError("no sync server set")
+        start = time.perf_counter()
+        sent = received = 0
+        changed = {}
+        adopted = 0
+        joining = not self.state['known'] and not self.records
+        try:
+            if joining:
+                reply, sent, received = self.request('POST', '/sync', {'device': self.device, 'clock': 0,
+                                                                       'known': {}, 'records': {}})
+                remote = decode(reply)
+                if remote['records']:
+                    adopted = len(remote['records'])
+                    changed = self._join(data, remote['records'])
+                    self.state['known'] = remote['known']
+                else:
+                    joining = False  # first device on this server: everything local is pushed as new
+            pushed = self.collect(data, changed)
+            device = self.device
+            own = self.state['known'].get(device, 0)
+            outgoing = {key: state for key, state in self.records.items() if state['vv'].get(device, 0) > own}
+            reply, out_bytes, in_bytes = self.request('POST', '/sync', {
+                'device': self.device, 'clock': self.state['clock'], 'known': self.state['known'],
+                'records': outgoing})
+        except SyncError:
+            self.save()  # the server URL and the edits folded in so far wait for the next attempt
+            raise
+        sent += out_bytes
+        received += in_bytes
+        response = decode(reply)
+        conflicts = 0
+        for key, theirs in response['records'].items():
+            ours = self.records.get(key)
+            if ours is not None and vv_compare(ours['vv'], theirs['vv']) == 'concurrent':
+                conflicts += 1
+            merged = merge(key, ours, theirs)
+            self._set(key, merged)
+            self.apply(data, key, merged, ours is None, changed)
+        self.state['known'] = vv_join(self.state['known'], response['known'])
+        self.save()
+        self.last = {'pushed': len(outgoing), 'edits': pushed, 'pulled': adopted + len(response['records']),
+                     'conflicts': conflicts, 'sent': sent, 'received': received,
+                     'seconds': time.perf_counter() - start, 'joined': joining}
+        return changed
+
+    def full_copy(self, data_file):
+        """Upload then download the whole profile (all its files), the way syncing by copying it works
+
+        Returns {'sent', 'received', 'seconds'} for comparison with sync().
+        """
+        start = time.perf_counter()
+        blob = b''
+        for path in SectionStore(data_file).files():
+            with open(path, 'rb') as f:
+                blob += f.read()
+        body = gzip.compress(blob, 6)
+        _, sent, _ = self.request('PUT', '/profile', body=body)
+        reply, _, received = self.request('GET', '/profile')
+        gzip.decompress(reply)
+        return {'sent': sent, 'received': received, 'seconds': time.perf_counter() - start}
+
+
+def find_todo(todos, todo_id):
+    """Todo ids are normally their 1-based position; fall back to a scan"""
+    if 0 < todo_id <= len(todos) and todos[todo_id - 1]['id'] == todo_id:
+        return todos[todo_id - 1]
+    return next((todo for todo in todos if todo['id'] == todo_id), None)
+
+
+def state_fields(state, fields):
+    return {field: state.get(field) for field in fields if field != 'id'}
+
+
+class SyncStore:
+    """The server's merged records plus a per-device change log for delta queries
+
+    log[device] is a sorted list of (counter, key): the records that device
+    touched, by edit number. A client that has seen up to known[device] gets
+    every key after that position, so a sync costs O(changes), not O(records).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.records = {}
+        self.log = {}
+        self.vector = {}
+        self.profile = b''  # the whole-file copy, for comparing against full copies
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.records = json.load(f)
+            for key, state in self.records.items():
+                self._index(key, {}, state['vv'])
+
+    def _index(self, key, old, new):
+        for device, counter in new.items():
+            if counter > old.get(device, 0):
+                insort(self.log.setdefault(device, []), (counter, key))
+                if counter > self.vector.get(device, 0):
+                    self.vector[device] = counter
+
+    def sync(self, device, clock, known, records):
+        """Merge a client's records; returns the records it hasn't seen and the server vector"""
+        with self.lock:
+            for key, state in records.items():
+                old = self.records.get(key)
+                merged = self.records[key] = merge(key, old, state)
+                self._index(key, old['vv'] if old else {}, merged['vv'])
+            seen = dict(known, **{device: max(clock, known.get(device, 0))})
+            out = {}
+            for other, top in self.vector.items():
+                since = seen.get(other, 0)
+                if top > since:
+                    log = self.log[other]
+                    for _, key in log[bisect_right(log, (since, '\U0010ffff')):]:
+                        out[key] = self.records[key]
+            if records and self.path:
+                self.save()
+            return {'records': out, 'known': dict(self.vector)}
+
+    def save(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.records, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    """POST /sync (gzip JSON both ways), PUT/GET /profile (whole-file copy), GET /stats"""
+
+    store = None  # set by serve()
+
+    def _reply(self, body, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        if self.path != '/sync':
+            return self.send_error(404)
+        try:
+            request = decode(self._body())
+            reply = self.store.sync(request['device'], request['clock'], request['known'], request['records'])
+        except (ValueError, KeyError, OSError) as e:
+            return self.send_error(400, str(e))
+        self._reply(encode(reply))
+
+    def do_PUT(self):
+        if self.path != '/profile':
+            return self.send_error(404)
+        self.store.profile = self._body()
+        self._reply(encode({}))
+
+    def do_GET(self):
+        if self.path == '/profile':
+            return self._reply(self.store.profile)
+        if self.path == '/stats':
+            return self._reply(encode({'records': len(self.store.records), 'vector': self.store.vector}))
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host='127.0.0.1', port=DEFAULT_PORT, store_path=None):
+    """A threaded sync server; call serve_forever() on it, or run it from a thread in tests"""
+    handler = type('Handler', (SyncHandler,), {'store': SyncStore(store_path)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def benchmark(todos=20000, edits=5, rounds=5):
+    """Delta sync vs copying the whole profile, on two synthetic devices sharing a local server
+
+    Each round device A makes `edits` small changes, then syncs (push) and B
+    syncs (pull); the same round is repeated as a full copy (A uploads the
+    file, B downloads it).
+    """
+    from life_rpg import PersonalLifeRPG
+    from life_rpg_bench import make_profile
+    server = serve(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    with tempfile.TemporaryDirectory() as folder:
+        files = [os.path.join(folder, f"{name}.json") for name in ('a', 'b')]
+        with open(files[0], 'w') as f:
+            json.dump(make_profile(todos=todos, recurring=0), f)
+        shutil.copy(files[0], files[1])
+        with contextlib.redirect_stdout(io.StringIO()):
+            devices = [PersonalLifeRPG(path, publish=False) for path in files]
+        for rpg in devices:
+            rpg.sync.remote = url
+            rpg.sync_profile(quiet=True)
+        a, b = devices
+        areas = list(a.data['life_areas'])
+        delta, copy = [], []
+        for i in range(rounds):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for j in range(edits):
+                    a.add_xp(areas[(i * edits + j) % len(areas)], 10, "bench")
+                a.add_todo(f"Bench task {i}", areas[0], 20, a.today())
+            a.sync_profile(quiet=True)
+            pushed = a.sync.last
+            b.sync_profile(quiet=True)
+            pulled = b.sync.last
+            delta.append((pushed['sent'] + pushed['received'] + pulled['sent'] + pulled['received'],
+                          pushed['seconds'] + pulled['seconds']))
+            full = a.sync.full_copy(a.data_file)
+            copy.append((full['sent'] + full['received'], full['seconds']))
+        assert a.data['todos'][-1]['task'] == b.data['todos'][-1]['task']
+        assert all(a.data['life_areas'][n]['xp'] == b.data['life_areas'][n]['xp'] for n in areas)
+        size = sum(os.path.getsize(path) for path in SectionStore(a.data_file).files())
+    server.shutdown()
+    server.server_close()
+
+    print(f"🔄 Sync of {edits} XP grants + 1 todo per round, {todos:,} todos ({size / 1e6:.1f} MB profile)")
+    for label, samples in (('delta sync (push + pull)', delta), ('full copy (upload + download)', copy)):
+        wire = sum(s[0] for s in samples) / len(samples)
+        latency = sorted(s[1] for s in samples)[len(samples) // 2]
+        print(f"  {label:32} {wire / 1e3:10.1f} KB  {latency * 1e3:9.1f} ms")
+    return delta, copy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life RPG sync server and benchmark")
+    commands = parser.add_subparsers(dest='command', required=True)
+    server_args = commands.add_parser('serve', help="Run a local sync server")
+    server_args.add_argument('--host', default='127.0.0.1')
+    server_args.add_argument('--port', type=int, default=DEFAULT_PORT)
+    server_args.add_argument('--store', default='life_rpg_sync_server.json', help="Where the server keeps records")
+    bench_args = commands.add_parser('bench', help="Compare delta sync with copying the whole profile")
+    bench_args.add_argument('--todos', type=int, default=20000)
+    bench_args.add_argument('--edits', type=int, default=5)
+    bench_args.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        server = serve(args.host, args.port, args.store)
+        print(f"🔄 Sync server on http://{args.host}:{server.server_address[1]} (store: {args.store})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+    else:
+        benchmark(args.todos, args.edits, args.rounds)
@@ -0,0 +1,319 @@
+import argparse
+import io
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+
+from life_rpg import PersonalLifeRPG
+from life_rpg_aggregates import category_of, short_name
+from life_rpg_model import day_ordinal, iso_day
+
+try:
+    import resource  # peak memory (not on Windows)
+except ImportError:
+    resource = None
+
+FRAME_SIZE = (1280, 720)
+# Bar colors per area category (as in the trend charts: blue, green, amber, ...)
+CATEGORY_COLORS = [(88, 166, 255), (76, 209, 55), (255, 193, 7), (220, 53, 69), (155, 89, 182), (26, 188, 156)]
+
+
+def span(rpg, start=None, end=None):
+    """(first, last) day ordinals to replay: from the first journaled grant (or `start`) to today (or `end`)"""
+    journal = rpg.journal
+    first = [columns['day'][0] for columns in journal.areas.values() if len(columns['day'])]
+    if not first and not start:
+        return None
+    return day_ordinal(start) if start else min(first), day_ordinal(end or rpg.today())
+
+
+def replay(rpg, start, end, step=1):
+    """(area names, [(day ordinal, [XP per area])]) for every `step`-th day from start through end (ordinals)
+
+    Built from the XP journal's prefix sums and anchored at today's XP: an
+    area's XP on a day is its current XP minus everything journaled after
+    that day. Decay and penalties are not journaled, so earlier days come
+    out as high as the grants since then allow (never below zero).
+    """
+    journal = rpg.journal
+    names = list(rpg.data['life_areas'])
+    days = list(range(start, end + 1, step))
+    if days and days[-1] != end:
+        days.append(end)
+    columns = []
+    for area in names:
+        current = rpg.data['life_areas'][area].xp
+        total = journal.total(area)
+        columns.append([max(0, current - total + net) for net in journal.cumulative(area, days)])
+    return names, [(day, [column[i] for column in columns]) for i, day in enumerate(days)]
+
+
+class FrameRenderer:
+    """Draws one frame per replayed day on an off-screen pygame surface
+
+    'bars' is a chart of every area's level and XP on a fixed scale;
+    'dashboard' is ICD.py's dashboard view with the day's XP swapped in
+    (habits, income and milestones there are today's).
+    """
+
+    def __init__(self, data_file, view, size, names, xp_per_level, top_xp):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import pygame
+        self.pygame = pygame
+        self.view = view
+        self.size = size
+        self.names = names
+        self.xp_per_level = xp_per_level
+        self.top_xp = max(1, top_xp)
+        pygame.init()
+        if view == 'dashboard':
+            from ICD import LifeRPGVisual
+            self.visual = LifeRPGVisual(data_file)
+            self.surface = self.visual.screen
+        else:
+            self.surface = pygame.Surface(size)
+            self.font_title = pygame.font.Font(None, 44)
+            self.font = pygame.font.Font(None, 24)
+            categories = list(dict.fromkeys(category_of(name) for name in names))
+            self.colors = [CATEGORY_COLORS[categories.index(category_of(name)) % len(CATEGORY_COLORS)]
+                           for name in names]
+            self.labels = [self.font.render(short_name(name)[:20], True, (255, 255, 255)) for name in names]
+
+    def level(self, xp):
+        return xp // self.xp_per_level + 1
+
+    def render(self, day, xps):
+        if self.view == 'dashboard':
+            self.draw_dashboard(day, xps)
+        else:
+            self.draw_bars(day, xps)
+        if self.surface.get_size() != self.size:
+            return self.pygame.transform.smoothscale(self.surface, self.size)
+        return self.surface
+
+    def draw_dashboard(self, day, xps):
+        visual = self.visual
+        for name, xp in zip(self.names, xps):
+            if name in visual.aggregates.areas:
+                visual.aggregates.set_xp(name, xp, self.level(xp))
+        visual.screen.fill(visual.BG_COLOR)
+        visual.draw_dashboard_view()
+        caption = visual.font_heading.render(iso_day(day), True, visual.WARNING)
+        visual.screen.blit(caption, (visual.WIDTH - caption.get_width() - 30, 30))
+
+    def draw_bars(self, day, xps):
+        pygame, surface = self.pygame, self.surface
+        width, height = self.size
+        surface.fill((20, 24, 36))
+        levels = [self.level(xp) for xp in xps]
+        title = f"LIFE RPG  {iso_day(day)}   Total Level {sum(levels)}   {sum(xps):,} XP"
+        surface.blit(self.font_title.render(title, True, (255, 255, 255)), (30, 20))
+        top, left, right = 80, 200, width - 90
+        row = (height - top - 20) / max(1, len(self.names))
+        for i, (label, color, xp, level) in enumerate(zip(self.labels, self.colors, xps, levels)):
+            y = int(top + i * row)
+            bar = max(2, int((right - left) * xp / self.top_xp)) if xp else 0
+            surface.blit(label, (20, y + (row - label.get_height()) / 2))
+            pygame.draw.rect(surface, (50, 54, 66), (left, y + 2, right - left, max(2, int(row) - 4)), border_radius=4)
+            if bar:
+                pygame.draw.rect(surface, color, (left, y + 2, bar, max(2, int(row) - 4)), border_radius=4)
+            text = self.font.render(f"Lv {level}", True, (255, 255, 255))
+            surface.blit(text, (right + 10, y + (row - text.get_height()) / 2))
+
+
+# Frame encoders, run in the workers so encoding is spread across the pool too
+def encode_gif(surface, fps):
+    from PIL import GifImagePlugin, Image
+    image = Image.frombytes('RGB', surface.get_size(), image_bytes(surface))
+    frame = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+    return b''.join(GifImagePlugin.getdata(frame, duration=round(1000 / fps), include_color_table=True))
+
+
+def encode_png(surface, fps):
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.frombytes('RGB', surface.get_size(), image_bytes(surface)).save(buffer, 'PNG', compress_level=3)
+    return buffer.getvalue()
+
+
+def encode_raw(surface, fps):
+    return image_bytes(surface)
+
+
+def image_bytes(surface):
+    import pygame
+    return pygame.image.tobytes(surface, 'RGB') if hasattr(pygame.image, 'tobytes') else pygame.image.tostring(surface, 'RGB')
+
+
+ENCODERS = {'gif': encode_gif, 'png': encode_png, 'mp4': encode_raw}
+
+# Per-process state of the frame workers (see init_worker)
+_worker = None
+
+
+def init_worker(data_file, view, size, names, xp_per_level, top_xp, fmt, fps):
+    global _worker
+    _worker = (FrameRenderer(data_file, view, size, names, xp_per_level, top_xp), ENCODERS[fmt], fps)
+
+
+def render_frame(frame):
+    renderer, encode, fps = _worker
+    return encode(renderer.render(*frame), fps)
+
+
+# Writers: each takes encoded frames in order and keeps none of them
+class GifWriter:
+    """Animated GIF written frame by frame (each frame carries its own palette)"""
+
+    def __init__(self, path, size, fps):
+        from PIL import GifImagePlugin, Image
+        self.f = open(path, 'wb')
+        header, _ = GifImagePlugin.getheader(Image.new('P', size), info={'loop': 0, 'duration': round(1000 / fps)})
+        self.f.write(b''.join(header))
+
+    def write(self, frame):
+        self.f.write(frame)
+
+    def close(self):
+        self.f.write(b';')  # GIF trailer
+        self.f.close()
+
+
+class PngWriter:
+    """frame_00001.png, frame_00002.png, ... in a directory"""
+
+    def __init__(self, path, size, fps):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.count = 0
+
+    def write(self, frame):
+        self.count += 1
+        with open(os.path.join(self.path, f"frame_{self.count:05d}.png"), 'wb') as f:
+            f.write(frame)
+
+    def close(self):
+        pass
+
+
+class FfmpegWriter:
+    """H.264 MP4 through a local ffmpeg, fed raw RGB frames on stdin"""
+
+    def __init__(self, path, size, fps):
+        command = ['ffmpeg', '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                   '-s', f"{size[0]}x{size[1]}", '-r', str(fps), '-i', '-',
+                   '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.process.stdin.write(frame)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+WRITERS = {'gif': GifWriter, 'png': PngWriter, 'mp4': FfmpegWriter}
+
+
+def output_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.gif', '.mp4'):
+        return extension[1:]
+    if extension:
+        raise ValueError(f"Unsupported output '{path}': use .gif, .mp4 or a directory for PNG frames")
+    return 'png'
+
+
+def peak_memory():
+    """(this process, largest finished child) peak resident memory in MB, or None where unavailable"""
+    if resource is None:
+        return None
+    scale = 1 / 1024 / 1024 if sys.platform == 'darwin' else 1 / 1024  # ru_maxrss: bytes on macOS, KB elsewhere
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def export(rpg, output, view='bars', start=None, end=None, step=None, max_frames=365, fps=12,
+           size=FRAME_SIZE, processes=None):
+    """Render the replayed history to `output` on a process pool; returns (frames, seconds)
+
+    Frames come back in order with at most two per worker in flight, and
+    each is written as soon as it arrives, so memory stays flat however
+    long the history is.
+    """
+    fmt = output_format(output)
+    if fmt == 'mp4' and not shutil.which('ffmpeg'):
+        raise RuntimeError("MP4 export needs ffmpeg on the PATH; use a .gif or a directory for PNG frames")
+    if fmt == 'mp4':
+        size = (size[0] // 2 * 2, size[1] // 2 * 2)  # yuv420p needs even dimensions
+    days = span(rpg, start, end)
+    if days is None or days[0] > days[1]:
+        raise ValueError("No XP history yet - the timelapse is built from the XP journal")
+    if step is None:
+        step = max(1, math.ceil((days[1] - days[0] + 1) / max_frames))
+    names, frames = replay(rpg, *days, step)
+    top_xp = max(max(xps) for _, xps in frames)
+    processes = processes or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    writer = WRITERS[fmt](output, size, fps)
+    pending = deque()
+    written = 0
+    # 'spawn' keeps pygame/SDL state from being forked into the workers
+    context = multiprocessing.get_context('spawn')
+    try:
+        with context.Pool(processes, init_worker, (rpg.data_file, view, size, names, rpg.XP_PER_LEVEL,
+                                                   top_xp, fmt, fps)) as pool:
+            for frame in frames:
+                pending.append(pool.apply_async(render_frame, (frame,)))
+                if len(pending) >= 2 * processes:
+                    writer.write(pending.popleft().get())
+                    written += 1
+            while pending:
+                writer.write(pending.popleft().get())
+                written += 1
+            pool.close()
+            pool.join()
+    finally:
+        writer.close()
+    return written, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timelapse of your life areas' XP, replayed from the XP journal")
+    parser.add_argument('output', nargs='?', default='life_rpg_timelapse.gif',
+                        help="A .gif, an .mp4 (needs ffmpeg) or a directory for PNG frames")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--view', choices=('bars', 'dashboard'), default='bars')
+    parser.add_argument('--start', help="First day (YYYY-MM-DD; default: the first journaled grant)")
+    parser.add_argument('--end', help="Last day (YYYY-MM-DD; default: today)")
+    parser.add_argument('--step', type=int, help="Days per frame (default: fit --max-frames)")
+    parser.add_argument('--max-frames', type=int, default=365)
+    parser.add_argument('--fps', type=int, default=12)
+    parser.add_argument('--size', default=f"{FRAME_SIZE[0]}x{FRAME_SIZE[1]}", help="WIDTHxHEIGHT")
+    parser.add_argument('--processes', type=int, help="Render workers (default: one per CPU)")
+    args = parser.parse_args()
+
+    size = tuple(int(n) for n in args.size.lower().split('x'))
+    rpg = PersonalLifeRPG(args.data_file, publish=False)
+    try:
+        frames, seconds = export(rpg, args.output, args.view, args.start, args.end, args.step,
+                                 args.max_frames, args.fps, size, args.processes)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return
+    print(f"🎞️  {frames} frames → {args.output} in {seconds:.1f} s ({frames / seconds:.1f} frames/s)")
+    memory = peak_memory()
+    if memory:
+        print(f"   Peak memory: {memory[0]:.0f} MB here, {memory[1]:.0f} MB per render worker")
+
+
+if __name__ == "__main__":
+    main()
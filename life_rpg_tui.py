@@ -0,0 +1,480 @@
+import argparse
+import asyncio
+import contextlib
+import curses
+import locale
+import sys
+import traceback
+import types
+import unicodedata
+from collections import deque
+
+from life_rpg import EXIT, MENU, PersonalLifeRPG
+from life_rpg_instrument import instrument
+from life_rpg_ledger import month_of
+from life_rpg_recurrence import ReminderScheduler, system_notify
+
+LOG_LINES = 2000  # output lines kept for scrolling back
+AUTOSAVE_DELAY = 1.0  # seconds of quiet after a change before it is written
+
+
+def cell_width(ch):
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in 'WF' else 1
+
+
+def fit(text, width):
+    """`text` clipped or padded to exactly `width` terminal cells
+
+    Emoji variation selectors and joiners are dropped: terminals and curses
+    disagree on their width, which leaves stale cells behind.
+    """
+    out, used = [], 0
+    for ch in text:
+        if ch in '\ufe0f\u200d':
+            continue
+        w = cell_width(ch)
+        if used + w > width:
+            break
+        out.append(ch)
+        used += w
+    return ''.join(out) + ' ' * (width - used)
+
+
+class LogPane:
+    """File-like sink for everything the actions print; keeps the last LOG_LINES lines"""
+
+    def __init__(self):
+        self.lines = deque([''], maxlen=LOG_LINES)
+        self.scroll = 0  # lines scrolled back from the bottom
+        self.changed = True
+
+    def write(self, text):
+        text = text.replace('\a', '').replace('\r', '').expandtabs()
+        first, *rest = text.split('\n')
+        self.lines[-1] += first
+        self.lines.extend(rest)
+        self.scroll = 0
+        self.changed = True
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def page(self, height, pages):
+        self.scroll = max(0, min(len(self.lines) - height, self.scroll + pages * (height - 1)))
+        self.changed = True
+
+
+class StatsPane:
+    """Character sheet next to the log; an emit() event re-renders only the rows it touches
+
+    Rows are keyed ('total', 'score', 'income', ('area', name), ('habit',
+    name)); headers and blanks have no key. Undo, redo and sync can change
+    anything, so their 'history' event rebuilds every row.
+    """
+
+    def __init__(self, rpg):
+        self.rpg = rpg
+        self.rebuild()
+
+    def rebuild(self):
+        rpg = self.rpg
+        self.today = rpg.today()
+        self.score = rpg.calculate_daily_score()
+        self.rows = []
+        self.index = {}
+        self._add('total')
+        self._add('score')
+        self._add('income')
+        for habit in rpg.data['habits']:
+            self._add(('habit', habit))
+        for category, areas in rpg.aggregates.categories.items():
+            self.rows += ['', f"📚 {category.upper()}"]
+            for area, _ in areas:
+                self._add(('area', area))
+        self.dirty = set(range(len(self.rows)))
+
+    def _add(self, key):
+        self.index[key] = len(self.rows)
+        self.rows.append(self.render(key))
+
+    def render(self, key):
+        rpg = self.rpg
+        if key == 'total':
+            return f"⚔️  Level {rpg.aggregates.average_level} · {rpg.aggregates.total_xp:,} XP"
+        if key == 'score':
+            return f"📅 Today {self.score[0]}/100 · grade {self.score[1]}"
+        if key == 'income':
+            goal = rpg.data['income']['monthly_goal']
+            current = rpg.ledger.month_total(month_of(self.today))
+            return f"💰 {current:,} / {goal:,} Lari ({current / goal * 100 if goal > 0 else 0:.0f}%)"
+        kind, name = key
+        if kind == 'area':
+            stats = rpg.data['life_areas'][name]
+            filled = stats.xp % rpg.XP_PER_LEVEL * 10 // rpg.XP_PER_LEVEL
+            return f" {rpg.aggregates.short_names[name][:16]:16} Lv {stats.level:2} {'█' * filled}{'░' * (10 - filled)}"
+        habit = rpg.data['habits'][name]
+        done = "✅" if habit['last_done'] == self.today else "⬜"
+        return f" {done} {name.capitalize():12} 🔥 {habit['streak']}"
+
+    def update(self, *keys):
+        for key in keys:
+            row = self.index.get(key)
+            if row is None:
+                self.rebuild()  # a new area or habit
+                return
+            text = self.render(key)
+            if text != self.rows[row]:
+                self.rows[row] = text
+                self.dirty.add(row)
+
+    def handle(self, event):
+        kind = event['type']
+        if kind == 'history' or self.rpg.today() != self.today:
+            self.rebuild()
+        elif kind == 'area':
+            self.update(('area', event['area']), 'total')
+        elif kind == 'habit':
+            self.update(('habit', event['habit']))
+        elif kind == 'income':
+            self.update('income')
+        elif kind == 'score' and event['date'] == self.today:
+            self.score = (event['score'], event['grade'])
+            self.update('score')
+
+
+class Autosaver:
+    """Writes the profile and undo history a moment after the last change, off the UI thread
+
+    While attached, save_data() and History.save() only call mark(); once
+    changes stop for `delay` seconds the run() task serializes on the event
+    loop's thread (nothing changes the profile mid-dump there) and hands
+    the disk writes to a worker.
+    """
+
+    def __init__(self, rpg, on_change=None, delay=AUTOSAVE_DELAY):
+        self.rpg = rpg
+        self.on_change = on_change
+        self.delay = delay
+        self.profile_dirty = False
+        self.wake = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.writing = False
+        self.saves = 0
+        rpg.autosave = self.mark_profile
+        rpg.history.autosave = self.mark
+
+    @property
+    def pending(self):
+        return self.profile_dirty or self.rpg.history.dirty
+
+    def mark(self):
+        self.wake.set()
+        if self.on_change:
+            self.on_change()
+
+    def mark_profile(self):
+        self.profile_dirty = True
+        self.mark()
+
+    def render(self):
+        """Serialize everything unsaved; returns the functions that write it"""
+        writes = []
+        if self.profile_dirty:
+            self.profile_dirty = False
+            writes.append(self.rpg.render_save())
+        if self.rpg.history.dirty:
+            writes.append(self.rpg.history.render())
+        return writes
+
+    async def run(self):
+        while True:
+            await self.wake.wait()
+            while self.wake.is_set():  # wait for a quiet moment: one write per burst of changes
+                self.wake.clear()
+                await asyncio.sleep(self.delay)
+            await self.flush()
+
+    async def flush(self):
+        async with self.lock:
+            writes = self.render()
+            if not writes:
+                return
+            self.writing = True
+            if self.on_change:
+                self.on_change()
+            try:
+                with instrument.timer('storage.autosave'):
+                    written = await asyncio.to_thread(lambda: sum(write() or 0 for write in writes))
+                instrument.record_bytes('storage.autosave', written)
+                self.saves += 1
+            except OSError as e:
+                print(f"❌ Autosave failed ({e}) - will retry on the next change")
+                self.profile_dirty = True
+                self.rpg.history.dirty = True
+            finally:
+                self.writing = False
+                if self.on_change:
+                    self.on_change()
+
+    def flush_now(self):
+        """Write anything unsaved on the calling thread (on the way out)"""
+        for write in self.render():
+            write()
+
+    def detach(self):
+        self.rpg.autosave = None
+        self.rpg.history.autosave = None
+
+
+class TerminalUI:
+    """Full-screen curses front end: stats pane, scrolling log, one-key actions
+
+    Every MENU action runs as the same dialog the line menu uses, with its
+    prompts answered on the bottom line, so the PersonalLifeRPG methods
+    stay the action layer. Keys are read from the event loop (add_reader),
+    reminders fire from the same loop and saving happens in the background.
+    """
+
+    def __init__(self, screen, rpg, log):
+        self.screen = screen
+        self.rpg = rpg
+        self.log = log
+        self.stats = StatsPane(rpg)
+        self.keys = {entry[1]: entry for entry in MENU}
+        self.prompt = None  # text of the question being asked
+        self.buffer = ''
+        self.answer = None  # future resolved with the typed answer (None = cancelled)
+        self.busy = False
+        self.size = None
+        self.closing = None  # log line where the sign-off output starts
+        self.tasks = []
+        rpg.listeners.append(self.stats.handle)
+
+    async def run(self, reminders=True):
+        loop = asyncio.get_running_loop()
+        self.done = asyncio.Event()
+        self.autosaver = Autosaver(self.rpg, on_change=self.draw)
+        self.tasks.append(asyncio.create_task(self.autosaver.run()))
+        if reminders:
+            self.tasks.append(asyncio.create_task(self.remind()))
+        curses.curs_set(0)
+        self.screen.nodelay(True)
+        self.screen.keypad(True)
+        self.show_keys()
+        loop.add_reader(sys.stdin.fileno(), self.read_keys)
+        self.draw(full=True)
+        try:
+            await self.done.wait()
+        finally:
+            loop.remove_reader(sys.stdin.fileno())
+            for task in self.tasks:
+                task.cancel()
+            await self.autosaver.flush()
+            self.autosaver.detach()
+
+    async def remind(self):
+        scheduler = ReminderScheduler(notify=self.notify)
+        self.rpg.reminders = scheduler
+        await asyncio.to_thread(self.rpg.schedule_reminders)  # reads the todos section
+        await scheduler.run()
+
+    async def notify(self, title, body):
+        print(f"⏰ {title}: {body}")
+        curses.beep()
+        self.draw()
+        await asyncio.to_thread(system_notify, title, body)
+
+    def show_keys(self):
+        print("Keys:")
+        for i in range(0, len(MENU), 2):
+            print("".join(fit(f" {hotkey}  {label}", 32) for _, hotkey, label, _ in MENU[i:i + 2]).rstrip())
+        print("PgUp/PgDn scroll · Esc cancels a question · ? shows these keys")
+
+    # Input
+    def read_keys(self):
+        while True:
+            try:
+                key = self.screen.get_wch()
+            except curses.error:
+                break
+            self.on_key(key)
+        self.draw()
+
+    def on_key(self, key):
+        height = self.body_height()
+        if key == curses.KEY_RESIZE:
+            self.size = None
+        elif key == curses.KEY_PPAGE:
+            self.log.page(height, 1)
+        elif key == curses.KEY_NPAGE:
+            self.log.page(height, -1)
+        elif self.answer is not None:
+            self.edit(key)
+        elif self.busy:
+            curses.beep()
+        elif key == '?':
+            self.show_keys()
+        elif isinstance(key, str) and key.upper() in self.keys:
+            self.tasks.append(asyncio.create_task(self.perform(self.keys[key.upper()])))
+
+    def edit(self, key):
+        if key in ('\n', '\r', curses.KEY_ENTER):
+            self.answer.set_result(self.buffer)
+        elif key == '\x1b':
+            self.answer.set_result(None)
+        elif key in ('\x7f', '\b', curses.KEY_BACKSPACE):
+            self.buffer = self.buffer[:-1]
+        elif isinstance(key, str) and key.isprintable():
+            self.buffer += key
+
+    async def ask(self, prompt):
+        *lines, self.prompt = prompt.split('\n')
+        for line in lines:
+            print(line)
+        self.buffer = ''
+        self.answer = asyncio.get_running_loop().create_future()
+        self.draw()
+        try:
+            answer = await self.answer
+        finally:
+            self.answer = None
+        if answer is not None:
+            print(f"{self.prompt}{answer}")
+        self.prompt = None
+        return answer
+
+    async def perform(self, entry):
+        choice, _, label, action = entry
+        self.busy = True
+        if choice == EXIT:
+            self.closing = len(self.log.lines)
+        print(f"\n▶ {label}")
+        self.draw()
+        try:
+            dialog = action(self.rpg)
+            if isinstance(dialog, types.GeneratorType):
+                answer = None
+                while True:
+                    try:
+                        prompt = dialog.send(answer)
+                    except StopIteration:
+                        break
+                    answer = await self.ask(prompt)
+                    if answer is None:
+                        dialog.close()
+                        print("↩️  Cancelled")
+                        break
+        except (ValueError, IndexError, KeyError) as e:
+            print(f"❌ Invalid input ({e})")
+        except Exception:
+            print(traceback.format_exc())
+        finally:
+            self.busy = False
+        if choice == EXIT:
+            self.done.set()
+        self.draw()
+
+    # Output
+    def body_height(self):
+        return max(1, self.screen.getmaxyx()[0] - 3)
+
+    def put(self, y, x, text, width, attr=0):
+        try:
+            self.screen.addstr(y, x, fit(text, width), attr)
+        except curses.error:
+            pass  # the bottom-right cell can't be written without scrolling
+
+    def draw(self, full=False):
+        height, width = self.screen.getmaxyx()
+        body = self.body_height()
+        side = min(44, max(24, width // 3))
+        if full or self.size != (height, width):
+            self.size = (height, width)
+            self.screen.erase()
+            self.stats.dirty = set(range(len(self.stats.rows)))
+            self.log.changed = True
+            self.put(height - 1, 0, " ? keys · PgUp/PgDn scroll · Esc cancel · Q quit", width - 1, curses.A_DIM)
+            for y in range(1, body + 1):
+                self.put(y, side, "│", 1, curses.A_DIM)
+
+        if self.autosaver.writing:
+            status = "💾 saving…"
+        elif self.autosaver.pending:
+            status = "✏️  unsaved"
+        else:
+            status = "💾 saved"
+        self.put(0, 0, f" 🎮 PERSONAL LIFE RPG   {status}", width - 1, curses.A_REVERSE)
+
+        for row in sorted(self.stats.dirty):
+            if row < body:
+                self.put(row + 1, 0, self.stats.rows[row], side)
+        if self.stats.dirty:
+            for row in range(len(self.stats.rows), body):
+                self.put(row + 1, 0, '', side)
+        self.stats.dirty = set()
+
+        if self.log.changed:
+            lines = list(self.log.lines)
+            end = len(lines) - self.log.scroll
+            shown = lines[max(0, end - body):end]
+            shown += [''] * (body - len(shown))
+            for y, line in enumerate(shown, 1):
+                self.put(y, side + 2, line, width - side - 3)
+            self.log.changed = False
+
+        if self.prompt is not None:
+            self.put(height - 2, 0, f" {self.prompt}{self.buffer}", width - 1, curses.A_BOLD)
+            cursor = min(width - 2, 1 + sum(cell_width(ch) for ch in self.prompt + self.buffer if ch not in '\ufe0f\u200d'))
+            curses.curs_set(1)
+            self.screen.move(height - 2, cursor)
+        else:
+            self.put(height - 2, 0, " ⏳ working…" if self.busy else " 👉 Press a key", width - 1, curses.A_DIM)
+            curses.curs_set(0)
+        self.screen.refresh()
+
+
+def run_tui(data_file='life_rpg_personal.json', reminders=True):
+    """Run the terminal UI until Q; prints the sign-off output after the screen closes"""
+    locale.setlocale(locale.LC_ALL, '')
+    log = LogPane()
+    ui = None
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            rpg = PersonalLifeRPG(data_file)
+
+            def session(screen):
+                nonlocal ui
+                curses.set_escdelay(25)
+                ui = TerminalUI(screen, rpg, log)
+                try:
+                    asyncio.run(ui.run(reminders))
+                except KeyboardInterrupt:
+                    pass  # Ctrl+C quits; run() has flushed the autosave on the way out
+            try:
+                curses.wrapper(session)
+            finally:
+                if ui is not None and ui.autosaver.pending:
+                    ui.autosaver.flush_now()  # interrupted before the last autosave ran
+                if rpg.channel:
+                    rpg.channel.close()
+                if rpg.shared:
+                    rpg.shared.close()
+    finally:
+        if ui is not None and ui.closing is not None:
+            print("\n".join(list(log.lines)[ui.closing:]))
+        elif ui is None:
+            print("\n".join(log.lines))  # failed before the screen opened
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Personal Life RPG - full-screen terminal UI")
+    parser.add_argument('--data-file', default='life_rpg_personal.json')
+    parser.add_argument('--no-reminders', action='store_true', help="Don't send reminders while the UI runs")
+    args = parser.parse_args()
+    run_tui(args.data_file, reminders=not args.no_reminders)
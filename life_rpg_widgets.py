@@ -0,0 +1,111 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+import pygame
+
+
+class VirtualList:
+    """Scrollable column of rows for ICD.py; only rows inside the viewport are drawn
+
+    Rows are (height, key, render) tuples. Offsets are laid out once in
+    set_rows(), the visible range is found by bisecting them, and each row is
+    rendered once into a surface cached under its key (an LRU, so keys should
+    capture everything the row shows). Scrolling is then a handful of blits
+    per frame however many rows there are.
+    """
+
+    SCROLL_STEP = 60
+    SCROLLBAR_WIDTH = 6
+    GUTTER = 14  # right margin kept free for the scrollbar
+
+    def __init__(self, rect, bg_color, bar_color, cache_size=512):
+        self.rect = pygame.Rect(rect)
+        self.bg_color = bg_color
+        self.bar_color = bar_color
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.rows = []
+        self.offsets = [0]
+        self.scroll = 0
+
+    @property
+    def content_height(self):
+        return self.offsets[-1]
+
+    @property
+    def row_width(self):
+        return self.rect.width - self.GUTTER
+
+    @property
+    def max_scroll(self):
+        return max(0, self.content_height - self.rect.height)
+
+    def set_rows(self, rows):
+        self.rows = rows
+        offsets = [0]
+        for height, _, _ in rows:
+            offsets.append(offsets[-1] + height)
+        self.offsets = offsets
+        self.scroll_to(self.scroll)
+
+    def scroll_to(self, offset):
+        self.scroll = min(max(0, int(offset)), self.max_scroll)
+
+    def handle_event(self, event):
+        """Mouse wheel, arrows, Page Up/Down, Home/End; returns True if the event scrolled the list"""
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll_to(self.scroll - event.y * self.SCROLL_STEP)
+            return True
+        if event.type != pygame.KEYDOWN:
+            return False
+        page = self.rect.height - self.SCROLL_STEP
+        moves = {
+            pygame.K_UP: -self.SCROLL_STEP, pygame.K_DOWN: self.SCROLL_STEP,
+            pygame.K_PAGEUP: -page, pygame.K_PAGEDOWN: page,
+        }
+        if event.key in moves:
+            self.scroll_to(self.scroll + moves[event.key])
+        elif event.key == pygame.K_HOME:
+            self.scroll_to(0)
+        elif event.key == pygame.K_END:
+            self.scroll_to(self.max_scroll)
+        else:
+            return False
+        return True
+
+    def visible_range(self):
+        """Indices [first, last) of rows intersecting the viewport"""
+        first = max(0, bisect_right(self.offsets, self.scroll) - 1)
+        last = min(len(self.rows), bisect_left(self.offsets, self.scroll + self.rect.height))
+        return first, last
+
+    def row_surface(self, index):
+        height, key, render = self.rows[index]
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            return surface
+        surface = pygame.Surface((self.row_width, height))
+        surface.fill(self.bg_color)
+        render(surface)
+        self.cache[key] = surface
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return surface
+
+    def draw(self, screen):
+        previous_clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        first, last = self.visible_range()
+        for index in range(first, last):
+            screen.blit(self.row_surface(index),
+                        (self.rect.x, self.rect.y + self.offsets[index] - self.scroll))
+        screen.set_clip(previous_clip)
+
+        if self.max_scroll:
+            track = self.rect.height
+            thumb = max(30, track * self.rect.height // self.content_height)
+            thumb_y = self.rect.y + (track - thumb) * self.scroll // self.max_scroll
+            pygame.draw.rect(screen, self.bar_color,
+                             (self.rect.right - self.SCROLLBAR_WIDTH, thumb_y, self.SCROLLBAR_WIDTH, thumb),
+                             border_radius=3)